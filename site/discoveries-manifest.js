@@ -0,0 +1,2 @@
+// Auto-generated from discoveries.json
+const discoveriesManifest = {"version":1,"generated_at":"2025-11-25T02:57:57.045463Z","total":24,"chunk_size":500,"fields":["owner","name","url","stars","language","patterns","score","reasoning"],"tables":{"patterns":["docker (ps|images|logs)","kubectl","git log"],"languages":["Jinja","Python","Lua","Go","Emacs Lisp","Shell","TypeScript","Dockerfile","JavaScript",null]},"chunks":["data/discoveries-0000.json"],"search_index":"data/search-index.json"};
@@ -0,0 +1,7 @@
+"""Allow `python -m src` as an alias for the discovery command."""
+
+import sys
+
+from src.cli import main
+
+sys.exit(main())
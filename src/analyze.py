@@ -7,8 +7,9 @@ Scores repos on a 1-10 scale for "peer potential".
 
 from datetime import datetime, timezone
 from github import Github, GithubException
-from src.config import Config
-from src.prefilter import load_search_config
+from src.config import Config, load_search_settings
+from src.records import Candidate, Discovery, QualityResult
+from src.scoring import quality_from_signals
 
 
 def check_ci_cd(repo):
@@ -112,148 +113,111 @@ def check_related_repos(github_client, owner):
         return 0, []
 
 
-def analyze_quality(repo_info):
+# Probes dropped first when a run's budget is tight
+OPTIONAL_PROBES = ('contributors', 'related_repos')
+
+# Core calls of an analysis without the optional probes: get_repo plus one
+# root listing each for CI, tests and container configs
+LEAN_ANALYSIS_CALLS = 4
+
+
+def collect_signals(github_client, repo, owner, pattern_score, optional_probes=True):
+    """
+    Gather the raw quality signals for a repository (the API-bound part).
+
+    Args:
+        optional_probes: Also count contributors and related repositories;
+            when False they are recorded under 'skipped_probes' instead
+
+    Returns:
+        Dict of raw signals, persisted with the discovery for offline rescoring
+    """
+    has_ci, ci_detail = check_ci_cd(repo)
+    has_tests, test_detail = check_tests(repo)
+    docker_k8s, dk_details = check_docker_kubernetes(repo)
+
+    days_since_push = None
+    if repo.pushed_at:
+        days_since_push = (datetime.now(timezone.utc) - repo.pushed_at).days
+
+    signals = {
+        'ci_cd': ci_detail if has_ci else None,
+        'tests': test_detail if has_tests else None,
+        'docker': docker_k8s['docker'],
+        'kubernetes': docker_k8s['kubernetes'],
+        'devcontainer': docker_k8s['devcontainer'],
+        'container_configs': dk_details,
+        'pattern_score': pattern_score,
+        'days_since_push': days_since_push,
+        'contributors': None,
+        'related_repos': 0,
+        'related_sample': []
+    }
+    if not optional_probes:
+        signals['skipped_probes'] = list(OPTIONAL_PROBES)
+        return signals
+
+    try:
+        signals['contributors'] = repo.get_contributors().totalCount
+    except:
+        pass
+
+    signals['related_repos'], signals['related_sample'] = check_related_repos(github_client, owner)
+
+    return signals
+
+
+def pattern_only_quality(pattern_score, reason, details=None):
+    """Fallback quality scored on the discovery pattern score alone."""
+    return QualityResult(
+        score=min(int(pattern_score / 2), 5),
+        signals_found=['pattern_only'],
+        signal_details={'pattern_score': pattern_score, **(details or {})},
+        reasoning=f"{reason}, scored on patterns only"
+    )
+
+
+def analyze_quality(discovery, settings=None, budget=None):
     """
     Analyze repository quality and calculate peer potential score.
 
     Args:
-        repo_info: Repository information from search results
+        discovery: Discovery record from the content search; a near-duplicate
+            (duplicate_of set) is scored on patterns only, with no API calls
+        settings: SearchSettings snapshot whose quality_weights drive the
+            score (defaults to load_search_settings())
+        budget: Optional RunBudget; optional probes are dropped once it is
+            tight, and nothing is fetched once it is exhausted
 
     Returns:
-        {
-            score: int (1-10),
-            signals_found: [list of quality signals],
-            signal_details: {dict of detailed signals},
-            reasoning: str (explanation of score)
-        }
+        QualityResult: score (1-10), signals_found, signal_details, raw
+        signals (for offline rescoring) and reasoning
     """
-    owner = repo_info['owner']
-    repo_name = repo_info['repo']
-    pattern_score = repo_info.get('pattern_score', 0)
+    owner = discovery.owner
+    repo_name = discovery.repo
+    pattern_score = discovery.pattern_score
+    settings = settings or load_search_settings()
+
+    if discovery.duplicate_of:
+        return pattern_only_quality(pattern_score, f"Near-duplicate of {discovery.duplicate_of}",
+                                    {'duplicate_of': discovery.duplicate_of})
+
+    if budget is not None and budget.exhausted():
+        return pattern_only_quality(pattern_score, f"Not analyzed ({budget.reason()} reached)",
+                                    {'skipped': budget.reason()})
 
     # Initialize GitHub client
     github_client = Github(Config.GITHUB_TOKEN)
 
-    # Initialize scoring
-    score = 0
-    signals_found = []
-    signal_details = {}
-    reasoning_parts = []
-
     try:
         repo = github_client.get_repo(f"{owner}/{repo_name}")
-
-        # 1. Production Evidence (max 5 points)
-        has_ci, ci_detail = check_ci_cd(repo)
-        if has_ci:
-            score += 2
-            signals_found.append('has_ci_cd')
-            signal_details['ci_cd'] = ci_detail
-            reasoning_parts.append(f"CI/CD via {ci_detail}")
-
-        has_tests, test_detail = check_tests(repo)
-        if has_tests:
-            score += 2
-            signals_found.append('has_tests')
-            signal_details['tests'] = test_detail
-            reasoning_parts.append(f"tests in {test_detail}/")
-
-        docker_k8s, dk_details = check_docker_kubernetes(repo)
-        if docker_k8s['docker']:
-            score += 1
-            signals_found.append('has_docker')
-            signal_details['docker'] = True
-
-        if docker_k8s['kubernetes']:
-            score += 2
-            signals_found.append('has_kubernetes')
-            signal_details['kubernetes'] = dk_details
-            reasoning_parts.append(f"K8s configs: {', '.join(dk_details[:3])}")
-
-        if docker_k8s['devcontainer']:
-            score += 1
-            signals_found.append('has_devcontainer')
-            signal_details['devcontainer'] = True
-            reasoning_parts.append("devcontainer setup")
-
-        # 2. Discovery Pattern Depth (max 3 points)
-        # Normalize pattern score to 0-3 range
-        normalized_pattern = min(pattern_score / 10, 3)
-        score += normalized_pattern
-
-        if pattern_score > 10:
-            signals_found.append('high_discovery_depth')
-            reasoning_parts.append(f"rich discovery patterns (score: {pattern_score})")
-        elif pattern_score > 5:
-            signals_found.append('medium_discovery_depth')
-
-        signal_details['pattern_score'] = pattern_score
-
-        # 3. Activity Signals (max 2 points)
-        last_push = repo.pushed_at
-        if last_push:
-            days_since_push = (datetime.now(timezone.utc) - last_push).days
-            signal_details['days_since_push'] = days_since_push
-
-            if days_since_push < 30:
-                score += 1
-                signals_found.append('recent_commits')
-                reasoning_parts.append(f"active ({days_since_push}d ago)")
-
-        try:
-            contributors = repo.get_contributors()
-            contributor_count = contributors.totalCount
-
-            if contributor_count > 1:
-                score += 1
-                signals_found.append('multiple_contributors')
-                signal_details['contributors'] = contributor_count
-                reasoning_parts.append(f"{contributor_count} contributors")
-        except:
-            pass
-
-        # 4. Related Repos (max 3 points)
-        related_count, related_sample = check_related_repos(github_client, owner)
-        if related_count > 0:
-            related_points = min(related_count, 3)
-            score += related_points
-            signals_found.append('multiple_repos')
-            signal_details['related_repos'] = related_sample
-            reasoning_parts.append(f"{related_count} related repos")
-
-        # Cap at 10
-        final_score = min(int(score), 10)
-
-        # Build reasoning
-        if reasoning_parts:
-            reasoning = "; ".join(reasoning_parts)
-        else:
-            reasoning = "Minimal production signals detected"
-
-        # Add overall assessment
-        if final_score >= 7:
-            reasoning = f"High-quality peer: {reasoning}"
-        elif final_score >= 5:
-            reasoning = f"Medium-quality: {reasoning}"
-        else:
-            reasoning = f"Low production signals: {reasoning}"
-
-        return {
-            'score': final_score,
-            'signals_found': signals_found,
-            'signal_details': signal_details,
-            'reasoning': reasoning
-        }
+        signals = collect_signals(github_client, repo, owner, pattern_score,
+                                  optional_probes=budget is None or not budget.tight())
+        return quality_from_signals(signals, settings.quality_weights)
 
     except Exception as e:
         # Fallback scoring based on pattern score alone
-        fallback_score = min(int(pattern_score / 2), 5)
-        return {
-            'score': fallback_score,
-            'signals_found': ['pattern_only'],
-            'signal_details': {'pattern_score': pattern_score, 'error': str(e)},
-            'reasoning': f"Limited analysis (error: {str(e)[:50]}), scored on patterns only"
-        }
+        return pattern_only_quality(pattern_score, f"Limited analysis (error: {str(e)[:50]})", {'error': str(e)})
 
 
 if __name__ == '__main__':
@@ -262,24 +226,24 @@ if __name__ == '__main__':
     print()
 
     # Mock repo info (Budget Analyzer for testing)
-    mock_repo = {
-        'owner': 'budgetanalyzer',
-        'repo': 'orchestration',
-        'url': 'https://github.com/budgetanalyzer/orchestration',
-        'pattern_score': 15,
-        'patterns_found': ['kubectl', 'tree -', 'grep -r', 'tilt']
-    }
+    mock_repo = Discovery(
+        Candidate(owner='budgetanalyzer', repo='orchestration'),
+        markdown_file='CLAUDE.md',
+        pattern_score=15,
+        patterns_found=['kubectl', 'tree -', 'grep -r', 'tilt']
+    )
 
     try:
+        Config.load_env()
         quality = analyze_quality(mock_repo)
         print(f"✓ Quality analysis complete")
         print()
-        print(f"Score: {quality['score']}/10")
-        print(f"Signals: {', '.join(quality['signals_found'])}")
-        print(f"Reasoning: {quality['reasoning']}")
+        print(f"Score: {quality.score}/10")
+        print(f"Signals: {', '.join(quality.signals_found)}")
+        print(f"Reasoning: {quality.reasoning}")
         print()
         print("Details:")
-        for key, value in quality['signal_details'].items():
+        for key, value in quality.signal_details.items():
             print(f"  {key}: {value}")
 
     except Exception as e:
@@ -0,0 +1,346 @@
+"""
+Performance benchmarks for `discovery bench`.
+
+Each benchmark prints its measurements and returns an exit code, non-zero
+when a measurement is over its budget, so they can gate CI.
+"""
+
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+from src.config import Config
+
+
+# Startup probes: (label, python arguments). 'python -c pass' is the baseline
+# every other probe is measured against.
+STARTUP_PROBES = [
+    ('python -c pass', ['-c', 'pass']),
+    ('discovery --help', ['-m', 'src.cli', '--help']),
+    ('discovery opt-out check', ['-m', 'src.cli', 'opt-out', 'check', 'octocat', 'hello-world']),
+    ('discovery site (imports)', ['-c', 'import src.cli, src.site_generator']),
+]
+
+# Startup overhead over bare interpreter start, in milliseconds
+STARTUP_BUDGET_MS = 100
+
+
+def time_command(python_args, runs):
+    """Median wall time of `python <python_args>` in milliseconds."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable] + python_args,
+            cwd=Config.PROJECT_ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True
+        )
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench_startup(args):
+    """Time quick subcommands against bare interpreter startup."""
+    budget = args.budget_ms if args.budget_ms is not None else STARTUP_BUDGET_MS
+    baseline = None
+    over_budget = []
+
+    print(f"Startup time (median of {args.runs} runs, budget +{budget:.0f} ms over baseline)")
+    for label, python_args in STARTUP_PROBES:
+        elapsed = time_command(python_args, args.runs)
+        if baseline is None:
+            baseline = elapsed
+            print(f"  {label:<28} {elapsed:7.1f} ms")
+            continue
+
+        overhead = elapsed - baseline
+        flag = ''
+        if overhead > budget:
+            over_budget.append(label)
+            flag = '  OVER BUDGET'
+        print(f"  {label:<28} {elapsed:7.1f} ms  (+{overhead:.1f} ms){flag}")
+
+    if over_budget:
+        print(f"✗ {len(over_budget)} command(s) over the startup budget", file=sys.stderr)
+        return 1
+    return 0
+
+
+# Synthetic corpus for `bench extract`
+EXTRACT_DOCUMENTS = 200
+EXTRACT_DOCUMENT_BYTES = 50_000
+
+# Per-case limit for adversarial inputs; quadratic backtracking takes seconds
+EXTRACT_ADVERSARIAL_BUDGET_MS = 500
+
+
+def synthetic_readme(rng, size):
+    """Markdown with prose, code blocks, emails and @mentions, about size bytes."""
+    words = ['discovery', 'kubectl', 'tree', 'pattern', 'service', 'config', 'the', 'and',
+             'deploy', 'architecture', 'README', 'grep', 'docs', 'contributors', 'example']
+    parts = []
+    length = 0
+    while length < size:
+        roll = rng.random()
+        if roll < 0.02:
+            part = f"Contact {rng.choice(words)}{rng.randrange(500)}@{rng.choice(words)}.io for help."
+        elif roll < 0.04:
+            part = f"Thanks @{rng.choice(words)}-{rng.randrange(500)} and @dependabot."
+        elif roll < 0.06:
+            part = "```bash\nkubectl get pods -A | grep -r 'error' .\ntree -L 2 services/\n```"
+        else:
+            part = ' '.join(rng.choice(words) for _ in range(12)) + '.'
+        parts.append(part)
+        length += len(part) + 1
+    return '\n'.join(parts)
+
+
+def adversarial_inputs(size):
+    """Inputs that make unbounded email/mention patterns backtrack quadratically."""
+    return {
+        'dotted words': 'a.' * (size // 2),
+        'dotted domain': 'x@' + 'a.' * (size // 2) + '!',
+        'long local part': 'a' * size + '@',
+        'hyphen mentions': ('@a' + '-' * 1000 + '!') * (size // 1003),
+        'at signs': 'a@' * (size // 2),
+    }
+
+
+def time_call(fn, runs):
+    """Median wall time of fn() in milliseconds."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench_extract(args):
+    """Contact extraction throughput on synthetic READMEs, plus adversarial inputs."""
+    from src.extract import (
+        extract_contacts_from_documents,
+        extract_emails_from_text,
+        extract_usernames_from_text,
+    )
+
+    budget = args.budget_ms if args.budget_ms is not None else EXTRACT_ADVERSARIAL_BUDGET_MS
+    runs = max(1, args.runs // 2)
+    rng = random.Random(0)
+    documents = [
+        (f'README-{i}.md', synthetic_readme(rng, EXTRACT_DOCUMENT_BYTES), 'low')
+        for i in range(EXTRACT_DOCUMENTS)
+    ]
+    megabytes = sum(len(text) for _, text, _ in documents) / 1_000_000
+
+    def per_text():
+        for _, text, _ in documents:
+            extract_emails_from_text(text)
+            extract_usernames_from_text(text)
+
+    print(f"Contact extraction, {EXTRACT_DOCUMENTS} synthetic READMEs ({megabytes:.1f} MB, median of {runs} runs)")
+    for label, fn in (('per-text email + username scans', per_text),
+                      ('extract_contacts_from_documents', lambda: extract_contacts_from_documents(documents))):
+        elapsed = time_call(fn, runs)
+        print(f"  {label:<34} {elapsed:8.1f} ms  ({megabytes / (elapsed / 1000):.1f} MB/s)")
+
+    over_budget = []
+    print(f"Adversarial inputs (100 KB each, budget {budget:.0f} ms)")
+    for label, text in adversarial_inputs(100_000).items():
+        elapsed = time_call(lambda: extract_contacts_from_documents([('ADVERSARIAL.md', text, 'low')]), runs)
+        flag = ''
+        if elapsed > budget:
+            over_budget.append(label)
+            flag = '  OVER BUDGET'
+        print(f"  {label:<34} {elapsed:8.1f} ms{flag}")
+
+    if over_budget:
+        print(f"✗ {len(over_budget)} adversarial input(s) over budget", file=sys.stderr)
+        return 1
+    return 0
+
+
+# Registry size for `bench score`, and the budget for one vectorized weighting
+SCORE_REPOSITORIES = 100_000
+SCORE_BUDGET_MS = 50
+
+
+def synthetic_signals(rng):
+    """Raw quality signals shaped like analyze_quality's output."""
+    return {
+        'ci_cd': rng.choice([None, '.github/workflows']),
+        'tests': rng.choice([None, 'tests']),
+        'docker': rng.random() < 0.5,
+        'kubernetes': rng.random() < 0.2,
+        'devcontainer': rng.random() < 0.1,
+        'container_configs': [],
+        'pattern_score': rng.randrange(40),
+        'days_since_push': rng.randrange(400),
+        'contributors': rng.randrange(1, 20),
+        'related_repos': rng.randrange(6),
+        'related_sample': []
+    }
+
+
+def bench_score(args):
+    """Vectorized rescoring of a large synthetic registry against scalar scoring."""
+    from src.config import load_search_settings
+    from src.scoring import FEATURES, score_matrix, score_signals, signal_matrix
+
+    budget = args.budget_ms if args.budget_ms is not None else SCORE_BUDGET_MS
+    runs = max(1, args.runs)
+    rng = random.Random(0)
+    signals = [synthetic_signals(rng) for _ in range(SCORE_REPOSITORIES)]
+    weights = dict(load_search_settings().quality_weights)
+    alternative = {feature: rng.randrange(4) for feature in FEATURES}
+
+    print(f"Quality scoring, {SCORE_REPOSITORIES:,} repositories (median of {runs} runs)")
+    matrix_ms = time_call(lambda: signal_matrix(signals), max(1, runs // 5))
+    matrix = signal_matrix(signals)
+    scalar_ms = time_call(lambda: [score_signals(s, weights) for s in signals], max(1, runs // 5))
+    vector_ms = time_call(lambda: score_matrix(matrix, alternative), runs)
+
+    assert score_matrix(matrix, weights).tolist() == [score_signals(s, weights) for s in signals]
+
+    print(f"  {'build signal matrix (once)':<34} {matrix_ms:8.1f} ms")
+    print(f"  {'scalar score_signals loop':<34} {scalar_ms:8.1f} ms")
+    flag = '  OVER BUDGET' if vector_ms > budget else ''
+    print(f"  {'vectorized score_matrix':<34} {vector_ms:8.1f} ms  (budget {budget:.0f} ms){flag}")
+
+    if flag:
+        print("✗ Vectorized rescoring over budget", file=sys.stderr)
+        return 1
+    return 0
+
+
+# Run size for `bench records`
+RECORDS_CANDIDATES = 100_000
+
+
+def synthetic_candidate_dict(rng, i):
+    """A candidate as the prefilter used to return it, strings freshly built per record."""
+    return {
+        'owner': f"owner{i % 5000}",
+        'repo': f"repo-{i}",
+        'url': f"https://github.com/owner{i % 5000}/repo-{i}",
+        'stars': rng.randrange(5000),
+        'topics': [''.join(['ai', '-native']), ''.join(['kuber', 'netes'])],
+        'last_push': '2024-11-25T00:00:00Z',
+        'language': ''.join([rng.choice(['Py', 'Ty', 'G']), 'thon']),
+        'description': None,
+        'default_branch': ''.join(['ma', 'in']),
+        'tiers': [1]
+    }
+
+
+def traced_size(build):
+    """Bytes still allocated by the object build() returns."""
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        result = build()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def bench_records(args):
+    """Memory of a large candidate list as dicts versus slotted records."""
+    from src.records import Candidate
+
+    count = RECORDS_CANDIDATES
+
+    def as_dicts():
+        rng = random.Random(0)
+        return [synthetic_candidate_dict(rng, i) for i in range(count)]
+
+    def as_records():
+        rng = random.Random(0)
+        return [Candidate.from_dict(synthetic_candidate_dict(rng, i)) for i in range(count)]
+
+    print(f"Candidate memory, {count:,} candidates")
+    dict_bytes = traced_size(as_dicts)
+    record_bytes = traced_size(as_records)
+    for label, size in (('dicts', dict_bytes), ('slotted records', record_bytes)):
+        print(f"  {label:<34} {size / 1_000_000:8.1f} MB  ({size / count:.0f} B/candidate)")
+    print(f"  {'saved':<34} {(1 - record_bytes / dict_bytes) * 100:8.1f} %")
+    return 0
+
+
+# Registry size for `bench similar`, and queries timed by brute force
+SIMILAR_DISCOVERIES = 20_000
+SIMILAR_BRUTE_FORCE_QUERIES = 50
+
+
+def synthetic_discovery(rng, i):
+    """A discovery drawn from a few templates, so near-duplicates are common."""
+    from src.records import Candidate, Discovery, QualityResult
+
+    template = rng.randrange(500)
+    patterns = [f"pattern-{(template + j) % 40}" for j in range(rng.randrange(2, 6))]
+    topics = [f"topic-{(template * 7 + j) % 300}" for j in range(rng.randrange(1, 5))]
+    candidate = Candidate(owner=f"owner{i}", repo=f"repo{i}", topics=topics,
+                          language=rng.choice(['Python', 'Go', 'TypeScript', 'Rust', 'Java']))
+    signals = synthetic_signals(rng)
+    signals['container_configs'] = rng.sample(['Dockerfile', 'Tiltfile', 'docker-compose.yml', 'k8s'], 2)
+    return Discovery(candidate, rng.choice(['CLAUDE.md', 'README.md']), patterns_found=patterns,
+                     pattern_score=rng.randrange(40), quality=QualityResult(5, signals=signals))
+
+
+def bench_similar(args):
+    """Top-k similar peers from the MinHash/LSH index against pairwise Jaccard."""
+    from src.similarity import SimilarityIndex, feature_set
+
+    rng = random.Random(0)
+    features = [feature_set(synthetic_discovery(rng, i)) for i in range(SIMILAR_DISCOVERIES)]
+    count = len(features)
+
+    print(f"Similar peers, {count:,} discoveries")
+    started = time.perf_counter()
+    index = SimilarityIndex(features)
+    build_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    for i in range(count):
+        index.query(i)
+    query_ms = (time.perf_counter() - started) * 1000
+    compared = sum(len(index.candidates(i)) for i in range(count))
+
+    def brute_force(i):
+        mine = features[i]
+        return sorted(((len(mine & other) / len(mine | other), j) for j, other in enumerate(features) if j != i),
+                      reverse=True)[:5]
+
+    started = time.perf_counter()
+    for i in range(SIMILAR_BRUTE_FORCE_QUERIES):
+        brute_force(i)
+    brute_ms = (time.perf_counter() - started) * 1000 / SIMILAR_BRUTE_FORCE_QUERIES * count
+
+    print(f"  {'build MinHash/LSH index':<34} {build_ms:8.1f} ms")
+    print(f"  {'top-5 for every discovery':<34} {query_ms:8.1f} ms  "
+          f"({compared / count:.0f} compared per query)")
+    print(f"  {'pairwise Jaccard (extrapolated)':<34} {brute_ms:8.1f} ms  ({count - 1:,} compared per query)")
+    return 0
+
+
+BENCHMARKS = {
+    'startup': bench_startup,
+    'extract': bench_extract,
+    'score': bench_score,
+    'records': bench_records,
+    'similar': bench_similar,
+}
+
+
+def run(name, args):
+    """Run the named benchmark."""
+    if name not in BENCHMARKS:
+        print(f"Unknown benchmark '{name}' (expected one of {', '.join(BENCHMARKS)})", file=sys.stderr)
+        return 1
+    return BENCHMARKS[name](args)
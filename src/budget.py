@@ -0,0 +1,104 @@
+"""
+Deadline and API-call budget for one run.
+
+Stages consult a RunBudget as they go:
+- The content search stops scanning while enough is left to finish
+  extraction and analysis of what it has already found.
+- Once the budget is tight, quality analysis drops its optional probes
+  (contributors, related repositories).
+- Once it is exhausted, remaining discoveries are scored on patterns only
+  and contacts fall back to the repository owner.
+The report is still complete, and is marked partial.
+"""
+
+import re
+import time
+
+
+# Seconds per API call assumed until enough calls have been timed
+DEFAULT_SECONDS_PER_CALL = 0.5
+
+# Calls to observe before trusting the measured seconds per call
+CALIBRATION_CALLS = 20
+
+# Fraction of the budget left below which optional probes are dropped
+TIGHT_FRACTION = 0.25
+
+DURATION = re.compile(r'(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s?)?')
+
+
+def parse_duration(value):
+    """'20m', '1h30m', '90s' or '90' -> seconds."""
+    match = DURATION.fullmatch(value.strip())
+    if not match or not any(match.groups()):
+        raise ValueError(f"expected a duration like 20m, 1h30m or 90s, got {value!r}")
+    hours, minutes, seconds = (int(part or 0) for part in match.groups())
+    return hours * 3600 + minutes * 60 + seconds
+
+
+class RunBudget:
+    """
+    Wall-clock deadline and core API call cap, either optional.
+
+    Args:
+        deadline: Seconds the run may take
+        api_calls: Core API calls the run may spend
+        calls_spent: Callable returning core calls spent so far (e.g.
+            lambda: pool.requests_sent('core'))
+    """
+
+    def __init__(self, deadline=None, api_calls=None, calls_spent=None, clock=time.monotonic):
+        self.deadline = deadline
+        self.api_calls = api_calls
+        self.clock = clock
+        self._calls_spent = calls_spent or (lambda: 0)
+        self._started = clock()
+        self._calls_at_start = self._calls_spent()
+        self.stop_reason = None
+
+    def calls_used(self):
+        return self._calls_spent() - self._calls_at_start
+
+    def calls_left(self):
+        if self.api_calls is None:
+            return float('inf')
+        return self.api_calls - self.calls_used()
+
+    def seconds_left(self):
+        if self.deadline is None:
+            return float('inf')
+        return self.deadline - (self.clock() - self._started)
+
+    def seconds_per_call(self):
+        used = self.calls_used()
+        if used < CALIBRATION_CALLS:
+            return DEFAULT_SECONDS_PER_CALL
+        return (self.clock() - self._started) / used
+
+    def fraction_left(self):
+        fractions = [1.0]
+        if self.api_calls:
+            fractions.append(self.calls_left() / self.api_calls)
+        if self.deadline:
+            fractions.append(self.seconds_left() / self.deadline)
+        return min(fractions)
+
+    def can_afford(self, calls):
+        """True if calls more fit in both the call budget and the time left."""
+        if self.calls_left() < calls:
+            self.stop_reason = self.stop_reason or 'API budget'
+            return False
+        if self.seconds_left() < calls * self.seconds_per_call():
+            self.stop_reason = self.stop_reason or 'deadline'
+            return False
+        return True
+
+    def tight(self):
+        return self.fraction_left() < TIGHT_FRACTION
+
+    def exhausted(self):
+        return not self.can_afford(1)
+
+    def reason(self):
+        """What cut the run short, or None if nothing did."""
+        return self.stop_reason
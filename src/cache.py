@@ -0,0 +1,142 @@
+"""
+Persistent per-repository file cache.
+
+Remembers which files a repository does not have (and, more generally, any
+per-file status worth not re-fetching) so repeat runs skip the API round
+trip. Entries are keyed to the repository head: when a repo's head changes,
+everything recorded for it is forgotten.
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to unlocked writes
+    fcntl = None
+
+
+# File status for a path the repository does not have. Any other recorded
+# status is an int: a lower bound on the file's size in bytes, recorded when
+# a fetch was abandoned for being over a size cap.
+MISSING = 'missing'
+
+
+def repo_head(candidate):
+    """
+    Head key for a Candidate from the search results.
+
+    Built from the default branch and pushed_at timestamp that the search API
+    already returns, so computing it costs no API call. Any push to the repo
+    changes it, which is a superset of head-commit changes.
+    """
+    return f"{candidate.default_branch}@{candidate.last_push}"
+
+
+class RepoFileCache:
+    """
+    Map of (repository, path) -> status, invalidated by repository head.
+
+    Stored as JSON: {"owner/repo": {"head": ..., "files": {path: status}}}.
+    Lookups with a different head miss; recording with a new head replaces
+    the repository's entry. hits counts lookups that let a caller skip a
+    fetch.
+
+    Several processes (queue workers) may share one cache file: save()
+    holds a lock on a sibling .lock file, re-reads the file and merges this
+    instance's changes into it, so no process drops another's entries.
+    """
+
+    def __init__(self, cache_file):
+        self.cache_file = Path(cache_file)
+        self.lock_file = self.cache_file.with_name(self.cache_file.name + '.lock')
+        self._repos = self._read()
+        self._changed = set()
+        self.hits = 0
+
+    def _read(self):
+        if not self.cache_file.exists():
+            return {}
+        try:
+            with open(self.cache_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # A corrupt cache only costs API calls; start over
+            return {}
+
+    @contextmanager
+    def _locked(self):
+        """Hold an exclusive advisory lock for the duration of the block"""
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_file, 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _key(owner, repo):
+        return f"{owner}/{repo}".lower()
+
+    def status(self, owner, repo, head, path):
+        """Recorded status of path at head, or None if unknown."""
+        entry = self._repos.get(self._key(owner, repo))
+        if entry is None or entry['head'] != head:
+            return None
+        return entry['files'].get(path)
+
+    def is_missing(self, owner, repo, head, path):
+        missing = self.status(owner, repo, head, path) == MISSING
+        self.hits += missing
+        return missing
+
+    def exceeds(self, owner, repo, head, path, max_bytes):
+        """True if path is known to be larger than max_bytes."""
+        status = self.status(owner, repo, head, path)
+        oversized = isinstance(status, int) and status > max_bytes
+        self.hits += oversized
+        return oversized
+
+    def record(self, owner, repo, head, path, status=MISSING):
+        """Record the status of path at head."""
+        key = self._key(owner, repo)
+        entry = self._repos.get(key)
+        if entry is None or entry['head'] != head:
+            entry = self._repos[key] = {'head': head, 'files': {}}
+        if entry['files'].get(path) != status:
+            entry['files'][path] = status
+            self._changed.add(key)
+
+    def record_size(self, owner, repo, head, path, size):
+        """Record that path is at least size bytes."""
+        status = self.status(owner, repo, head, path)
+        if isinstance(status, int):
+            size = max(size, status)
+        self.record(owner, repo, head, path, size)
+
+    def save(self):
+        """Merge this instance's changes into the cache file, atomically."""
+        if not self._changed:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with self._locked():
+            # Entries other processes saved since this one loaded; ours win on
+            # the repositories this instance recorded (files merged at one head)
+            repos = self._read()
+            for key in self._changed:
+                ours, theirs = self._repos[key], repos.get(key)
+                if theirs is not None and theirs['head'] == ours['head']:
+                    ours['files'] = {**theirs['files'], **ours['files']}
+                repos[key] = ours
+            self._repos = repos
+
+            temp_file = self.cache_file.with_name(f"{self.cache_file.name}.{os.getpid()}.tmp")
+            with open(temp_file, 'w') as f:
+                json.dump(repos, f, separators=(',', ':'), sort_keys=True)
+            os.replace(temp_file, self.cache_file)
+        self._changed = set()
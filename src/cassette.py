@@ -0,0 +1,251 @@
+"""
+Record-and-replay transport for deterministic offline runs.
+
+A Cassette is a requests transport adapter mounted on the sessions every
+GitHub call goes through: the credential pool's session (which PyGithub
+uses once the pool is installed) and the RawFetcher's. Recording passes
+each request to the network and stores the response; replaying answers
+from the cassette with no network at all, optionally sleeping for the
+recorded latency (scaled) so timings stay comparable.
+
+Responses are matched by method, URL and request body. Repeats of the
+same request are replayed in recorded order, the last one standing in for
+any further repeats. Streamed bodies are stored as far as the pipeline
+read them, so size caps enforced mid-stream trip the same way on replay.
+
+The file is gzipped JSON lines: a header with the format version, the
+recorded credential labels and the run-state files the run started from
+(see snapshot()), then one interaction per line.
+"""
+
+import base64
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+from pathlib import Path
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+CASSETTE_VERSION = 1
+
+# Response headers describing the wire encoding, not the stored (decoded) body
+DROPPED_HEADERS = ('content-encoding', 'transfer-encoding', 'set-cookie')
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+
+class CassetteMiss(requests.ConnectionError):
+    """A replayed run sent a request the cassette has no response for."""
+
+
+def request_key(method, url, body):
+    """Identity of a request for matching: method, full URL and body digest."""
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    digest = hashlib.sha1(body).hexdigest()[:16] if body else ''
+    return f"{method} {url} {digest}"
+
+
+class _RecordingRaw:
+    """Wraps a urllib3 response, keeping the decoded bytes the caller reads."""
+
+    def __init__(self, raw, on_done):
+        self._raw = raw
+        self._on_done = on_done
+        self._chunks = []
+        self._done = False
+
+    def stream(self, amt=2 ** 16, decode_content=None):
+        for chunk in self._raw.stream(amt, decode_content=True):
+            self._chunks.append(chunk)
+            yield chunk
+        self._finish()
+
+    def read(self, amt=None, decode_content=None, **kwargs):
+        data = self._raw.read(amt, decode_content=True, **kwargs)
+        self._chunks.append(data)
+        if not data or amt is None:
+            self._finish()
+        return data
+
+    def close(self):
+        self._finish()
+        self._raw.close()
+
+    def release_conn(self):
+        self._finish()
+        self._raw.release_conn()
+
+    def _finish(self):
+        if not self._done:
+            self._done = True
+            self._on_done(b''.join(self._chunks))
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class Cassette(BaseAdapter):
+    """
+    Transport adapter that records to, or replays from, a cassette file.
+
+    Args:
+        path: Cassette file (.jsonl.gz)
+        mode: RECORD or REPLAY
+        latency_scale: On replay, sleep for the recorded latency times this
+            (0 answers instantly)
+    """
+
+    def __init__(self, path, mode=REPLAY, latency_scale=0):
+        super().__init__()
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode {mode!r}")
+        self.path = Path(path)
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.credentials = []
+        self.state = {}
+        self.interactions = []
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._upstream = HTTPAdapter() if mode == RECORD else None
+        self._queues = defaultdict(list)
+        if mode == REPLAY:
+            self._load()
+
+    @property
+    def recording(self):
+        return self.mode == RECORD
+
+    def mount(self, session):
+        """Send every GitHub request of a session through the cassette."""
+        session.mount('https://', self)
+        session.mount('http://', self)
+        return session
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if self.recording:
+            return self._record(request, stream, timeout, verify, cert, proxies)
+        return self._replay(request)
+
+    def close(self):
+        if self._upstream is not None:
+            self._upstream.close()
+
+    def _record(self, request, stream, timeout, verify, cert, proxies):
+        response = self._upstream.send(request, stream=True, timeout=timeout, verify=verify,
+                                       cert=cert, proxies=proxies)
+        entry = {
+            'key': request_key(request.method, request.url, request.body),
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': {k: v for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS},
+            'elapsed': round(response.elapsed.total_seconds(), 4)
+        }
+
+        def store(body):
+            try:
+                entry['body'] = body.decode('utf-8')
+            except UnicodeDecodeError:
+                entry['body_b64'] = base64.b64encode(body).decode('ascii')
+            with self._lock:
+                self.interactions.append(entry)
+
+        response.raw = _RecordingRaw(response.raw, store)
+        response.connection = self
+        if not stream:
+            response.content
+        return response
+
+    def _replay(self, request):
+        key = request_key(request.method, request.url, request.body)
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                self.misses += 1
+                raise CassetteMiss(f"No recorded response for {request.method} {request.url}")
+            entry = queue.pop(0) if len(queue) > 1 else queue[0]
+
+        if self.latency_scale:
+            time.sleep(entry['elapsed'] * self.latency_scale)
+
+        body = entry['body'].encode('utf-8') if 'body' in entry else base64.b64decode(entry.get('body_b64', ''))
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = entry['reason']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(body)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.elapsed = timedelta(seconds=entry['elapsed'])
+        return response
+
+    def _load(self):
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            header = json.loads(f.readline())
+            if header.get('version') != CASSETTE_VERSION:
+                raise ValueError(f"{self.path}: unsupported cassette version {header.get('version')}")
+            self.credentials = header.get('credentials', [])
+            self.state = header.get('state', {})
+            for line in f:
+                entry = json.loads(line)
+                self.interactions.append(entry)
+                self._queues[entry['key']].append(entry)
+
+    def save(self, credentials=()):
+        """Write the recorded interactions (record mode only)."""
+        if not self.recording:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        with self._lock:
+            interactions = list(self.interactions)
+        with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+            header = {'version': CASSETTE_VERSION, 'credentials': list(credentials), 'state': self.state}
+            f.write(json.dumps(header) + '\n')
+            for entry in interactions:
+                f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        os.replace(temp_path, self.path)
+
+    def snapshot(self, paths):
+        """
+        Keep the starting contents of run-state files (record mode).
+
+        Local state such as the file cache and yield model decides which
+        requests a run makes; saved with the cassette, it lets a replay
+        start from exactly what the recorded run saw.
+
+        Args:
+            paths: {name: path}; missing files are skipped
+        """
+        for name, path in paths.items():
+            path = Path(path)
+            if path.exists():
+                self.state[name] = path.read_text(encoding='utf-8')
+
+    def restore(self, paths):
+        """Write the recorded run-state files to paths ({name: path}), e.g. a replay's scratch copies."""
+        for name, path in paths.items():
+            if name in self.state:
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                Path(path).write_text(self.state[name], encoding='utf-8')
+
+    def replay_pool(self):
+        """A TokenPool with placeholder credentials labelled like the recorded ones."""
+        from src.tokens import PoolToken, TokenPool
+
+        labels = self.credentials or ['replay']
+        return TokenPool([PoolToken(label, token=f"replay-{i}") for i, label in enumerate(labels)])
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+The `discovery` command line.
+
+One entry point for the pipeline, the site generator, opt-out management,
+reports and rescoring. Only argparse and Config are imported up front; each
+subcommand imports its own modules when it runs, so quick commands like
+`discovery opt-out check` never pay for PyGithub, requests or yaml.
+"""
+
+import argparse
+import os
+import sys
+
+from src.config import Config
+
+
+# Metadata generate_json_report computes itself, dropped when rebuilding reports
+REPORT_DERIVED_METADATA = ('generated_at', 'version', 'total_discoveries',
+                           'high_quality_count', 'medium_quality_count')
+
+
+def parse_tiers(value):
+    """argparse type for --tiers: '1,2,4' -> [1, 2, 4]."""
+    try:
+        tiers = [int(part) for part in value.split(',') if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated tier numbers, got {value!r}")
+    if not tiers:
+        raise argparse.ArgumentTypeError("expected at least one tier")
+    return tiers
+
+
+def parse_deadline(value):
+    """argparse type for --deadline: '20m' -> 1200 seconds."""
+    from src.budget import parse_duration
+
+    try:
+        return parse_duration(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def cmd_run(args):
+    from src.main import main as run_pipeline
+    return run_pipeline(tier=args.tier, tiers=args.tiers, deadline=args.deadline, api_budget=args.api_budget,
+                        profile=args.profile, record=args.record, replay=args.replay,
+                        replay_latency=args.replay_latency, replay_output=args.replay_output, merge=args.merge)
+
+
+def cmd_resume(args):
+    from src.main import main as run_pipeline
+    return run_pipeline(resume=True, deadline=args.deadline, api_budget=args.api_budget, profile=args.profile,
+                        record=args.record, replay=args.replay, replay_latency=args.replay_latency,
+                        replay_output=args.replay_output, merge=args.merge)
+
+
+def cmd_site(args):
+    # The generator works relative to the project root (templates/, site/)
+    os.chdir(Config.PROJECT_ROOT)
+    from src import site_generator
+
+    if args.watch:
+        site_generator.watch_site(args.interval)
+    else:
+        site_generator.generate_site(force=args.force)
+    return 0
+
+
+def cmd_opt_out(args):
+    from src.opt_manager import OptOutManager
+
+    manager = OptOutManager(Config.OPT_OUT_JSON)
+
+    if args.action == 'add':
+        manager.add_opt_out(args.owner, args.repo, args.reason, publish=True)
+    elif args.action == 'remove':
+        manager.remove_opt_out(args.owner, args.repo, publish=True)
+    elif args.action == 'check':
+        if manager.is_opted_out(args.owner, args.repo):
+            print(f"{args.owner}/{args.repo} is OPTED OUT")
+        else:
+            print(f"{args.owner}/{args.repo} is NOT opted out")
+    elif args.action == 'list':
+        opted_out = manager.list_opted_out()
+        if opted_out:
+            print(f"Opted-out repositories ({len(opted_out)}):")
+            for repo in opted_out:
+                print(f"  - {repo}")
+        else:
+            print("No repositories have opted out")
+    elif args.action == 'filter':
+        manager.filter_discoveries(Config.DISCOVERIES_JSON, Config.DISCOVERIES_JSON)
+    elif args.action == 'compact':
+        manager.compact()
+        print(f"✓ Compacted opt-out list ({len(manager.list_opted_out())} entries)")
+    return 0
+
+
+def cmd_queue(args):
+    from src.workqueue import WorkQueue
+
+    queue = WorkQueue(args.queue or Config.QUEUE_DB)
+    try:
+        if args.action == 'status':
+            counts = queue.counts()
+            print(', '.join(f"{status}: {count}" for status, count in counts.items()))
+            return 0
+
+        if args.action == 'merge':
+            from src.worker import merge_queue
+            report_paths = merge_queue(queue)
+            print(f"✓ Reports generated from {queue.counts()['done']} processed candidates:")
+            print(f"  JSON: {report_paths['json']}")
+            print(f"  Markdown: {report_paths['markdown']}")
+            return 0
+
+        # fill and work call the API through the credential pool
+        from src.config import load_search_settings
+        from src.tokens import load_token_pool
+
+        Config.validate()
+        settings = load_search_settings()
+        token_pool = load_token_pool(Config).install()
+        token_pool.refresh()
+
+        if args.action == 'fill':
+            from src.worker import fill_queue
+            for number in args.tiers:
+                settings.tier(number)
+            added = fill_queue(queue, args.tiers, settings=settings)
+            print(f"✓ Queued {added} new candidates ({queue.outstanding()} outstanding)")
+        else:
+            from src.fetch import RawFetcher
+            from src.worker import run_worker
+            stats = {}
+            drained = run_worker(queue, settings=settings, fetcher=RawFetcher(auth=token_pool.auth),
+                                 batch=args.batch, lease_seconds=args.lease, stats=stats)
+            print(f"✓ Processed {stats['processed']} candidates, {stats['discoveries']} discoveries")
+            if not drained:
+                print("  Stopped early (rate limited); run again after the reset")
+
+        print("API usage by credential:")
+        for line in token_pool.summary():
+            print(f"  {line}")
+        return 0
+    except ValueError as e:
+        print(f"Configuration error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        queue.close()
+
+
+def cmd_daemon(args):
+    from datetime import datetime, timezone
+    from github import Github
+    from src.cache import RepoFileCache
+    from src.config import load_search_settings
+    from src.daemon import BUDGET_SHARE, RefreshDaemon, rebuild_outputs
+    from src.fetch import RawFetcher
+    from src.generate import generate_reports, load_json_report
+    from src.opt_manager import OptOutManager
+    from src.tokens import load_token_pool
+
+    # The site generator works relative to the project root
+    os.chdir(Config.PROJECT_ROOT)
+    try:
+        Config.validate()
+        settings = load_search_settings()
+    except ValueError as e:
+        print(f"Configuration error: {e}", file=sys.stderr)
+        return 1
+
+    token_pool = load_token_pool(Config).install()
+    token_pool.refresh()
+    discoveries, metadata = load_json_report()
+    generated_at = metadata.get('generated_at')
+    calls_per_hour = args.calls_per_hour or BUDGET_SHARE * Config.MAX_REQUESTS_PER_HOUR * len(token_pool.tokens)
+
+    daemon = RefreshDaemon(
+        discoveries,
+        Github(Config.GITHUB_TOKEN),
+        Config.REFRESH_STATE_JSON,
+        settings=settings,
+        metadata=report_metadata(metadata),
+        file_cache=RepoFileCache(Config.FILE_CACHE_JSON),
+        fetcher=RawFetcher(auth=token_pool.auth),
+        opt_out=OptOutManager(Config.OPT_OUT_JSON),
+        calls_per_hour=calls_per_hour,
+        calls_spent=token_pool.requests_sent,
+        rebuild=(lambda d, m: generate_reports(d, metadata=m)) if args.no_site else rebuild_outputs,
+        checked_since=(datetime.fromisoformat(generated_at.rstrip('Z')).replace(tzinfo=timezone.utc).timestamp()
+                       if generated_at else 0)
+    )
+    print(f"Refreshing {len(discoveries)} discoveries at up to {calls_per_hour:.0f} API calls/hour")
+    try:
+        checks = daemon.run(max_checks=args.max_checks)
+    except KeyboardInterrupt:
+        checks = None
+    print(f"✓ Refresh daemon stopped{f' after {checks} checks' if checks is not None else ''}")
+    for line in token_pool.summary():
+        print(f"  {line}")
+    return 0
+
+
+def report_metadata(metadata):
+    """Metadata worth carrying over when a report is regenerated."""
+    return {k: v for k, v in metadata.items() if k not in REPORT_DERIVED_METADATA} or None
+
+
+def cmd_report(args):
+    from src.generate import generate_markdown_report, load_json_report
+
+    discoveries, metadata = load_json_report(args.input)
+    path = generate_markdown_report(discoveries, output_path=args.output, metadata=report_metadata(metadata))
+    print(f"✓ Markdown report regenerated from {len(discoveries)} discoveries: {path}")
+    return 0
+
+
+def cmd_rescore(args):
+    import time
+    from src.config import load_search_settings
+    from src.generate import generate_reports, load_json_report
+    from src.scoring import rescore
+
+    weights = load_search_settings(args.config).quality_weights
+    discoveries, metadata = load_json_report()
+
+    start = time.perf_counter()
+    changed = rescore([d.quality for d in discoveries if d.quality], weights)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"✓ Rescored {len(discoveries)} discoveries in {elapsed:.1f} ms ({changed} scores changed)")
+
+    if args.dry_run:
+        return 0
+    report_paths = generate_reports(discoveries, metadata=report_metadata(metadata))
+    print(f"  JSON: {report_paths['json']}")
+    print(f"  Markdown: {report_paths['markdown']}")
+    return 0
+
+
+def cmd_bench(args):
+    from src import bench
+    return bench.run(args.benchmark, args)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='discovery',
+        description='Find repositories that have adopted CLAUDE.md discovery patterns.'
+    )
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    commands.required = True
+
+    run_options = argparse.ArgumentParser(add_help=False)
+    run_options.add_argument('--deadline', type=parse_deadline, default=None, metavar='DURATION',
+                            help='Finish within this time (e.g. 20m, 1h30m), degrading gracefully')
+    run_options.add_argument('--api-budget', type=int, default=None, metavar='CALLS',
+                            help='Spend at most this many core API calls, degrading gracefully')
+    run_options.add_argument('--profile', action='store_true',
+                            help='Profile each stage and time each repository (written to .cache/profile/)')
+    run_options.add_argument('--merge', action='store_true',
+                             help='Fold the results into the existing registry instead of replacing it, '
+                                  'logging new/changed/removed peers to REGISTRY_CHANGES.md')
+    cassette = run_options.add_mutually_exclusive_group()
+    cassette.add_argument('--record', default=None, metavar='CASSETTE',
+                          help='Record every GitHub API interaction to a cassette file (.jsonl.gz)')
+    cassette.add_argument('--replay', default=None, metavar='CASSETTE',
+                          help='Answer every GitHub API request from a recorded cassette, offline')
+    run_options.add_argument('--replay-latency', type=float, default=0, metavar='SCALE',
+                             help='On replay, wait the recorded latency times SCALE (default: 0, instant)')
+    run_options.add_argument('--replay-output', default=None, metavar='DIR',
+                             help='Where a replay writes its reports and changelog (default: .cache/replay/)')
+
+    run = commands.add_parser('run', parents=[run_options], help='Run the full discovery pipeline')
+    tier_choice = run.add_mutually_exclusive_group()
+    tier_choice.add_argument('--tier', type=int, default=1, help='Topic tier to search (default: 1)')
+    tier_choice.add_argument('--tiers', type=parse_tiers, default=None, metavar='N,N,...',
+                             help='Search several tiers concurrently and merge them into one report')
+    run.set_defaults(handler=cmd_run)
+
+    resume = commands.add_parser('resume', parents=[run_options], help='Resume an interrupted run from its checkpoint')
+    resume.set_defaults(handler=cmd_resume)
+
+    site = commands.add_parser('site', help='Generate the static registry site')
+    site.add_argument('--force', action='store_true', help='Rebuild every output, ignoring the build manifest')
+    site.add_argument('--watch', action='store_true', help='Rebuild affected pages when inputs change')
+    site.add_argument('--interval', type=float, default=1.0, help='Watch polling interval in seconds')
+    site.set_defaults(handler=cmd_site)
+
+    opt_out = commands.add_parser('opt-out', help='Manage the opt-out list')
+    actions = opt_out.add_subparsers(dest='action', metavar='action')
+    actions.required = True
+    add = actions.add_parser('add', help="Opt a repository out (repo '*' = every repo of owner)")
+    add.add_argument('owner')
+    add.add_argument('repo')
+    add.add_argument('reason', nargs='?')
+    for name, help_text in (('remove', 'Opt a repository back in'),
+                            ('check', 'Show whether a repository is opted out')):
+        action = actions.add_parser(name, help=help_text)
+        action.add_argument('owner')
+        action.add_argument('repo')
+    actions.add_parser('list', help='List opted-out repositories')
+    actions.add_parser('filter', help='Remove opted-out repositories from discoveries.json')
+    actions.add_parser('compact', help='Fold the journal into opt-out.json')
+    opt_out.set_defaults(handler=cmd_opt_out)
+
+    queue = commands.add_parser('queue', help='Coordinator/worker runs over a shared work queue')
+    queue_file = argparse.ArgumentParser(add_help=False)
+    queue_file.add_argument('--queue', default=None, help='Queue database (default: .discovery-queue.sqlite3)')
+    queue_actions = queue.add_subparsers(dest='action', metavar='action')
+    queue_actions.required = True
+    fill = queue_actions.add_parser('fill', parents=[queue_file], help='Prefilter tiers and enqueue their candidates')
+    fill.add_argument('--tiers', type=parse_tiers, default=[1], metavar='N,N,...',
+                      help='Tiers to prefilter (default: 1)')
+    work = queue_actions.add_parser('work', parents=[queue_file], help='Claim and process candidates until the queue is drained')
+    work.add_argument('--batch', type=int, default=10, help='Candidates claimed per lease')
+    work.add_argument('--lease', type=float, default=600, help='Lease length in seconds')
+    queue_actions.add_parser('status', parents=[queue_file], help='Count queued candidates by status')
+    queue_actions.add_parser('merge', parents=[queue_file], help='Generate reports from the processed candidates')
+    queue.set_defaults(handler=cmd_queue)
+
+    daemon = commands.add_parser('daemon', help='Keep the registry fresh, re-checking stale discoveries')
+    daemon.add_argument('--calls-per-hour', type=float, default=None,
+                        help='API calls to spend per hour (default: half of every credential\'s budget)')
+    daemon.add_argument('--max-checks', type=int, default=None, help='Stop after this many checks')
+    daemon.add_argument('--no-site', action='store_true', help='Rebuild the reports but not the site')
+    daemon.set_defaults(handler=cmd_daemon)
+
+    report = commands.add_parser('report', help='Regenerate DISCOVERIES.md from discoveries.json')
+    report.add_argument('--input', default=None, help='JSON report to read (default: discoveries.json)')
+    report.add_argument('--output', default=None, help='Markdown file to write (default: DISCOVERIES.md)')
+    report.set_defaults(handler=cmd_report)
+
+    rescore = commands.add_parser('rescore', help='Rescore discoveries.json from stored signals (no API calls)')
+    rescore.add_argument('--config', default=None, help='search_queries.yaml whose quality_weights to use')
+    rescore.add_argument('--dry-run', action='store_true', help='Report how many scores change without writing')
+    rescore.set_defaults(handler=cmd_rescore)
+
+    bench = commands.add_parser('bench', help='Run performance benchmarks')
+    bench.add_argument('benchmark', nargs='?', default='startup', help='Benchmark to run (default: startup)')
+    bench.add_argument('--runs', type=int, default=10, help='Repetitions per measurement')
+    bench.add_argument('--budget-ms', type=float, default=None,
+                       help='Fail when a measurement exceeds this many milliseconds')
+    bench.set_defaults(handler=cmd_bench)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
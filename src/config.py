@@ -1,64 +1,277 @@
 """
 Configuration management for claude-discovery.
 
-Loads environment variables and provides configuration access.
+Environment settings live on Config and are loaded explicitly (Config.load_env);
+search settings from config/search_queries.yaml are parsed, validated and
+compiled once per process into an immutable SearchSettings snapshot that is
+passed to each pipeline stage. Importing this module has no side effects.
 """
 
 import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from dotenv import load_dotenv
+from types import MappingProxyType
 
-# Load environment variables from .env file
-load_dotenv()
+from src.scoring import FEATURES as QUALITY_FEATURES
 
 
 class Config:
     """Configuration for claude-discovery."""
-    
-    # GitHub API
-    GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
-    
+
+    # GitHub API credentials, pooled for each run (see src/tokens.py)
+    GITHUB_TOKEN = None
+    GITHUB_TOKENS = ()
+    GITHUB_APP_ID = None
+    GITHUB_APP_PRIVATE_KEY_FILE = None
+    GITHUB_APP_INSTALLATION_ID = None
+
     # Rate limiting
-    MAX_REQUESTS_PER_HOUR = int(os.getenv('MAX_REQUESTS_PER_HOUR', 5000))
-    
+    MAX_REQUESTS_PER_HOUR = 5000
+
     # Result limits
-    DEFAULT_MAX_RESULTS = int(os.getenv('DEFAULT_MAX_RESULTS', 100))
-    
+    DEFAULT_MAX_RESULTS = 100
+
     # Quality thresholds
-    QUALITY_THRESHOLD = int(os.getenv('QUALITY_THRESHOLD', 5))
-    
+    QUALITY_THRESHOLD = 5
+
     # Paths
     PROJECT_ROOT = Path(__file__).parent.parent
     CONFIG_DIR = PROJECT_ROOT / 'config'
     DOCS_DIR = PROJECT_ROOT / 'docs'
-    
+    SEARCH_CONFIG = CONFIG_DIR / 'search_queries.yaml'
+
     # Output files
     DISCOVERIES_JSON = PROJECT_ROOT / 'discoveries.json'
     DISCOVERIES_MD = PROJECT_ROOT / 'DISCOVERIES.md'
-    
+    REGISTRY_CHANGELOG_MD = PROJECT_ROOT / 'REGISTRY_CHANGES.md'
+    OPT_OUT_JSON = PROJECT_ROOT / 'opt-out.json'
+
+    # Pipeline state saved after each stage for `discovery resume`
+    CHECKPOINT_JSON = PROJECT_ROOT / '.discovery-checkpoint.json'
+
+    # Work queue shared by coordinator and worker processes
+    QUEUE_DB = PROJECT_ROOT / '.discovery-queue.sqlite3'
+
+    # Persistent API caches (safe to delete)
+    CACHE_DIR = PROJECT_ROOT / '.cache'
+    FILE_CACHE_JSON = CACHE_DIR / 'repo-files.json'
+    YIELD_MODEL_JSON = CACHE_DIR / 'yield-model.json'
+    REFRESH_STATE_JSON = CACHE_DIR / 'refresh-state.json'
+    PROFILE_DIR = CACHE_DIR / 'profile'
+    REPLAY_OUTPUT_DIR = CACHE_DIR / 'replay'
+
+    _env_loaded = False
+
+    @classmethod
+    def load_env(cls):
+        """Load .env once and read settings from the environment."""
+        if cls._env_loaded:
+            return cls
+
+        from dotenv import load_dotenv
+        load_dotenv(cls.PROJECT_ROOT / '.env')
+
+        cls.GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
+        cls.GITHUB_TOKENS = tuple(
+            token.strip() for token in os.getenv('GITHUB_TOKENS', '').split(',') if token.strip()
+        )
+        cls.GITHUB_APP_ID = os.getenv('GITHUB_APP_ID') or None
+        cls.GITHUB_APP_PRIVATE_KEY_FILE = os.getenv('GITHUB_APP_PRIVATE_KEY_FILE') or None
+        cls.GITHUB_APP_INSTALLATION_ID = os.getenv('GITHUB_APP_INSTALLATION_ID') or None
+        cls.MAX_REQUESTS_PER_HOUR = _env_int('MAX_REQUESTS_PER_HOUR', cls.MAX_REQUESTS_PER_HOUR)
+        cls.DEFAULT_MAX_RESULTS = _env_int('DEFAULT_MAX_RESULTS', cls.DEFAULT_MAX_RESULTS)
+        cls.QUALITY_THRESHOLD = _env_int('QUALITY_THRESHOLD', cls.QUALITY_THRESHOLD)
+        cls._env_loaded = True
+        return cls
+
     @classmethod
     def validate(cls):
         """Validate that required configuration is present."""
-        if not cls.GITHUB_TOKEN:
+        cls.load_env()
+
+        if not (cls.GITHUB_TOKEN or cls.GITHUB_TOKENS or cls.GITHUB_APP_ID):
             raise ValueError(
                 "GITHUB_TOKEN not found in environment. "
                 "Copy .env.example to .env and add your GitHub token."
             )
-        
-        if cls.GITHUB_TOKEN == 'ghp_your_token_here':
+
+        if 'ghp_your_token_here' in (cls.GITHUB_TOKEN, *cls.GITHUB_TOKENS):
             raise ValueError(
                 "GITHUB_TOKEN is still set to placeholder value. "
                 "Replace with your actual GitHub Personal Access Token."
             )
-        
+
+        if cls.GITHUB_APP_ID and not (cls.GITHUB_APP_PRIVATE_KEY_FILE and cls.GITHUB_APP_INSTALLATION_ID):
+            raise ValueError(
+                "GITHUB_APP_ID needs GITHUB_APP_PRIVATE_KEY_FILE and GITHUB_APP_INSTALLATION_ID."
+            )
+        if cls.GITHUB_APP_INSTALLATION_ID and not cls.GITHUB_APP_INSTALLATION_ID.isdigit():
+            raise ValueError(
+                f"GITHUB_APP_INSTALLATION_ID must be an integer, got {cls.GITHUB_APP_INSTALLATION_ID!r}"
+            )
+
         return True
 
 
-# Validate configuration on import
-if __name__ != '__main__':
-    # Skip validation during testing or when running module directly
+def _env_int(name, default):
+    """Read an integer environment variable, failing fast on junk."""
+    value = os.getenv(name)
+    if value is None or value == '':
+        return default
     try:
-        Config.validate()
-    except ValueError as e:
-        # Print warning but don't crash on import
-        print(f"Warning: {e}")
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {value!r}") from None
+
+
+# Filters understood by build_search_query, with their expected types
+FILTER_TYPES = {
+    'archived': bool,
+    'fork': bool,
+    'min_stars': int,
+    'pushed_after': str,
+    'min_size_kb': int,
+    'min_topics': int,
+}
+
+
+@dataclass(frozen=True)
+class TierSettings:
+    """One topic tier from search_queries.yaml."""
+    name: str
+    topics: tuple
+    description: str
+    expected_results: str
+
+
+@dataclass(frozen=True)
+class DiscoveryPattern:
+    """A discovery pattern with its regex compiled once."""
+    pattern: str
+    regex: re.Pattern
+    weight: float
+    description: str
+
+
+@dataclass(frozen=True)
+class SearchSettings:
+    """Immutable, validated snapshot of search_queries.yaml."""
+    tiers: tuple
+    filters: MappingProxyType
+    discovery_patterns: tuple
+    target_files: tuple
+    quality_weights: MappingProxyType
+
+    def tier(self, number):
+        """Return the 1-indexed tier, raising ValueError if it does not exist."""
+        if number < 1 or number > len(self.tiers):
+            raise ValueError(f"Invalid tier {number}. Must be 1-{len(self.tiers)}")
+        return self.tiers[number - 1]
+
+
+def _require(condition, message):
+    if not condition:
+        raise ValueError(f"Invalid search configuration: {message}")
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def parse_search_settings(raw):
+    """
+    Validate a parsed search_queries.yaml document and build the snapshot.
+
+    Raises:
+        ValueError: describing the first problem found
+    """
+    _require(isinstance(raw, dict), "top level must be a mapping")
+
+    tiers = []
+    _require(isinstance(raw.get('tiers'), list) and raw['tiers'], "'tiers' must be a non-empty list")
+    for index, tier in enumerate(raw['tiers'], 1):
+        _require(isinstance(tier, dict), f"tier {index} must be a mapping")
+        topics = tier.get('topics')
+        _require(
+            isinstance(topics, list) and topics and all(isinstance(t, str) and t for t in topics),
+            f"tier {index} needs a non-empty list of topic strings"
+        )
+        tiers.append(TierSettings(
+            name=str(tier.get('name', f'tier-{index}')),
+            topics=tuple(topics),
+            description=str(tier.get('description', 'N/A')),
+            expected_results=str(tier.get('expected_results', 'unknown'))
+        ))
+
+    filters = raw.get('filters') or {}
+    _require(isinstance(filters, dict), "'filters' must be a mapping")
+    for key, value in filters.items():
+        _require(key in FILTER_TYPES, f"unknown filter '{key}' (expected one of {', '.join(FILTER_TYPES)})")
+        expected = FILTER_TYPES[key]
+        valid = isinstance(value, bool) if expected is bool else (
+            isinstance(value, expected) and not isinstance(value, bool)
+        )
+        _require(valid, f"filter '{key}' must be {expected.__name__}")
+
+    patterns = []
+    _require(
+        isinstance(raw.get('discovery_patterns'), list) and raw['discovery_patterns'],
+        "'discovery_patterns' must be a non-empty list"
+    )
+    for index, pattern_def in enumerate(raw['discovery_patterns'], 1):
+        _require(isinstance(pattern_def, dict), f"discovery pattern {index} must be a mapping")
+        pattern = pattern_def.get('pattern')
+        _require(isinstance(pattern, str) and pattern, f"discovery pattern {index} needs a 'pattern' string")
+        weight = pattern_def.get('weight', 1)
+        _require(_is_number(weight) and weight > 0, f"pattern '{pattern}' needs a positive weight")
+        try:
+            regex = re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+        except re.error as e:
+            raise ValueError(f"Invalid search configuration: pattern '{pattern}' does not compile: {e}") from None
+        patterns.append(DiscoveryPattern(
+            pattern=pattern,
+            regex=regex,
+            weight=weight,
+            description=str(pattern_def.get('description', ''))
+        ))
+
+    target_files = raw.get('target_files', ['README.md', 'CLAUDE.md'])
+    _require(
+        isinstance(target_files, list) and target_files and all(isinstance(f, str) and f for f in target_files),
+        "'target_files' must be a non-empty list of file names"
+    )
+
+    weights = raw.get('quality_weights') or {}
+    _require(isinstance(weights, dict), "'quality_weights' must be a mapping")
+    for key, value in weights.items():
+        _require(key in QUALITY_FEATURES, f"unknown quality weight '{key}' (expected one of {', '.join(QUALITY_FEATURES)})")
+        _require(_is_number(value) and value >= 0, f"quality weight '{key}' must be a non-negative number")
+
+    return SearchSettings(
+        tiers=tuple(tiers),
+        filters=MappingProxyType(dict(filters)),
+        discovery_patterns=tuple(patterns),
+        target_files=tuple(target_files),
+        quality_weights=MappingProxyType(dict(weights))
+    )
+
+
+@lru_cache(maxsize=None)
+def load_search_settings(config_path=None):
+    """
+    Load search_queries.yaml once per process (per path).
+
+    Args:
+        config_path: Optional path override (defaults to Config.SEARCH_CONFIG)
+
+    Returns:
+        SearchSettings snapshot
+    """
+    import yaml
+
+    config_path = Path(config_path) if config_path else Config.SEARCH_CONFIG
+    with open(config_path, 'r') as f:
+        raw = yaml.safe_load(f)
+    return parse_search_settings(raw)
@@ -0,0 +1,278 @@
+"""
+Refresh daemon: keeps the registry current without manual reruns.
+
+Known discoveries are re-checked one at a time, most stale first. A
+repository's refresh interval shrinks with its quality score and recent
+activity, so strong, active peers are checked more often than quiet ones.
+A check costs one get_repo call; only a repository that was pushed to
+since its last analysis goes back through search, extract and analyze.
+
+Checks are paced so the calls actually spent (counted by the credential
+pool) follow an even rate across the rate-limit window instead of bursts.
+The file cache, parsed settings and discoveries stay in memory between
+checks. Reports and the site are rebuilt only when a result changed, at
+most once per REBUILD_SECONDS.
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import requests
+from github import GithubException, RateLimitExceededException, UnknownObjectException
+from src.analyze import analyze_quality
+from src.extract import extract_contacts
+from src.generate import generate_reports
+from src.priority import days_since_push
+from src.search import search_for_discovery_patterns
+
+
+# Refresh interval of a score-0, inactive repository, in seconds
+BASE_INTERVAL = 7 * 24 * 3600
+
+# Floor for the busiest, highest-scoring repositories
+MIN_INTERVAL = 6 * 3600
+
+# Pushed within this many days counts as active (interval halved)
+ACTIVE_DAYS = 30
+
+# Share of the pool's hourly core budget the daemon may spend
+BUDGET_SHARE = 0.5
+
+# Minimum seconds between two rebuilds of the reports and site
+REBUILD_SECONDS = 600
+
+# Longest single sleep while nothing is due
+IDLE_SLEEP_SECONDS = 300
+
+# Wait after a failed check, doubled per consecutive failure up to IDLE_SLEEP_SECONDS
+ERROR_BACKOFF_SECONDS = 10
+
+
+def refresh_interval(discovery, now):
+    """Seconds between checks of a discovery."""
+    interval = BASE_INTERVAL / (1 + discovery.score / 5)
+    days = days_since_push(discovery.candidate, datetime.fromtimestamp(now, timezone.utc))
+    if days is not None and days < ACTIVE_DAYS:
+        interval /= 2
+    return max(interval, MIN_INTERVAL)
+
+
+def rebuild_outputs(discoveries, metadata):
+    """Rewrite the reports and incrementally rebuild the site."""
+    from src import site_generator
+
+    generate_reports(discoveries, metadata=metadata)
+    site_generator.generate_site()
+
+
+class RefreshDaemon:
+    """
+    Staleness-ordered re-checking of known discoveries.
+
+    Last-check times persist in state_file ({"owner/repo": epoch seconds}),
+    so a restarted daemon picks up where it left off.
+    """
+
+    def __init__(self, discoveries, github_client, state_file, settings=None, metadata=None,
+                 file_cache=None, fetcher=None, opt_out=None, calls_per_hour=2500, calls_spent=None,
+                 rebuild=rebuild_outputs, checked_since=0, clock=time.time, sleep=time.sleep):
+        """
+        Args:
+            discoveries: Discovery records to keep fresh
+            github_client: Github client for the per-check get_repo
+            state_file: JSON file of last-check times
+            settings, file_cache, fetcher: Passed to the pipeline stages
+            metadata: Report metadata carried into rebuilt reports
+            opt_out: Optional OptOutManager; opted-out repos are dropped
+            calls_per_hour: API calls the daemon may spend per hour
+            calls_spent: Callable returning API calls spent so far (e.g. a
+                TokenPool's requests_sent); without it each check counts as one
+            rebuild: Called with (discoveries, metadata) after changes
+            checked_since: Last-check time assumed for repos not in state_file
+        """
+        self.discoveries = {d.candidate.full_name: d for d in discoveries}
+        self.github_client = github_client
+        self.state_file = Path(state_file)
+        self.settings = settings
+        self.metadata = metadata
+        self.file_cache = file_cache
+        self.fetcher = fetcher
+        self.opt_out = opt_out
+        self.calls_per_hour = calls_per_hour
+        self.rebuild = rebuild
+        self.clock = clock
+        self.sleep = sleep
+        self._checks = 0
+        self.calls_spent = calls_spent or (lambda: self._checks)
+        self.last_checked = {}
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r') as f:
+                    self.last_checked = json.load(f)
+            except (OSError, ValueError):
+                self.last_checked = {}
+        self._checked_since = checked_since
+        self._dirty = False
+        self._last_rebuild = None
+
+    def staleness(self, name, now):
+        """Fraction of its refresh interval since a discovery was last checked (>= 1 is due)."""
+        last = self.last_checked.get(name, self._checked_since)
+        return (now - last) / refresh_interval(self.discoveries[name], now)
+
+    def most_stale(self, now):
+        """(name, staleness) of the discovery to check next, or (None, 0) if there are none."""
+        if not self.discoveries:
+            return None, 0
+        name = max(self.discoveries, key=lambda name: self.staleness(name, now))
+        return name, self.staleness(name, now)
+
+    def check(self, name):
+        """
+        Re-check one discovery, re-analyzing it if the repository changed.
+
+        Returns:
+            True if its registry entry changed (or it was dropped)
+        """
+        discovery = self.discoveries[name]
+        candidate = discovery.candidate
+        self._checks += 1
+
+        if self.opt_out is not None:
+            self.opt_out.refresh()
+            if self.opt_out.is_opted_out(candidate.owner, candidate.repo):
+                print(f"  {name}: opted out, dropped")
+                return self._drop(name)
+
+        try:
+            repo = self.github_client.get_repo(name)
+        except UnknownObjectException:
+            print(f"  {name}: no longer exists, dropped")
+            return self._drop(name)
+
+        before = discovery.to_dict()
+        candidate.stars = repo.stargazers_count
+        pushed = repo.pushed_at.isoformat() if repo.pushed_at else None
+
+        if pushed != candidate.last_push:
+            previous = (candidate.last_push, candidate.default_branch, candidate.language, candidate.description)
+            candidate.last_push = pushed
+            candidate.default_branch = repo.default_branch or candidate.default_branch
+            candidate.language = repo.language
+            candidate.description = repo.description
+
+            try:
+                stats = {}
+                found = search_for_discovery_patterns([candidate], settings=self.settings,
+                                                      file_cache=self.file_cache, stats=stats, fetcher=self.fetcher)
+                if not found:
+                    if (candidate.owner, candidate.repo) not in stats.get('clean', ()):
+                        # Rate-limited or a fetch failed: inconclusive, so keep the entry
+                        # as it was and leave it due for another check
+                        print(f"  {name}: re-scan incomplete, kept for the next check")
+                        candidate.last_push, candidate.default_branch, candidate.language, \
+                            candidate.description = previous
+                        return False
+                    print(f"  {name}: discovery patterns removed, dropped")
+                    return self._drop(name)
+                discovery = found[0]
+                discovery.contacts = extract_contacts(discovery, file_cache=self.file_cache, fetcher=self.fetcher)
+                discovery.quality = analyze_quality(discovery, settings=self.settings)
+            except Exception:
+                # The next check must see the push again and redo the analysis
+                candidate.last_push, candidate.default_branch, candidate.language, candidate.description = previous
+                raise
+            self.discoveries[name] = discovery
+
+        self.last_checked[name] = self.clock()
+        changed = discovery.to_dict() != before
+        print(f"  {name}: {'updated' if changed else 'unchanged'}")
+        self._dirty |= changed
+        return changed
+
+    def _drop(self, name):
+        del self.discoveries[name]
+        self.last_checked.pop(name, None)
+        self._dirty = True
+        return True
+
+    def flush(self, force=False):
+        """Save check times, and rebuild outputs if results changed (rate limited unless forced)."""
+        self.save_state()
+        if self.file_cache is not None:
+            self.file_cache.save()
+        if not self._dirty:
+            return False
+        now = self.clock()
+        if not force and self._last_rebuild is not None and now - self._last_rebuild < REBUILD_SECONDS:
+            return False
+        self.rebuild(list(self.discoveries.values()), self.metadata)
+        self._dirty = False
+        self._last_rebuild = now
+        return True
+
+    def save_state(self):
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.state_file.with_name(self.state_file.name + '.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump(self.last_checked, f, separators=(',', ':'), sort_keys=True)
+        os.replace(temp_file, self.state_file)
+
+    def run(self, max_checks=None):
+        """
+        Check due discoveries forever (or max_checks times), pacing API use.
+
+        Returns:
+            Number of checks made
+        """
+        started = self.clock()
+        spent_at_start = self.calls_spent()
+        checks = 0
+        failures = 0
+
+        try:
+            while max_checks is None or checks < max_checks:
+                now = self.clock()
+                name, staleness = self.most_stale(now)
+                if name is None:
+                    break
+                if staleness < 1:
+                    # Nothing due: publish pending changes, sleep until the next one is
+                    self.flush(force=True)
+                    wait = (1 - staleness) * refresh_interval(self.discoveries[name], now)
+                    self.sleep(min(wait, IDLE_SLEEP_SECONDS))
+                    continue
+
+                try:
+                    self.check(name)
+                except RateLimitExceededException as e:
+                    # Every credential is exhausted; wait for the earliest reset
+                    reset = int((e.headers or {}).get('x-ratelimit-reset', 0)) or now + IDLE_SLEEP_SECONDS
+                    print(f"  Rate limited, sleeping until {time.strftime('%H:%M:%S', time.localtime(reset))}")
+                    self.flush(force=True)
+                    self.sleep(max(reset - self.clock(), 1))
+                    continue
+                except (GithubException, requests.RequestException) as e:
+                    # Transient API or network failure: the entry stays due; back off and go on
+                    failures += 1
+                    backoff = min(ERROR_BACKOFF_SECONDS * 2 ** (failures - 1), IDLE_SLEEP_SECONDS)
+                    print(f"  {name}: check failed ({e}), retrying in {backoff:.0f}s")
+                    self.flush()
+                    self.sleep(backoff)
+                    continue
+                failures = 0
+                checks += 1
+                self.flush()
+
+                # Even pacing: calls spent so far should not run ahead of the hourly rate
+                spent = self.calls_spent() - spent_at_start
+                due = started + spent * 3600 / self.calls_per_hour
+                if due > self.clock():
+                    self.sleep(due - self.clock())
+        finally:
+            self.flush(force=True)
+
+        return checks
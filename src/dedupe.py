@@ -0,0 +1,112 @@
+"""
+Near-duplicate detection for template clones.
+
+Forks of templates, boilerplates and generated starters share nearly the
+same README or CLAUDE.md. The content search fingerprints the file each
+discovery matched with a 64-bit SimHash of its word shingles; files whose
+fingerprints differ in at most MAX_DISTANCE bits are near-duplicates.
+
+Fingerprints are split into MAX_DISTANCE + 1 blocks: two fingerprints that
+close must agree exactly on at least one block, so only fingerprints that
+share a block are compared. Each cluster keeps one representative for
+extraction and analysis; the others are flagged as its duplicates.
+"""
+
+import hashlib
+import re
+from collections import Counter
+
+
+# Words per shingle
+SHINGLE_WORDS = 3
+
+# Most differing bits for two fingerprints to count as near-duplicates
+MAX_DISTANCE = 3
+
+# Shorter documents are too generic to call clones
+MIN_WORDS = 30
+
+WORD = re.compile(r'\w+')
+
+
+def simhash(text):
+    """64-bit SimHash of a document's word shingles, or None if it is too short."""
+    import numpy as np
+
+    words = WORD.findall(text.lower())
+    if len(words) < MIN_WORDS:
+        return None
+    shingles = Counter(' '.join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1))
+
+    digests = b''.join(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest() for s in shingles)
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8)).reshape(len(shingles), 64)
+    weights = np.fromiter(shingles.values(), dtype=np.int64, count=len(shingles))
+    votes = (bits.astype(np.int64) * 2 - 1).T @ weights
+    return int(''.join('1' if vote > 0 else '0' for vote in votes), 2)
+
+
+def hamming(a, b):
+    return (a ^ b).bit_count()
+
+
+def _blocks(fingerprint):
+    """The fingerprint cut into MAX_DISTANCE + 1 blocks, tagged by position."""
+    count = MAX_DISTANCE + 1
+    width = 64 // count
+    return [(i, (fingerprint >> (i * width)) & ((1 << width) - 1)) for i in range(count)]
+
+
+def near_duplicate_clusters(fingerprints):
+    """
+    Group fingerprints within MAX_DISTANCE bits of each other (transitively).
+
+    Args:
+        fingerprints: One fingerprint (or None) per item
+
+    Returns:
+        List of clusters of two or more item indexes
+    """
+    parent = list(range(len(fingerprints)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets = {}
+    for i, fingerprint in enumerate(fingerprints):
+        if fingerprint is None:
+            continue
+        for block in _blocks(fingerprint):
+            for j in buckets.setdefault(block, []):
+                if find(i) != find(j) and hamming(fingerprint, fingerprints[j]) <= MAX_DISTANCE:
+                    parent[find(i)] = find(j)
+            buckets[block].append(i)
+
+    clusters = {}
+    for i, fingerprint in enumerate(fingerprints):
+        if fingerprint is not None:
+            clusters.setdefault(find(i), []).append(i)
+    return [members for members in clusters.values() if len(members) > 1]
+
+
+def mark_near_duplicates(discoveries):
+    """
+    Flag all but one discovery per near-duplicate cluster.
+
+    The representative is the cluster's richest match (pattern score, then
+    stars); the others get duplicate_of set to its full name.
+
+    Returns:
+        Number of discoveries flagged
+    """
+    flagged = 0
+    for members in near_duplicate_clusters([d.fingerprint for d in discoveries]):
+        cluster = [discoveries[i] for i in members]
+        representative = max(cluster, key=lambda d: (d.pattern_score, d.candidate.stars))
+        for discovery in cluster:
+            if discovery is not representative:
+                discovery.duplicate_of = representative.candidate.full_name
+                flagged += 1
+    return flagged
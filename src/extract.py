@@ -6,8 +6,11 @@ Privacy-respecting: Only uses public information.
 """
 
 import re
-from github import Github, GithubException
+from src.cache import MISSING, RepoFileCache, repo_head
 from src.config import Config
+from src.fetch import FetchError, FileNotFound, FileTooLarge, RawFetcher
+from src.profiling import timed
+from src.records import Candidate, Contact, Discovery
 
 
 # Bot accounts to filter out
@@ -30,19 +33,51 @@ IGNORE_EMAIL_PATTERNS = [
 ]
 
 
+# Contact files larger than this are not scanned
+MAX_CONTACT_FILE_BYTES = 100_000
+
+# Files checked for contacts, in priority order, before the discovery's own
+# markdown file (confidence 'low'); one fetch each
+CONTACT_FILES = (
+    ('SECURITY.md', 'high'),
+    ('CODE_OF_CONDUCT.md', 'high'),
+    ('package.json', 'medium'),
+    ('pyproject.toml', 'medium'),
+    ('pom.xml', 'medium')
+)
+
+# Bounded repetition keeps every match attempt short, so scanning stays linear
+# even on adversarial input (RFC 5321: local part <= 64, domain <= 253 chars;
+# GitHub usernames are at most 39 characters; a longer handle is not one, so
+# the match must not be followed by more of the handle. A trailing '-' cannot
+# end a username and is left as punctuation unless the handle goes on.)
+EMAIL_PATTERN = r'[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,253}\.[A-Za-z]{2,63}'
+USERNAME_PATTERN = r'[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,37}[a-zA-Z0-9])?(?!-?[A-Za-z0-9])'
+
+# All ignore patterns as one alternation: a single match call per email
+IGNORE_EMAIL_RE = re.compile('|'.join(f'(?:{p})' for p in IGNORE_EMAIL_PATTERNS), re.IGNORECASE)
+EMAIL_RE = re.compile(rf'^{EMAIL_PATTERN}$')
+EMAIL_IN_TEXT_RE = re.compile(rf'\b{EMAIL_PATTERN}\b')
+MENTION_RE = re.compile(rf'@({USERNAME_PATTERN})')
+
+# Emails and @mentions in one scan. An email consumes its '@', so its domain
+# is never mistaken for a mention.
+CONTACT_RE = re.compile(rf'\b(?P<email>{EMAIL_PATTERN})\b|@(?P<username>{USERNAME_PATTERN})')
+
+# Lines containing an '@': the only places a contact can be, so the full
+# scan skips the rest of the document
+AT_LINE_RE = re.compile(r'^[^@\n]*@.*$', re.MULTILINE)
+
+
 def is_valid_email(email):
     """Check if email appears to be valid and not a bot/example."""
     if not email:
         return False
 
-    # Check against ignore patterns
-    for pattern in IGNORE_EMAIL_PATTERNS:
-        if re.match(pattern, email, re.IGNORECASE):
-            return False
+    if IGNORE_EMAIL_RE.match(email):
+        return False
 
-    # Basic email format check
-    email_pattern = r'^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}$'
-    return re.match(email_pattern, email) is not None
+    return EMAIL_RE.match(email) is not None
 
 
 def is_valid_username(username):
@@ -59,13 +94,9 @@ def extract_emails_from_text(text):
     if not text:
         return []
 
-    # Email regex pattern
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    matches = re.findall(email_pattern, text)
-
     # Filter and deduplicate
     valid_emails = set()
-    for email in matches:
+    for email in EMAIL_IN_TEXT_RE.findall(text):
         if is_valid_email(email):
             valid_emails.add(email.lower())
 
@@ -77,115 +108,133 @@ def extract_usernames_from_text(text):
     if not text:
         return []
 
-    # GitHub mention pattern: @username
-    mention_pattern = r'@([a-zA-Z0-9](?:[a-zA-Z0-9-]*[a-zA-Z0-9])?)'
-    matches = re.findall(mention_pattern, text)
-
     # Filter and deduplicate
     valid_usernames = set()
-    for username in matches:
+    for username in MENTION_RE.findall(text):
         if is_valid_username(username):
             valid_usernames.add(username)
 
     return list(valid_usernames)
 
 
-def extract_contacts(repo_info):
+def extract_contacts_from_documents(documents):
+    """
+    Extract deduplicated contacts from many documents in one pass each.
+
+    Args:
+        documents: Iterable of (source_file, text, confidence), in priority
+            order; the first document a contact appears in is kept. @mentions
+            are only taken from markdown files.
+
+    Returns:
+        List of Contact records, each document's emails before its
+        usernames, in order of appearance
+    """
+    contacts = []
+    seen_contacts = set()
+
+    for source_file, text, confidence in documents:
+        if not text:
+            continue
+
+        take_usernames = source_file.endswith('.md')
+        emails = []
+        usernames = []
+
+        for match in CONTACT_RE.finditer('\n'.join(AT_LINE_RE.findall(text))):
+            email = match.group('email')
+            if email is not None:
+                email = email.lower()
+                if email not in seen_contacts and not IGNORE_EMAIL_RE.match(email):
+                    seen_contacts.add(email)
+                    emails.append(email)
+            elif take_usernames:
+                username = match.group('username')
+                username_key = f"@{username.lower()}"
+                if username_key not in seen_contacts and username.lower() not in BOT_ACCOUNTS:
+                    seen_contacts.add(username_key)
+                    usernames.append(username)
+
+        for email in emails:
+            contacts.append(Contact('email', email, source_file, confidence))
+        for username in usernames:
+            contacts.append(Contact('github', username, source_file, confidence))
+
+    return contacts
+
+
+def extract_contacts(discovery, file_cache=None, fetcher=None, budget=None):
     """
     Extract contact information from a repository.
 
     Args:
-        repo_info: Repository information from search results
+        discovery: Discovery record from the content search
+        file_cache: RepoFileCache of known-missing and oversized files; one
+            is loaded from Config.FILE_CACHE_JSON (and saved afterwards) if
+            not given
+        fetcher: RawFetcher to download files with (defaults to a new one)
+        budget: Optional RunBudget; once exhausted, no more files are fetched
 
     Returns:
-        List of contacts: [{type, value, source_file, confidence}]
+        List of Contact records (just the owner for a near-duplicate)
     """
     contacts = []
-    owner = repo_info['owner']
-    repo_name = repo_info['repo']
-    default_branch = repo_info.get('default_branch', 'main')
+    candidate = discovery.candidate
+    owner = candidate.owner
+    if discovery.duplicate_of:
+        return [Contact('github', owner, 'repository_owner', 'low')]
+    repo_name = candidate.repo
+    default_branch = candidate.default_branch
+    head = repo_head(candidate)
 
-    # Initialize GitHub client
-    github_client = Github(Config.GITHUB_TOKEN)
+    owns_cache = file_cache is None
+    if owns_cache:
+        file_cache = RepoFileCache(Config.FILE_CACHE_JSON)
 
-    try:
-        repo = github_client.get_repo(f"{owner}/{repo_name}")
+    fetcher = fetcher or RawFetcher(Config.GITHUB_TOKEN)
 
+    try:
         # Files to check for contacts (in priority order)
-        contact_files = [
-            ('SECURITY.md', 'high'),
-            ('CODE_OF_CONDUCT.md', 'high'),
-            ('package.json', 'medium'),
-            ('pyproject.toml', 'medium'),
-            ('pom.xml', 'medium'),
-            (repo_info.get('markdown_file', 'README.md'), 'low')
-        ]
+        contact_files = [*CONTACT_FILES, (discovery.markdown_file or 'README.md', 'low')]
 
-        seen_contacts = set()  # Deduplicate
+        documents = []
 
         for filename, confidence in contact_files:
+            if (file_cache.is_missing(owner, repo_name, head, filename) or
+                    file_cache.exceeds(owner, repo_name, head, filename, MAX_CONTACT_FILE_BYTES)):
+                continue
+            if budget is not None and budget.exhausted():
+                break
+
             try:
-                file_content = repo.get_contents(filename, ref=default_branch)
-
-                # Skip large files
-                if file_content.size > 100000:  # 100KB limit for contact extraction
-                    continue
-
-                content = file_content.decoded_content.decode('utf-8', errors='ignore')
-
-                # Extract emails
-                emails = extract_emails_from_text(content)
-                for email in emails:
-                    if email not in seen_contacts:
-                        contacts.append({
-                            'type': 'email',
-                            'value': email,
-                            'source_file': filename,
-                            'confidence': confidence
-                        })
-                        seen_contacts.add(email)
-
-                # Extract GitHub usernames (only from markdown files)
-                if filename.endswith('.md'):
-                    usernames = extract_usernames_from_text(content)
-                    for username in usernames:
-                        username_key = f"@{username}"
-                        if username_key not in seen_contacts:
-                            contacts.append({
-                                'type': 'github',
-                                'value': username,
-                                'source_file': filename,
-                                'confidence': confidence
-                            })
-                            seen_contacts.add(username_key)
-
-            except GithubException as e:
-                if e.status == 404:
-                    # File doesn't exist, continue
-                    continue
-                else:
-                    # Other error, log and continue
-                    continue
+                # Stream the raw file, giving up as soon as it passes the cap
+                content = fetcher.fetch_text(owner, repo_name, filename, default_branch, MAX_CONTACT_FILE_BYTES)
+                documents.append((filename, content, confidence))
+
+            except FileNotFound:
+                # File doesn't exist; remember that until the repo changes
+                file_cache.record(owner, repo_name, head, filename, MISSING)
+                continue
+            except FileTooLarge as e:
+                file_cache.record_size(owner, repo_name, head, filename, e.size)
+                continue
+            except FetchError:
+                # Other error, continue
+                continue
+
+        with timed('regex', f"{owner}/{repo_name}"):
+            contacts = extract_contacts_from_documents(documents)
 
         # Fallback: Add repository owner as contact if no other contacts found
         if not contacts:
-            owner_key = f"@{owner}"
-            if owner_key not in seen_contacts:
-                contacts.append({
-                    'type': 'github',
-                    'value': owner,
-                    'source_file': 'repository_owner',
-                    'confidence': 'low'
-                })
+            contacts.append(Contact('github', owner, 'repository_owner', 'low'))
 
     except Exception as e:
         # If all else fails, return owner as fallback
-        contacts = [{
-            'type': 'github',
-            'value': owner,
-            'source_file': 'repository_owner',
-            'confidence': 'low'
-        }]
+        contacts = [Contact('github', owner, 'repository_owner', 'low')]
+
+    if owns_cache:
+        file_cache.save()
 
     return contacts
 
@@ -196,15 +245,18 @@ if __name__ == '__main__':
     print()
 
     # Mock repo info (Budget Analyzer for testing)
-    mock_repo = {
-        'owner': 'budgetanalyzer',
-        'repo': 'orchestration',
-        'url': 'https://github.com/budgetanalyzer/orchestration',
-        'default_branch': 'main',
-        'markdown_file': 'CLAUDE.md'
-    }
+    mock_repo = Discovery(
+        Candidate(
+            owner='budgetanalyzer',
+            repo='orchestration',
+            url='https://github.com/budgetanalyzer/orchestration',
+            default_branch='main'
+        ),
+        markdown_file='CLAUDE.md'
+    )
 
     try:
+        Config.load_env()
         contacts = extract_contacts(mock_repo)
         print(f"✓ Extracted {len(contacts)} contacts")
         print()
@@ -212,8 +264,8 @@ if __name__ == '__main__':
         if contacts:
             print("Contacts found:")
             for contact in contacts:
-                print(f"  - {contact['type']}: {contact['value']}")
-                print(f"    Source: {contact['source_file']} (confidence: {contact['confidence']})")
+                print(f"  - {contact.type}: {contact.value}")
+                print(f"    Source: {contact.source_file} (confidence: {contact.confidence})")
 
     except Exception as e:
         print(f"✗ Error: {e}")
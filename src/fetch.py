@@ -0,0 +1,119 @@
+"""
+Raw file fetching from the GitHub contents API.
+
+get_contents returns a JSON envelope with the file base64-encoded, and only
+then can its size be checked. RawFetcher asks for the raw bytes instead
+(Accept: application/vnd.github.raw), streams them, aborts as soon as a
+size cap is exceeded and decodes UTF-8 incrementally as chunks arrive.
+"""
+
+import codecs
+from urllib.parse import quote
+
+import requests
+from github import RateLimitExceededException
+from src.profiling import timed
+
+
+API_URL = 'https://api.github.com'
+RAW_MEDIA_TYPE = 'application/vnd.github.raw'
+
+# Bytes read from the socket per iteration
+CHUNK_SIZE = 16 * 1024
+
+# Seconds to wait for a connection or the next chunk
+TIMEOUT = 30
+
+
+class FetchError(Exception):
+    """A file could not be fetched."""
+
+    def __init__(self, status, message):
+        super().__init__(f"{status}: {message}" if status else message)
+        self.status = status
+
+
+class FileNotFound(FetchError):
+    """The file does not exist at the requested ref."""
+
+
+class FileTooLarge(FetchError):
+    """The file is over the size cap; size is exact or a lower bound."""
+
+    def __init__(self, size, max_bytes):
+        super().__init__(None, f"over {max_bytes} bytes (at least {size})")
+        self.size = size
+
+
+def file_html_url(owner, repo, path, ref):
+    """Browser URL of a file, built locally instead of via get_repo."""
+    return f"https://github.com/{owner}/{repo}/blob/{quote(ref, safe='')}/{quote(path)}"
+
+
+class RawFetcher:
+    """Streams raw file contents over one keep-alive session."""
+
+    def __init__(self, token=None, session=None, auth=None):
+        """
+        Args:
+            token: Token sent with every request
+            session: requests.Session to use (defaults to a new one)
+            auth: requests auth signing each request instead of token,
+                e.g. a TokenPool's auth
+        """
+        self.session = session or requests.Session()
+        self.session.headers.update({
+            'Accept': RAW_MEDIA_TYPE,
+            'X-GitHub-Api-Version': '2022-11-28',
+        })
+        if auth is not None:
+            self.session.auth = auth
+        elif token:
+            self.session.headers['Authorization'] = f"token {token}"
+        self.bytes_received = 0
+
+    def fetch_text(self, owner, repo, path, ref, max_bytes):
+        """
+        Fetch a file as text, reading at most max_bytes of it.
+
+        Raises:
+            FileNotFound: the file does not exist (404)
+            FileTooLarge: the file is larger than max_bytes
+            RateLimitExceededException: the API rate limit is exhausted
+            FetchError: any other HTTP or network failure
+        """
+        url = f"{API_URL}/repos/{owner}/{repo}/contents/{quote(path)}"
+        try:
+            with timed('network', f"{owner}/{repo}"), self.session.get(url, params={'ref': ref}, stream=True, timeout=TIMEOUT) as response:
+                self._raise_for_status(response)
+
+                declared = response.headers.get('Content-Length')
+                if declared is not None and declared.isdigit() and int(declared) > max_bytes:
+                    raise FileTooLarge(int(declared), max_bytes)
+
+                decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+                parts = []
+                received = 0
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    received += len(chunk)
+                    self.bytes_received += len(chunk)
+                    if received > max_bytes:
+                        raise FileTooLarge(received, max_bytes)
+                    parts.append(decoder.decode(chunk))
+                parts.append(decoder.decode(b'', final=True))
+                return ''.join(parts)
+
+        except requests.RequestException as e:
+            raise FetchError(None, str(e)) from e
+
+    @staticmethod
+    def _raise_for_status(response):
+        status = response.status_code
+        if status == 200:
+            return
+        if status == 404:
+            raise FileNotFound(status, 'Not Found')
+        if status == 429 or (status == 403 and response.headers.get('X-RateLimit-Remaining') == '0'):
+            raise RateLimitExceededException(status, {'message': 'API rate limit exceeded'},
+                                             dict(response.headers))
+        raise FetchError(status, response.reason or 'request failed')
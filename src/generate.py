@@ -8,6 +8,8 @@ import json
 from datetime import datetime
 from collections import Counter
 from src.config import Config
+from src.records import Candidate, Contact, Discovery, QualityResult
+from src.similarity import similar_peers
 
 
 def generate_json_report(discoveries, output_path=None, metadata=None):
@@ -15,7 +17,7 @@ def generate_json_report(discoveries, output_path=None, metadata=None):
     Generate machine-readable JSON report.
 
     Args:
-        discoveries: List of discovery results
+        discoveries: List of Discovery records
         output_path: Optional path override (defaults to Config.DISCOVERIES_JSON)
         metadata: Optional metadata dict to include
 
@@ -27,8 +29,8 @@ def generate_json_report(discoveries, output_path=None, metadata=None):
 
     # Calculate statistics
     total_discoveries = len(discoveries)
-    high_quality = [d for d in discoveries if d.get('quality', {}).get('score', 0) >= 7]
-    medium_quality = [d for d in discoveries if 5 <= d.get('quality', {}).get('score', 0) < 7]
+    high_quality = [d for d in discoveries if d.score >= 7]
+    medium_quality = [d for d in discoveries if 5 <= d.score < 7]
 
     # Build report structure
     report = {
@@ -46,31 +48,18 @@ def generate_json_report(discoveries, output_path=None, metadata=None):
     # Sort discoveries by quality score (descending)
     sorted_discoveries = sorted(
         discoveries,
-        key=lambda d: d.get('quality', {}).get('score', 0),
+        key=lambda d: d.score,
         reverse=True
     )
 
-    # Add each discovery
-    for discovery in sorted_discoveries:
-        report['discoveries'].append({
-            'repository': {
-                'owner': discovery.get('owner'),
-                'name': discovery.get('repo'),
-                'url': discovery.get('url'),
-                'stars': discovery.get('stars'),
-                'language': discovery.get('language'),
-                'topics': discovery.get('topics', []),
-                'last_push': discovery.get('last_push')
-            },
-            'discovery': {
-                'markdown_file': discovery.get('markdown_file'),
-                'file_url': discovery.get('file_url'),
-                'patterns_found': discovery.get('patterns_found', []),
-                'pattern_score': discovery.get('pattern_score', 0)
-            },
-            'contacts': discovery.get('contacts', []),
-            'quality': discovery.get('quality', {})
-        })
+    # Add each discovery, with its most similar peers from the LSH index
+    for discovery, peers in zip(sorted_discoveries, similar_peers(sorted_discoveries)):
+        entry = discovery.to_dict()
+        entry['similar'] = [
+            {'owner': peer.owner, 'name': peer.repo, 'similarity': round(similarity, 2)}
+            for peer, similarity in peers
+        ]
+        report['discoveries'].append(entry)
 
     # Write JSON file
     with open(output_path, 'w') as f:
@@ -84,7 +73,7 @@ def generate_markdown_report(discoveries, output_path=None, metadata=None):
     Generate human-readable Markdown report.
 
     Args:
-        discoveries: List of discovery results
+        discoveries: List of Discovery records
         output_path: Optional path override (defaults to Config.DISCOVERIES_MD)
         metadata: Optional metadata dict to include
 
@@ -96,21 +85,21 @@ def generate_markdown_report(discoveries, output_path=None, metadata=None):
 
     # Calculate statistics
     total_discoveries = len(discoveries)
-    high_quality = [d for d in discoveries if d.get('quality', {}).get('score', 0) >= 7]
-    medium_quality = [d for d in discoveries if 5 <= d.get('quality', {}).get('score', 0) < 7]
-    low_quality = [d for d in discoveries if d.get('quality', {}).get('score', 0) < 5]
+    high_quality = [d for d in discoveries if d.score >= 7]
+    medium_quality = [d for d in discoveries if 5 <= d.score < 7]
+    low_quality = [d for d in discoveries if d.score < 5]
 
     # Sort discoveries by quality score (descending)
     sorted_discoveries = sorted(
         discoveries,
-        key=lambda d: d.get('quality', {}).get('score', 0),
+        key=lambda d: d.score,
         reverse=True
     )
 
     # Count pattern frequencies
     all_patterns = []
     for d in discoveries:
-        all_patterns.extend(d.get('patterns_found', []))
+        all_patterns.extend(d.patterns_found)
     pattern_counts = Counter(all_patterns)
 
     # Build markdown
@@ -120,6 +109,13 @@ def generate_markdown_report(discoveries, output_path=None, metadata=None):
     lines.append(f"Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC")
     lines.append("")
 
+    if metadata and metadata.get('partial'):
+        lines.append(f"> **⚠ Partial report:** the run stopped early ({metadata['partial_reason']}). "
+                     f"{metadata.get('unscanned_candidates', 0)} candidates were not scanned, "
+                     f"{metadata.get('lean_analyses', 0)} discoveries were analyzed without optional probes "
+                     f"and {metadata.get('unanalyzed_discoveries', 0)} were scored on patterns only.")
+        lines.append("")
+
     # Summary section
     lines.append("## Summary")
     lines.append("")
@@ -129,6 +125,13 @@ def generate_markdown_report(discoveries, output_path=None, metadata=None):
     lines.append(f"- **Lower quality (score < 5):** {len(low_quality)}")
     lines.append("")
 
+    # Per-tier breakdown for multi-tier runs (a repo counts for every tier that found it)
+    tier_counts = Counter(tier for d in discoveries for tier in d.candidate.tiers)
+    if len(tier_counts) > 1:
+        for tier, count in sorted(tier_counts.items()):
+            lines.append(f"- **Tier {tier}:** {count} discoveries")
+        lines.append("")
+
     if metadata:
         lines.append("### Search Parameters")
         lines.append("")
@@ -144,24 +147,23 @@ def generate_markdown_report(discoveries, output_path=None, metadata=None):
         lines.append("|------------|-------|-------|----------|----------|---------|-----------|")
 
         for d in high_quality:
-            repo_link = f"[{d['owner']}/{d['repo']}]({d['url']})"
-            stars = d.get('stars', 0)
-            score = d.get('quality', {}).get('score', 0)
-            pattern_count = len(d.get('patterns_found', []))
-            language = d.get('language', 'N/A')
+            repo_link = f"[{d.owner}/{d.repo}]({d.url})"
+            stars = d.candidate.stars
+            score = d.score
+            pattern_count = len(d.patterns_found)
+            language = d.candidate.language or 'N/A'
 
             # Get first contact
-            contacts = d.get('contacts', [])
-            if contacts:
-                first_contact = contacts[0]
-                if first_contact['type'] == 'email':
-                    contact_str = first_contact['value']
+            if d.contacts:
+                first_contact = d.contacts[0]
+                if first_contact.type == 'email':
+                    contact_str = first_contact.value
                 else:
-                    contact_str = f"@{first_contact['value']}"
+                    contact_str = f"@{first_contact.value}"
             else:
                 contact_str = "N/A"
 
-            last_push = d.get('last_push', 'Unknown')
+            last_push = d.candidate.last_push or 'Unknown'
             if last_push and last_push != 'Unknown':
                 last_push = last_push[:10]  # Just the date
 
@@ -173,15 +175,15 @@ def generate_markdown_report(discoveries, output_path=None, metadata=None):
         lines.append("### Details")
         lines.append("")
         for d in high_quality:
-            lines.append(f"#### [{d['owner']}/{d['repo']}]({d['url']})")
+            lines.append(f"#### [{d.owner}/{d.repo}]({d.url})")
             lines.append("")
-            lines.append(f"**Quality Score:** {d.get('quality', {}).get('score', 0)}/10")
+            lines.append(f"**Quality Score:** {d.score}/10")
             lines.append("")
-            lines.append(f"**Reasoning:** {d.get('quality', {}).get('reasoning', 'N/A')}")
+            lines.append(f"**Reasoning:** {d.quality.reasoning if d.quality else 'N/A'}")
             lines.append("")
-            lines.append(f"**Discovery File:** [{d.get('markdown_file')}]({d.get('file_url')})")
+            lines.append(f"**Discovery File:** [{d.markdown_file}]({d.file_url})")
             lines.append("")
-            patterns = d.get('patterns_found', [])
+            patterns = d.patterns_found
             if patterns:
                 lines.append(f"**Patterns Found:** {', '.join(patterns[:10])}")
                 lines.append("")
@@ -196,13 +198,12 @@ def generate_markdown_report(discoveries, output_path=None, metadata=None):
         lines.append("|------------|-------|-------|----------|---------|")
 
         for d in medium_quality:
-            repo_link = f"[{d['owner']}/{d['repo']}]({d['url']})"
-            stars = d.get('stars', 0)
-            score = d.get('quality', {}).get('score', 0)
-            pattern_count = len(d.get('patterns_found', []))
+            repo_link = f"[{d.owner}/{d.repo}]({d.url})"
+            stars = d.candidate.stars
+            score = d.score
+            pattern_count = len(d.patterns_found)
 
-            contacts = d.get('contacts', [])
-            contact_str = contacts[0]['value'] if contacts else "N/A"
+            contact_str = d.contacts[0].value if d.contacts else "N/A"
 
             lines.append(f"| {repo_link} | {stars} | {score} | {pattern_count} | {contact_str} |")
 
@@ -213,9 +214,8 @@ def generate_markdown_report(discoveries, output_path=None, metadata=None):
         lines.append("## Lower Quality (Score < 5)")
         lines.append("")
         for d in low_quality:
-            repo_link = f"[{d['owner']}/{d['repo']}]({d['url']})"
-            score = d.get('quality', {}).get('score', 0)
-            lines.append(f"- {repo_link} (score: {score})")
+            repo_link = f"[{d.owner}/{d.repo}]({d.url})"
+            lines.append(f"- {repo_link} (score: {d.score})")
         lines.append("")
 
     # Pattern analysis
@@ -245,12 +245,35 @@ def generate_markdown_report(discoveries, output_path=None, metadata=None):
     return str(output_path)
 
 
+def load_json_report(input_path=None):
+    """
+    Load a JSON report back into Discovery records.
+
+    Inverse of generate_json_report, so the Markdown report can be rebuilt
+    from discoveries.json without re-running the pipeline.
+
+    Args:
+        input_path: Optional path override (defaults to Config.DISCOVERIES_JSON)
+
+    Returns:
+        (discoveries, metadata) tuple
+    """
+    if input_path is None:
+        input_path = Config.DISCOVERIES_JSON
+
+    with open(input_path, 'r') as f:
+        report = json.load(f)
+
+    discoveries = [Discovery.from_dict(entry) for entry in report.get('discoveries', [])]
+    return discoveries, report.get('metadata', {})
+
+
 def generate_reports(discoveries, metadata=None):
     """
     Generate both JSON and Markdown reports.
 
     Args:
-        discoveries: List of discovery results
+        discoveries: List of Discovery records
         metadata: Optional metadata dict to include in reports
 
     Returns:
@@ -272,27 +295,26 @@ if __name__ == '__main__':
 
     # Mock discoveries
     mock_discoveries = [
-        {
-            'owner': 'budgetanalyzer',
-            'repo': 'orchestration',
-            'url': 'https://github.com/budgetanalyzer/orchestration',
-            'stars': 5,
-            'language': 'Shell',
-            'topics': ['ai-native', 'kubernetes'],
-            'last_push': '2024-11-25T00:00:00Z',
-            'markdown_file': 'CLAUDE.md',
-            'file_url': 'https://github.com/budgetanalyzer/orchestration/blob/main/CLAUDE.md',
-            'patterns_found': ['kubectl', 'tree -', 'grep -r', 'tilt'],
-            'pattern_score': 15,
-            'contacts': [
-                {'type': 'github', 'value': 'budgetanalyzer', 'source_file': 'repository_owner', 'confidence': 'low'}
-            ],
-            'quality': {
-                'score': 8,
-                'signals_found': ['has_ci_cd', 'has_kubernetes', 'high_discovery_depth'],
-                'reasoning': 'High-quality peer: K8s configs, rich discovery patterns'
-            }
-        }
+        Discovery(
+            Candidate(
+                owner='budgetanalyzer',
+                repo='orchestration',
+                stars=5,
+                language='Shell',
+                topics=['ai-native', 'kubernetes'],
+                last_push='2024-11-25T00:00:00Z'
+            ),
+            markdown_file='CLAUDE.md',
+            file_url='https://github.com/budgetanalyzer/orchestration/blob/main/CLAUDE.md',
+            patterns_found=['kubectl', 'tree -', 'grep -r', 'tilt'],
+            pattern_score=15,
+            contacts=[Contact('github', 'budgetanalyzer', 'repository_owner', 'low')],
+            quality=QualityResult(
+                score=8,
+                signals_found=['has_ci_cd', 'has_kubernetes', 'high_discovery_depth'],
+                reasoning='High-quality peer: K8s configs, rich discovery patterns'
+            )
+        )
     ]
 
     try:
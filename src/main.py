@@ -9,76 +9,328 @@ Orchestrates the discovery workflow:
 5. Generate reports
 """
 
+import json
+import os
+import shutil
 import sys
-from src.config import Config
-from src.prefilter import prefilter_by_topics
+import tempfile
+from contextlib import nullcontext
+from pathlib import Path
+from src.config import Config, load_search_settings
+from src.prefilter import prefilter_tiers
 from src.search import search_for_discovery_patterns
 from src.extract import extract_contacts
 from src.analyze import analyze_quality
 from src.generate import generate_reports
+from src.opt_manager import OptOutManager
+from src.cache import RepoFileCache
+from src.dedupe import mark_near_duplicates
+from src.fetch import RawFetcher
+from src.priority import YieldModel, prioritize
+from src.records import Candidate, Discovery
+from src.registry import merge_into_registry
+from src.tokens import load_token_pool
+from src.budget import RunBudget
+from src.profiling import RunProfiler, timed
+from src.cassette import RECORD, REPLAY, Cassette
 
 
-def main(tier=1):
+# Local run state that decides which API requests a run makes (candidate
+# order, skipped file fetches, resumed stages). A recording keeps its
+# starting contents; a replay works on scratch copies seeded from them, so
+# it makes the recorded requests and leaves the real files untouched.
+REPLAY_STATE = ('YIELD_MODEL_JSON', 'FILE_CACHE_JSON', 'CHECKPOINT_JSON')
+
+# Reports a run writes. A replay writes them to its own output directory so
+# recorded results never overwrite the working tree; a merge replays against
+# the registry the recording started from.
+REPLAY_OUTPUTS = ('DISCOVERIES_JSON', 'DISCOVERIES_MD', 'REGISTRY_CHANGELOG_MD')
+
+
+def load_checkpoint(path=None):
+    """Load the saved pipeline state, or None if there is nothing to resume."""
+    path = path or Config.CHECKPOINT_JSON
+    if not path.exists():
+        return None
+    with open(path, 'r') as f:
+        state = json.load(f)
+
+    # Discoveries are stored in report form; link each back to its full candidate
+    candidates = [Candidate.from_dict(entry) for entry in state['candidates']]
+    by_name = {(c.owner, c.repo): c for c in candidates}
+    state['candidates'] = candidates
+    state['discoveries'] = [
+        Discovery.from_dict(entry, candidate=by_name.get(
+            (entry['repository']['owner'], entry['repository']['name'])))
+        for entry in state['discoveries']
+    ]
+    return state
+
+
+def save_checkpoint(state, path=None):
+    """Atomically save pipeline state after a completed stage."""
+    path = path or Config.CHECKPOINT_JSON
+    temp_path = path.with_name(path.name + '.tmp')
+    with open(temp_path, 'w') as f:
+        json.dump({
+            **state,
+            'candidates': [candidate.to_dict() for candidate in state['candidates']],
+            'discoveries': [discovery.to_dict() for discovery in state['discoveries']]
+        }, f)
+    os.replace(temp_path, path)
+
+
+def partial_metadata(budget, candidates, discoveries, search_stats):
+    """Report metadata marking what a budget-bounded run left out (empty if nothing)."""
+    unscanned = len(candidates) - search_stats.get('processed', len(candidates))
+    lean = sum(1 for d in discoveries if d.quality and (d.quality.signals or {}).get('skipped_probes'))
+    unanalyzed = sum(1 for d in discoveries if d.quality and 'skipped' in d.quality.signal_details)
+    if not (budget.reason() or unscanned or lean or unanalyzed):
+        return {}
+    return {
+        'partial': True,
+        'partial_reason': budget.reason() or 'budget tight',
+        'unscanned_candidates': unscanned,
+        'lean_analyses': lean,
+        'unanalyzed_discoveries': unanalyzed
+    }
+
+
+def main(tier=1, resume=False, tiers=None, deadline=None, api_budget=None, profile=False,
+         record=None, replay=None, replay_latency=0, replay_output=None, merge=False):
     """Run the complete discovery workflow.
 
     Args:
         tier: Which topic tier to search (1=primary, 2=fallback, 3=expansion)
+        resume: Continue the interrupted run saved in the checkpoint file
+            instead of starting over (its tiers win over the tier arguments)
+        tiers: Several tiers to search concurrently in one run, merged into
+            one deduplicated report (overrides tier)
+        deadline: Seconds the run may take
+        api_budget: Core API calls the run may spend; with deadline, stages
+            degrade (fewer candidates, lean analysis) and the report is
+            marked partial instead of the run overrunning
+        profile: Write per-stage cProfiles, per-repository timings and a
+            flame graph to Config.PROFILE_DIR
+        record: Cassette file to record every GitHub API interaction (and
+            the starting REPLAY_STATE files) to
+        replay: Cassette file to answer every GitHub API request from,
+            with no network (and no credentials needed); the file cache,
+            yield model and checkpoint are scratch copies of the recorded ones
+        replay_latency: Multiple of the recorded latencies to wait on replay
+            (0 answers instantly)
+        replay_output: Directory a replay writes its reports and changelog to
+            (defaults to Config.REPLAY_OUTPUT_DIR)
+        merge: Fold the results into the existing registry (and log the
+            changes) instead of replacing the reports
     """
+    profiler = RunProfiler(Config.PROFILE_DIR).start() if profile else None
+    stage = profiler.stage if profiler else (lambda name: nullcontext())
+    cassette = token_pool = replay_dir = None
+    real_state = {name: getattr(Config, name) for name in REPLAY_STATE + REPLAY_OUTPUTS}
     try:
+        if replay:
+            if not os.path.exists(replay):
+                raise ValueError(f"Cassette {replay} not found")
+            cassette = Cassette(replay, REPLAY, latency_scale=replay_latency)
+            replay_dir = Path(tempfile.mkdtemp(prefix='discovery-replay-'))
+            output_dir = Path(replay_output or Config.REPLAY_OUTPUT_DIR)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            for name in REPLAY_STATE:
+                setattr(Config, name, replay_dir / real_state[name].name)
+            for name in REPLAY_OUTPUTS:
+                setattr(Config, name, output_dir / real_state[name].name)
+            if merge and Config.DISCOVERIES_JSON.exists():
+                Config.DISCOVERIES_JSON.unlink()  # An earlier replay's result is not the recorded registry
+            cassette.restore({name: getattr(Config, name) for name in REPLAY_STATE + ('DISCOVERIES_JSON',)})
+            print(f"Replaying {len(cassette.interactions)} recorded API interactions from {replay}")
+            print(f"  Reports go to {output_dir}/")
+        elif record:
+            cassette = Cassette(record, RECORD)
+            cassette.snapshot({name: real_state[name] for name in REPLAY_STATE})
+            if merge:
+                cassette.snapshot({'DISCOVERIES_JSON': real_state['DISCOVERIES_JSON']})
+            print(f"Recording API interactions to {record}")
+
+        tiers = sorted(set(tiers or [tier]))
+        state = {
+            'tiers': tiers,
+            'completed_stage': 0,
+            'candidates': [],
+            'discoveries': [],
+            'prefilter_stats': {},
+            'search_stats': {}
+        }
+        if resume:
+            checkpoint = load_checkpoint()
+            if checkpoint is None:
+                raise ValueError(f"No checkpoint to resume ({Config.CHECKPOINT_JSON} not found)")
+            state = checkpoint
+            tiers = state['tiers']
+            print(f"Resuming tier {', '.join(map(str, tiers))} run after stage {state['completed_stage']}")
+            print()
+
         # Validate configuration
         print("Validating configuration...")
-        Config.validate()
+        if cassette is None or cassette.recording:
+            Config.validate()
+        else:
+            # No credentials needed, but .env settings shape the recorded requests
+            Config.load_env()
+        settings = load_search_settings()
+        for number in tiers:
+            settings.tier(number)
         print(f"✓ Configuration valid")
-        print(f"  GitHub token: {'*' * 20}")
+
+        # Every API call from here on goes through the credential pool
+        token_pool = (cassette.replay_pool() if cassette and not cassette.recording
+                      else load_token_pool(Config)).install()
+        if cassette:
+            cassette.mount(token_pool.session)
+        token_pool.refresh()
+        print(f"  GitHub credentials: {len(token_pool.tokens)}")
+        budget = RunBudget(deadline=deadline, api_calls=api_budget,
+                           calls_spent=lambda: token_pool.requests_sent('core'))
+        if deadline or api_budget:
+            print(f"  Budget: {f'{deadline:.0f}s' if deadline else 'no deadline'}, "
+                  f"{f'{api_budget} core calls' if api_budget else 'no call cap'}")
+        print(f"  Search config: {len(settings.tiers)} tiers, "
+              f"{len(settings.discovery_patterns)} patterns, "
+              f"{len(settings.target_files)} target files")
         print()
 
         # Stage 1: Topic pre-filtering
-        print("Stage 1: Pre-filtering by topics...")
-        print(f"  Searching with tier {tier}...")
-        candidates = prefilter_by_topics(tier=tier)
-        print(f"✓ Found {len(candidates)} candidate repositories")
-        print()
-        
+        if state['completed_stage'] < 1:
+            with stage('prefilter'):
+                print("Stage 1: Pre-filtering by topics...")
+                print(f"  Searching with tier(s) {', '.join(map(str, tiers))}...")
+                opt_out = OptOutManager(Config.OPT_OUT_JSON)
+                prefilter_stats = {}
+                state['candidates'] = prefilter_tiers(
+                    tiers, opt_out=opt_out, stats=prefilter_stats, settings=settings, budget=budget
+                )
+                state['prefilter_stats'] = prefilter_stats
+                state['completed_stage'] = 1
+                save_checkpoint(state)
+                print(f"✓ Found {len(state['candidates'])} candidate repositories")
+                if prefilter_stats['opted_out_skipped']:
+                    print(f"  Skipped {prefilter_stats['opted_out_skipped']} opted-out repositories, "
+                          f"saving ~{prefilter_stats['api_calls_saved']} API calls")
+                print()
+        candidates = state['candidates']
+        prefilter_stats = state['prefilter_stats']
+
+        # Known-missing/oversized files and one keep-alive raw fetch session,
+        # shared by the content search and contact extraction
+        file_cache = RepoFileCache(Config.FILE_CACHE_JSON)
+        fetcher = RawFetcher(auth=token_pool.auth)
+        if cassette:
+            cassette.mount(fetcher.session)
+
         # Stage 2: Content search
-        print("Stage 2: Searching for discovery patterns...")
-        discoveries = search_for_discovery_patterns(candidates)
-        print(f"✓ Found {len(discoveries)} repos with discovery patterns")
-        print()
-        
+        if state['completed_stage'] < 2:
+            with stage('search'):
+                print("Stage 2: Searching for discovery patterns...")
+
+                # Most promising first, so a cut-short run loses the least valuable tail
+                yield_model = YieldModel(Config.YIELD_MODEL_JSON)
+                candidates = prioritize(candidates, yield_model)
+                state['candidates'] = candidates
+                search_stats = {}
+                state['discoveries'] = search_for_discovery_patterns(
+                    candidates, settings=settings, file_cache=file_cache, stats=search_stats,
+                    fetcher=fetcher, budget=budget
+                )
+                file_cache.save()
+
+                yield_model.record_search(candidates, state['discoveries'], search_stats['clean'])
+                yield_model.save()
+
+                # Template clones share one representative's extraction and analysis
+                search_stats['near_duplicates'] = mark_near_duplicates(state['discoveries'])
+                state['search_stats'] = search_stats
+                state['completed_stage'] = 2
+                save_checkpoint(state)
+                print(f"✓ Found {len(state['discoveries'])} repos with discovery patterns")
+                if search_stats['near_duplicates']:
+                    print(f"  {search_stats['near_duplicates']} are near-duplicates of another discovery "
+                          f"and will not be analyzed")
+                print()
+        discoveries = state['discoveries']
+
         # Stage 3: Contact extraction
-        print("Stage 3: Extracting contact information...")
-        for discovery in discoveries:
-            discovery['contacts'] = extract_contacts(discovery)
-        contact_count = sum(len(d.get('contacts', [])) for d in discoveries)
-        print(f"✓ Extracted {contact_count} contacts")
-        print()
-        
+        if state['completed_stage'] < 3:
+            with stage('extract'):
+                print("Stage 3: Extracting contact information...")
+                for discovery in discoveries:
+                    discovery.contacts = extract_contacts(discovery, file_cache=file_cache, fetcher=fetcher,
+                                                          budget=budget)
+                file_cache.save()
+                state['completed_stage'] = 3
+                save_checkpoint(state)
+                contact_count = sum(len(d.contacts) for d in discoveries)
+                print(f"✓ Extracted {contact_count} contacts")
+                print()
+
         # Stage 4: Quality analysis
-        print("Stage 4: Analyzing quality...")
-        for discovery in discoveries:
-            discovery['quality'] = analyze_quality(discovery)
-        high_quality = [d for d in discoveries if d['quality']['score'] >= Config.QUALITY_THRESHOLD]
+        if state['completed_stage'] < 4:
+            with stage('analyze'):
+                print("Stage 4: Analyzing quality...")
+                for discovery in discoveries:
+                    discovery.quality = analyze_quality(discovery, settings=settings, budget=budget)
+                state['completed_stage'] = 4
+                save_checkpoint(state)
+        high_quality = [d for d in discoveries if d.score >= Config.QUALITY_THRESHOLD]
         print(f"✓ Analyzed {len(discoveries)} repos")
         print(f"  {len(high_quality)} repos scored >= {Config.QUALITY_THRESHOLD}")
         print()
-        
+
         # Stage 5: Generate reports
         print("Stage 5: Generating reports...")
         metadata = {
-            'tier': tier,
-            'total_candidates': len(candidates)
+            'tier': tiers[0] if len(tiers) == 1 else ','.join(map(str, tiers)),
+            'total_candidates': len(candidates),
+            **prefilter_stats,
+            'near_duplicates': state.get('search_stats', {}).get('near_duplicates', 0),
+            **partial_metadata(budget, candidates, discoveries, state.get('search_stats', {}))
         }
-        report_paths = generate_reports(discoveries, metadata=metadata)
-        print(f"✓ Reports generated:")
+        if metadata.get('partial'):
+            print(f"  ⚠ Partial report ({metadata['partial_reason']})")
+        with stage('report'), timed('render'):
+            if merge:
+                # Only a clean scan proves a registry entry lost its patterns; one
+                # whose fetches failed is kept rather than logged as removed
+                clean = state.get('search_stats', {}).get('clean', [])
+                report_paths = merge_into_registry(
+                    discoveries, metadata=metadata,
+                    scanned=[(owner.lower(), repo.lower()) for owner, repo in clean],
+                    opt_out=OptOutManager(Config.OPT_OUT_JSON)
+                )
+            else:
+                report_paths = generate_reports(discoveries, metadata=metadata)
+        print(f"✓ Reports {'merged into the registry' if merge else 'generated'}:")
         print(f"  JSON: {report_paths['json']}")
         print(f"  Markdown: {report_paths['markdown']}")
+        if merge:
+            changes = report_paths['changes']
+            print(f"  Changelog: {report_paths['changelog']} ({len(changes['new'])} new, "
+                  f"{len(changes['changed'])} changed, {len(changes['removed'])} removed)")
+        print()
+
+        print("API usage by credential:")
+        for line in token_pool.summary():
+            print(f"  {line}")
         print()
-        
+
+        # The run is complete; nothing left to resume
+        if Config.CHECKPOINT_JSON.exists():
+            Config.CHECKPOINT_JSON.unlink()
+
         print("Discovery complete!")
         print(f"Found {len(high_quality)} high-quality peers.")
-        
+
         return 0
-        
+
     except ValueError as e:
         print(f"Configuration error: {e}", file=sys.stderr)
         return 1
@@ -90,6 +342,26 @@ def main(tier=1):
     except Exception as e:
         print(f"Unexpected error: {e}", file=sys.stderr)
         return 3
+    finally:
+        if cassette is not None and cassette.recording:
+            cassette.save(credentials=[token.label for token in token_pool.tokens] if token_pool else [])
+            print(f"Recorded {len(cassette.interactions)} API interactions to {cassette.path}")
+        elif cassette is not None and cassette.misses:
+            print(f"⚠ {cassette.misses} requests were not in the cassette")
+        if replay_dir is not None:
+            for name, path in real_state.items():
+                setattr(Config, name, path)
+            shutil.rmtree(replay_dir, ignore_errors=True)
+        if profiler:
+            profiler.stop()
+            profile_paths = profiler.write()
+            print()
+            print("Profile:")
+            for line in profiler.summary():
+                print(f"  {line}")
+            print(f"  Stage profiles: {profiler.out_dir}/stage-*.prof")
+            print(f"  Timings: {profile_paths['json']}")
+            print(f"  Flame graph (collapsed stacks): {profile_paths['flamegraph']}")
 
 
 if __name__ == '__main__':
@@ -4,14 +4,64 @@ Manage opt-in and opt-out requests for the discovery registry
 """
 
 import json
+import os
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to unlocked writes
+    fcntl = None
+
+
+# Repository part of an owner-wide opt-out ("owner/*")
+OWNER_WILDCARD = '*'
+
+# Journal entries replayed on every load before they are folded into opt-out.json
+COMPACT_THRESHOLD = 100
+
 
 class OptOutManager:
+    """
+    Opt-out list backed by an in-memory hash index.
+
+    opt-out.json is the compacted snapshot. Changes are appended to a
+    journal file next to it (one JSON object per line) and folded into the
+    snapshot once the journal grows past COMPACT_THRESHOLD entries. Writers
+    hold an exclusive lock on a sibling .lock file so concurrent runs never
+    interleave or lose updates. Command-line changes pass publish=True:
+    readers of the tracked opt-out.json alone must see every opt-out, and
+    the CLI is not the hot path. A long-lived instance calls refresh() to
+    pick up other processes' changes; a compaction elsewhere (a replaced
+    snapshot or journal) makes it reload from the snapshot.
+    """
+
     def __init__(self, opt_out_file='opt-out.json'):
         self.opt_out_file = Path(opt_out_file)
-        self.data = self._load()
+        self.journal_file = Path(f"{self.opt_out_file}.journal")
+        self.lock_file = Path(f"{self.opt_out_file}.lock")
+        with self._locked(exclusive=False):
+            self._reload()
+            self._replay_journal()
+
+    @staticmethod
+    def _normalize(owner, repo):
+        """Index key for a repository (GitHub names are case-insensitive)"""
+        return f"{owner}/{repo}".lower()
+
+    @contextmanager
+    def _locked(self, exclusive=True):
+        """Hold a shared or exclusive advisory lock for the duration of the block"""
+        if fcntl is None or not self.opt_out_file.parent.exists():
+            yield
+            return
+        with open(self.lock_file, 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
 
     def _load(self):
         """Load opt-out data"""
@@ -24,61 +74,196 @@ class OptOutManager:
             'notes': 'Repositories that have requested exclusion'
         }
 
-    def _save(self):
-        """Save opt-out data"""
-        self.data['last_updated'] = datetime.utcnow().isoformat() + 'Z'
-        with open(self.opt_out_file, 'w') as f:
+    def _rebuild_index(self):
+        """Index snapshot entries by repository key and by owner for wildcards"""
+        self._repositories = {}
+        self._owners = {}
+        for entry in self.data['opt_out_repositories']:
+            self._index(entry)
+
+    def _index(self, entry):
+        owner, _, repo = entry['repository'].partition('/')
+        if repo == OWNER_WILDCARD:
+            self._owners[owner.lower()] = entry
+        else:
+            self._repositories[entry['repository'].lower()] = entry
+
+    def _unindex(self, repo_id):
+        owner, _, repo = repo_id.partition('/')
+        if repo == OWNER_WILDCARD:
+            return self._owners.pop(owner.lower(), None)
+        return self._repositories.pop(repo_id.lower(), None)
+
+    def _apply(self, record):
+        """Apply one journal record to the in-memory state"""
+        repo_id = record['repository']
+        if record['op'] == 'add':
+            entry = {
+                'repository': repo_id,
+                'opted_out_at': record['at'],
+                'reason': record.get('reason')
+            }
+            self._unindex(repo_id)
+            self._index(entry)
+        elif record['op'] == 'remove':
+            self._unindex(repo_id)
+        self.data['last_updated'] = record['at']
+
+    @staticmethod
+    def _version(path, *fields):
+        """Stat fields identifying a file's current version, or None if it is missing"""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return tuple(getattr(stat, field) for field in fields)
+
+    def _snapshot_version(self):
+        # Compaction replaces opt-out.json, so a changed version means it ran
+        return self._version(self.opt_out_file, 'st_ino', 'st_mtime_ns', 'st_size')
+
+    def _journal_version(self):
+        # Appends keep the inode; compaction unlinks the journal and a new one is created
+        return self._version(self.journal_file, 'st_ino')
+
+    def _reload(self):
+        """Reload the snapshot and replay the journal from its start"""
+        self.data = self._load()
+        self._snapshot_id = self._snapshot_version()
+        self._journal_id = None
+        self._journal_offset = 0
+        self._journal_entries = 0
+        self._rebuild_index()
+
+    def _replay_journal(self):
+        """Apply journal records appended since the last replay (by any process)"""
+        journal_id = self._journal_version()
+        if (self._snapshot_version() != self._snapshot_id
+                or (self._journal_id is not None and journal_id != self._journal_id)
+                or (journal_id is not None and self.journal_file.stat().st_size < self._journal_offset)):
+            # Another process compacted (replacing the snapshot and the journal)
+            # since the last replay: the journal this instance read is gone
+            self._reload()
+        self._journal_id = journal_id
+
+        if journal_id is not None:
+            with open(self.journal_file, 'r') as f:
+                f.seek(self._journal_offset)
+                for line in f:
+                    if not line.endswith('\n'):
+                        break  # Partial line from an interrupted write
+                    self._apply(json.loads(line))
+                    self._journal_offset += len(line.encode('utf-8'))
+                    self._journal_entries += 1
+
+        self.data['opt_out_repositories'] = list(self._owners.values()) + list(self._repositories.values())
+
+    def refresh(self):
+        """Pick up changes made by other processes since the last load"""
+        with self._locked(exclusive=False):
+            self._replay_journal()
+
+    def _append(self, record, publish=False):
+        """Durably append a record to the journal, compacting when it grows large (or to publish)"""
+        line = json.dumps(record) + '\n'
+        with open(self.journal_file, 'a') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_offset += len(line.encode('utf-8'))
+        self._journal_entries += 1
+        self._apply(record)
+        self.data['opt_out_repositories'] = list(self._owners.values()) + list(self._repositories.values())
+
+        if publish or self._journal_entries >= COMPACT_THRESHOLD:
+            self._compact()
+
+    def _compact(self):
+        """Fold the journal into opt-out.json (atomically) and truncate it; caller holds the lock"""
+        self.data['opt_out_repositories'] = sorted(
+            list(self._owners.values()) + list(self._repositories.values()),
+            key=lambda entry: entry['repository'].lower()
+        )
+        temp_file = Path(f"{self.opt_out_file}.tmp")
+        with open(temp_file, 'w') as f:
             json.dump(self.data, f, indent=2)
+        os.replace(temp_file, self.opt_out_file)
+
+        if self.journal_file.exists():
+            self.journal_file.unlink()
+        self._snapshot_id = self._snapshot_version()
+        self._journal_id = None
+        self._journal_offset = 0
+        self._journal_entries = 0
+
+    def compact(self):
+        """Fold all journaled changes into opt-out.json"""
+        with self._locked():
+            self._replay_journal()
+            self._compact()
+
+    def add_opt_out(self, owner, repo, reason=None, publish=False):
+        """
+        Add a repository (or every repository of owner when repo is '*') to the opt-out list
 
-    def add_opt_out(self, owner, repo, reason=None):
-        """Add a repository to the opt-out list"""
+        With publish=True the change is folded into opt-out.json at once, as
+        the command-line tools do, so readers of the tracked file see it.
+        """
         repo_id = f"{owner}/{repo}"
 
-        # Check if already opted out
-        for entry in self.data['opt_out_repositories']:
-            if entry['repository'] == repo_id:
+        with self._locked():
+            self._replay_journal()
+
+            # Check if already opted out
+            if self._normalize(owner, repo) in self._repositories or (
+                repo == OWNER_WILDCARD and owner.lower() in self._owners
+            ):
                 print(f"Repository {repo_id} is already opted out")
                 return False
 
-        entry = {
-            'repository': repo_id,
-            'opted_out_at': datetime.utcnow().isoformat() + 'Z',
-            'reason': reason
-        }
+            self._append({
+                'op': 'add',
+                'repository': repo_id,
+                'at': datetime.utcnow().isoformat() + 'Z',
+                'reason': reason
+            }, publish)
 
-        self.data['opt_out_repositories'].append(entry)
-        self._save()
         print(f"✓ Added {repo_id} to opt-out list")
         return True
 
-    def remove_opt_out(self, owner, repo):
-        """Remove a repository from the opt-out list (opt back in)"""
+    def remove_opt_out(self, owner, repo, publish=False):
+        """Remove a repository (or an owner-wide '*' entry) from the opt-out list (opt back in); see add_opt_out"""
         repo_id = f"{owner}/{repo}"
 
-        original_count = len(self.data['opt_out_repositories'])
-        self.data['opt_out_repositories'] = [
-            entry for entry in self.data['opt_out_repositories']
-            if entry['repository'] != repo_id
-        ]
+        with self._locked():
+            self._replay_journal()
 
-        if len(self.data['opt_out_repositories']) < original_count:
-            self._save()
-            print(f"✓ Removed {repo_id} from opt-out list (opted back in)")
-            return True
-        else:
-            print(f"Repository {repo_id} was not in the opt-out list")
-            return False
+            if repo == OWNER_WILDCARD:
+                present = owner.lower() in self._owners
+            else:
+                present = self._normalize(owner, repo) in self._repositories
+
+            if present:
+                self._append({
+                    'op': 'remove',
+                    'repository': repo_id,
+                    'at': datetime.utcnow().isoformat() + 'Z'
+                }, publish)
+                print(f"✓ Removed {repo_id} from opt-out list (opted back in)")
+                return True
+            else:
+                print(f"Repository {repo_id} was not in the opt-out list")
+                return False
 
     def is_opted_out(self, owner, repo):
-        """Check if a repository is opted out"""
-        repo_id = f"{owner}/{repo}"
-        return any(
-            entry['repository'] == repo_id
-            for entry in self.data['opt_out_repositories']
+        """Check if a repository is opted out, directly or through an owner-wide entry"""
+        return (
+            owner.lower() in self._owners
+            or self._normalize(owner, repo) in self._repositories
         )
 
     def list_opted_out(self):
-        """List all opted-out repositories"""
+        """List all opted-out repositories ('owner/*' for owner-wide entries)"""
         return [entry['repository'] for entry in self.data['opt_out_repositories']]
 
     def filter_discoveries(self, discoveries_file='discoveries.json', output_file='discoveries.json'):
@@ -96,6 +281,11 @@ class OptOutManager:
 
         filtered_count = original_count - len(data['discoveries'])
 
+        # Nor may they appear as a remaining discovery's similar peer
+        for d in data['discoveries']:
+            if 'similar' in d:
+                d['similar'] = [p for p in d['similar'] if not self.is_opted_out(p['owner'], p['name'])]
+
         if filtered_count > 0:
             # Save filtered discoveries
             with open(output_file, 'w') as f:
@@ -112,11 +302,12 @@ def main():
 
     if len(sys.argv) < 2:
         print("Usage:")
-        print("  python opt_manager.py add <owner> <repo> [reason]")
+        print("  python opt_manager.py add <owner> <repo> [reason]   (repo '*' = every repo of owner)")
         print("  python opt_manager.py remove <owner> <repo>")
         print("  python opt_manager.py list")
         print("  python opt_manager.py filter")
         print("  python opt_manager.py check <owner> <repo>")
+        print("  python opt_manager.py compact")
         sys.exit(1)
 
     manager = OptOutManager()
@@ -129,7 +320,7 @@ def main():
         owner = sys.argv[2]
         repo = sys.argv[3]
         reason = sys.argv[4] if len(sys.argv) > 4 else None
-        manager.add_opt_out(owner, repo, reason)
+        manager.add_opt_out(owner, repo, reason, publish=True)
 
     elif command == 'remove':
         if len(sys.argv) < 4:
@@ -137,7 +328,7 @@ def main():
             sys.exit(1)
         owner = sys.argv[2]
         repo = sys.argv[3]
-        manager.remove_opt_out(owner, repo)
+        manager.remove_opt_out(owner, repo, publish=True)
 
     elif command == 'list':
         opted_out = manager.list_opted_out()
@@ -151,6 +342,10 @@ def main():
     elif command == 'filter':
         manager.filter_discoveries()
 
+    elif command == 'compact':
+        manager.compact()
+        print(f"✓ Compacted opt-out list ({len(manager.list_opted_out())} entries)")
+
     elif command == 'check':
         if len(sys.argv) < 4:
             print("Error: Missing owner and repo")
@@ -5,18 +5,12 @@ Reduces search space from millions of repos to ~50-200 candidates
 by using GitHub Search API with topic and metadata filters.
 """
 
-import time
-import yaml
-from pathlib import Path
-from github import Github, RateLimitExceededException
-from src.config import Config
-
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-def load_search_config():
-    """Load search queries configuration from YAML."""
-    config_path = Config.CONFIG_DIR / 'search_queries.yaml'
-    with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+from github import Github, RateLimitExceededException
+from src.config import Config, load_search_settings
+from src.records import Candidate
 
 
 def build_search_query(tier_config, filters):
@@ -77,109 +71,225 @@ def check_rate_limit(github_client):
     return rate_limit
 
 
-def prefilter_by_topics(tier=1):
+def estimate_calls_per_candidate(target_file_count):
     """
-    Pre-filter repositories using GitHub topic search.
+    Lower bound of core API calls one candidate costs after the search results.
+
+    One topics lookup here, then one fetch per target file in the content
+    search (the candidate already carries its default branch, so there is
+    no get_repo). Candidates that match cost roughly a dozen more in contact
+    extraction and quality analysis, so savings from pruning are at least
+    this much per skipped repository.
+    """
+    return 1 + target_file_count
+
+
+# Distinct topic searches run concurrently; kept low to stay clear of
+# GitHub's secondary rate limits on the search API
+MAX_CONCURRENT_SEARCHES = 4
+
+
+class CandidatePool:
+    """
+    Deduplicated candidates merged from concurrent topic searches.
+
+    Each repository is claimed by the first search that sees it, so its
+    per-repo calls happen once; later sightings only add their tiers.
+    Candidates come out in (topic, search rank) order of first sighting,
+    independent of thread timing.
+    """
+
+    def __init__(self, opt_out=None):
+        self._opt_out = opt_out
+        self._lock = threading.Lock()
+        self._candidates = {}  # full name -> Candidate (None until fetched)
+        self._tiers = {}       # full name -> set of tiers
+        self._order = {}       # full name -> (topic index, rank)
+        self.opted_out = set()
+
+    def claim(self, owner, name, tiers, order):
+        """Return True if the caller should fetch this repo; otherwise merge its tiers."""
+        full_name = f"{owner}/{name}"
+        with self._lock:
+            if full_name in self.opted_out:
+                return False
+
+            if full_name in self._tiers:
+                self._tiers[full_name].update(tiers)
+                self._order[full_name] = min(self._order[full_name], order)
+                return False
+
+            # Respect opt-outs before spending any call on this repo
+            if self._opt_out is not None and self._opt_out.is_opted_out(owner, name):
+                self.opted_out.add(full_name)
+                return False
+
+            self._candidates[full_name] = None
+            self._tiers[full_name] = set(tiers)
+            self._order[full_name] = order
+            return True
+
+    def fill(self, candidate):
+        """Store the fetched Candidate for a claimed repo."""
+        with self._lock:
+            self._candidates[candidate.full_name] = candidate
+
+    def release(self, owner, name):
+        """Give up a claim whose fetch failed."""
+        full_name = f"{owner}/{name}"
+        with self._lock:
+            for index in (self._candidates, self._tiers, self._order):
+                index.pop(full_name, None)
+
+    def candidates(self):
+        """Fetched candidates in order, each tagged with every tier that found it."""
+        with self._lock:
+            names = sorted(self._candidates, key=self._order.__getitem__)
+            candidates = []
+            for name in names:
+                candidate = self._candidates[name]
+                if candidate is not None:
+                    candidate.tiers = tuple(sorted(self._tiers[name]))
+                    candidates.append(candidate)
+            return candidates
+
+
+def search_topic(github_client, topic, tiers, topic_index, limit, filters, pool, budget=None):
+    """
+    Run one topic search and claim its results into the shared pool.
+
+    Returns:
+        Number of new repositories this search contributed
+    """
+    prefix = f"  [{topic}]"
+    query = build_search_query({'topics': [topic]}, filters)
+    print(f"{prefix} Searching for tier(s) {', '.join(map(str, tiers))}: {query}")
+
+    try:
+        repositories = github_client.search_repositories(query=query)
+        print(f"{prefix} Total matches: {repositories.totalCount}")
+
+        # Fetch results (respecting pagination)
+        fetched = 0
+        for rank, repo in enumerate(repositories):
+            if budget is not None and budget.exhausted():
+                print(f"{prefix} ⚠ Stopping: {budget.reason()} reached")
+                break
+
+            owner = repo.owner.login
+            if not pool.claim(owner, repo.name, tiers, (topic_index, rank)):
+                continue
+
+            try:
+                pool.fill(Candidate(
+                    owner=owner,
+                    repo=repo.name,
+                    url=repo.html_url,
+                    stars=repo.stargazers_count,
+                    topics=repo.get_topics(),
+                    last_push=repo.pushed_at.isoformat() if repo.pushed_at else None,
+                    language=repo.language,
+                    description=repo.description,
+                    default_branch=repo.default_branch
+                ))
+            except Exception:
+                pool.release(owner, repo.name)
+                raise
+            fetched += 1
+
+            # Progress indicator every 10 repos
+            if fetched % 10 == 0:
+                print(f"{prefix} Fetched {fetched} new repositories...")
+
+            # Safety limit per topic to avoid excessive API calls
+            if fetched >= limit:
+                print(f"{prefix} Reached limit for this topic")
+                break
+
+        print(f"{prefix} Retrieved {fetched} new repositories")
+        return fetched
+
+    except RateLimitExceededException as e:
+        print(f"{prefix} ⚠ Rate limit exceeded: {e}")
+        raise
+
+    except Exception as e:
+        print(f"{prefix} ✗ Search failed: {e}")
+        print(f"{prefix} Continuing with remaining topics...")
+        return 0
+
+
+def prefilter_tiers(tiers, opt_out=None, stats=None, settings=None, budget=None):
+    """
+    Pre-filter repositories for several tiers in one pass.
+
+    Each distinct topic is searched once, concurrently, with one shared
+    client; a topic listed by several tiers serves all of them. Results are
+    merged into one deduplicated candidate list, each tagged with every tier
+    that found it.
 
     Args:
-        tier: Which tier to search (1=primary, 2=fallback, 3=expansion)
+        tiers: Tier numbers to search (1-indexed)
+        opt_out: Optional OptOutManager; opted-out repos are dropped straight
+            from the search results, before any per-repo API call
+        stats: Optional dict filled with opted_out_skipped and api_calls_saved
+        settings: SearchSettings snapshot (defaults to load_search_settings())
+        budget: Optional RunBudget; searches stop taking results once it is
+            exhausted
 
     Returns:
-        List of candidate repositories: [{owner, repo, url, stars, topics, last_push}]
+        List of Candidate records, each tagged with its tiers
     """
-    # Load configuration
-    config = load_search_config()
-    tiers = config.get('tiers', [])
-    filters = config.get('filters', {})
-
-    # Validate tier
-    if tier < 1 or tier > len(tiers):
-        raise ValueError(f"Invalid tier {tier}. Must be 1-{len(tiers)}")
-
-    # Get tier config (tiers are 1-indexed, list is 0-indexed)
-    tier_config = tiers[tier - 1]
-    tier_name = tier_config.get('name', f'tier-{tier}')
-    topics = tier_config.get('topics', [])
+    settings = settings or load_search_settings()
+    calls_per_candidate = estimate_calls_per_candidate(len(settings.target_files))
+
+    # Topic -> tiers that list it, with the most generous per-topic limit among them
+    topic_tiers = {}
+    topic_limits = {}
+    for tier in tiers:
+        tier_config = settings.tier(tier)
+        print(f"  Tier {tier}: {tier_config.name}")
+        print(f"  Description: {tier_config.description}")
+        print(f"  Expected results: {tier_config.expected_results}")
+        print(f"  Topics: {', '.join(tier_config.topics)}")
+        print()
 
-    print(f"  Tier {tier}: {tier_name}")
-    print(f"  Description: {tier_config.get('description', 'N/A')}")
-    print(f"  Expected results: {tier_config.get('expected_results', 'unknown')}")
-    print(f"  Topics: {', '.join(topics)}")
-    print()
+        limit = Config.DEFAULT_MAX_RESULTS // len(tier_config.topics)
+        for topic in tier_config.topics:
+            topic_tiers.setdefault(topic, []).append(tier)
+            topic_limits[topic] = max(topic_limits.get(topic, 0), limit)
 
-    # Initialize GitHub client
+    # Initialize GitHub client, shared by every search
     github_client = Github(Config.GITHUB_TOKEN)
 
     # Check initial rate limit
     check_rate_limit(github_client)
     print()
 
-    # Execute searches for each topic separately (GitHub doesn't support OR for topics)
-    all_candidates = {}  # Use dict to deduplicate by repo full name
-
-    for topic_idx, topic in enumerate(topics, 1):
-        # Build query for this specific topic
-        topic_config = {'topics': [topic]}
-        query = build_search_query(topic_config, filters)
-
-        print(f"  [{topic_idx}/{len(topics)}] Searching topic '{topic}'...")
-        print(f"  Query: {query}")
-
+    pool = CandidatePool(opt_out)
+    workers = min(MAX_CONCURRENT_SEARCHES, len(topic_tiers))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        searches = [
+            executor.submit(search_topic, github_client, topic, topic_tiers[topic],
+                            topic_index, topic_limits[topic], settings.filters, pool, budget)
+            for topic_index, topic in enumerate(topic_tiers)
+        ]
         try:
-            repositories = github_client.search_repositories(query=query)
-            total_count = repositories.totalCount
-            print(f"  Total matches: {total_count}")
-
-            # Fetch results (respecting pagination)
-            fetched = 0
-            for idx, repo in enumerate(repositories, 1):
-                full_name = f"{repo.owner.login}/{repo.name}"
-
-                # Skip if already seen from another topic
-                if full_name in all_candidates:
-                    continue
-
-                candidate = {
-                    'owner': repo.owner.login,
-                    'repo': repo.name,
-                    'url': repo.html_url,
-                    'stars': repo.stargazers_count,
-                    'topics': repo.get_topics(),
-                    'last_push': repo.pushed_at.isoformat() if repo.pushed_at else None,
-                    'language': repo.language,
-                    'description': repo.description,
-                    'default_branch': repo.default_branch
-                }
-                all_candidates[full_name] = candidate
-                fetched += 1
-
-                # Progress indicator every 10 repos
-                if fetched % 10 == 0:
-                    print(f"  Fetched {fetched} new repositories...")
-
-                # Safety limit per topic to avoid excessive API calls
-                if fetched >= Config.DEFAULT_MAX_RESULTS // len(topics):
-                    print(f"  Reached limit for this topic")
-                    break
-
-            print(f"  Retrieved {fetched} new repositories from this topic")
-            print()
-
-        except RateLimitExceededException as e:
-            print(f"  ⚠ Rate limit exceeded: {e}")
+            for search in searches:
+                search.result()
+        except RateLimitExceededException:
             rate_limit = check_rate_limit(github_client)
-            reset_time = rate_limit.search.reset
-            print(f"  Rate limit resets at: {reset_time}")
+            print(f"  Rate limit resets at: {rate_limit.search.reset}")
             raise
 
-        except Exception as e:
-            print(f"  ✗ Search failed for topic '{topic}': {e}")
-            print(f"  Continuing with remaining topics...")
-            print()
-
-    candidates = list(all_candidates.values())
+    candidates = pool.candidates()
+    print()
     print(f"  Total unique repositories across all topics: {len(candidates)}")
 
+    if stats is not None:
+        stats['opted_out_skipped'] = len(pool.opted_out)
+        stats['api_calls_saved'] = len(pool.opted_out) * calls_per_candidate
+
     # Check final rate limit
     print()
     check_rate_limit(github_client)
@@ -187,11 +297,29 @@ def prefilter_by_topics(tier=1):
     return candidates
 
 
+def prefilter_by_topics(tier=1, opt_out=None, stats=None, settings=None):
+    """
+    Pre-filter repositories using GitHub topic search.
+
+    Args:
+        tier: Which tier to search (1=primary, 2=fallback, 3=expansion)
+        opt_out: Optional OptOutManager; opted-out repos are dropped straight
+            from the search results, before any per-repo API call
+        stats: Optional dict filled with opted_out_skipped and api_calls_saved
+        settings: SearchSettings snapshot (defaults to load_search_settings())
+
+    Returns:
+        List of Candidate records, each tagged with its tiers
+    """
+    return prefilter_tiers([tier], opt_out=opt_out, stats=stats, settings=settings)
+
+
 if __name__ == '__main__':
     # Test the prefilter
     print("Testing topic pre-filter...")
     print()
     try:
+        Config.load_env()
         results = prefilter_by_topics(tier=1)
         print()
         print(f"✓ Found {len(results)} candidate repositories")
@@ -200,8 +328,8 @@ if __name__ == '__main__':
         if results:
             print("Sample results:")
             for i, repo in enumerate(results[:5], 1):
-                print(f"  {i}. {repo['owner']}/{repo['repo']} - {repo['stars']} stars")
-                print(f"     Topics: {', '.join(repo['topics'][:5])}")
+                print(f"  {i}. {repo.owner}/{repo.repo} - {repo.stars} stars")
+                print(f"     Topics: {', '.join(repo.topics[:5])}")
 
     except NotImplementedError as e:
         print(f"✗ Not implemented yet: {e}")
@@ -0,0 +1,193 @@
+"""
+Candidate prioritization for the content search.
+
+Orders candidates by predicted yield (the chance a repository has discovery
+patterns) using only fields the prefilter already returned, so no API call
+is spent on ordering. When the run's budget runs out, what is left
+unscanned is the least promising tail.
+
+The prediction starts from a fixed heuristic and learns from past runs:
+each feature's hit rate is tracked in .cache/yield-model.json and its lift
+over the overall hit rate is added to the score.
+"""
+
+import json
+import math
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+# Pseudo-trials pulling a rarely seen feature's hit rate toward the overall rate
+PRIOR_STRENGTH = 5
+
+# Description and topic words that hint at AI-native development
+AI_KEYWORDS = frozenset({'ai', 'ai-native', 'llm', 'claude', 'agent', 'agents', 'copilot', 'gpt'})
+
+# Description words tracked as features. A fixed vocabulary keeps the model
+# file (and its load and scoring time) bounded however many candidates it sees.
+DESCRIPTION_WORDS = AI_KEYWORDS | frozenset({
+    'mcp', 'cli', 'sdk', 'api', 'framework', 'library', 'plugin', 'tool', 'tools',
+    'template', 'boilerplate', 'starter', 'monorepo', 'platform', 'workflow',
+    'automation', 'kubernetes', 'docker', 'infrastructure', 'microservices'
+})
+
+# Days-since-push buckets: (upper bound, label)
+PUSH_BUCKETS = ((30, 'month'), (90, 'quarter'), (365, 'year'))
+
+WORD = re.compile(r'[a-z0-9][a-z0-9+#.-]{2,}')
+
+
+def days_since_push(candidate, now):
+    last_push = candidate.last_push
+    if not last_push:
+        return None
+    pushed = datetime.fromisoformat(last_push.replace('Z', '+00:00'))
+    if pushed.tzinfo is None:
+        pushed = pushed.replace(tzinfo=timezone.utc)
+    return (now - pushed).days
+
+
+def candidate_features(candidate, now):
+    """Categorical features of a candidate, as 'kind:value' strings."""
+    stars = candidate.stars or 0
+    features = {f"stars:{min(int(math.log2(stars + 1)), 15)}"}
+
+    language = candidate.language
+    features.add(f"language:{language.lower() if language else 'none'}")
+
+    for topic in candidate.topics:
+        features.add(f"topic:{topic.lower()}")
+
+    for word in WORD.findall((candidate.description or '').lower()):
+        if word in DESCRIPTION_WORDS:
+            features.add(f"word:{word}")
+
+    days = days_since_push(candidate, now)
+    bucket = 'unknown' if days is None else 'older'
+    for limit, label in PUSH_BUCKETS:
+        if days is not None and days < limit:
+            bucket = label
+            break
+    features.add(f"pushed:{bucket}")
+
+    return sorted(features)
+
+
+def heuristic_yield(candidate, now):
+    """Cold-start score: popular, recently pushed, AI-flavoured repos first."""
+    score = 0.25 * math.log1p(candidate.stars or 0)
+
+    days = days_since_push(candidate, now)
+    if days is not None and days < 90:
+        score += 0.5
+
+    words = set(WORD.findall((candidate.description or '').lower()))
+    words.update(topic.lower() for topic in candidate.topics)
+    score += 0.5 * min(len(words & AI_KEYWORDS), 2)
+
+    return score
+
+
+class YieldModel:
+    """
+    Per-feature hit rates learned from past content searches.
+
+    Stored as JSON: {"hits": n, "trials": n, "features": {name: [hits, trials]}}.
+    """
+
+    def __init__(self, model_file):
+        self.model_file = Path(model_file)
+        self.hits = 0
+        self.trials = 0
+        self.features = {}
+        self._dirty = False
+        if self.model_file.exists():
+            try:
+                with open(self.model_file, 'r') as f:
+                    data = json.load(f)
+                self.hits = data['hits']
+                self.trials = data['trials']
+                # Models saved before the fixed vocabulary tracked every word
+                self.features = {
+                    feature: counts for feature, counts in data['features'].items()
+                    if not feature.startswith('word:') or feature[5:] in DESCRIPTION_WORDS
+                }
+            except (OSError, ValueError, KeyError, AttributeError):
+                # A corrupt model only costs ordering quality; start over
+                self.hits, self.trials, self.features = 0, 0, {}
+
+    def base_rate(self):
+        return (self.hits + 1) / (self.trials + 2)
+
+    def lift(self, feature):
+        """Log ratio of the feature's smoothed hit rate to the overall rate."""
+        hits, trials = self.features.get(feature, (0, 0))
+        if not trials:
+            return 0.0
+        base = self.base_rate()
+        rate = (hits + PRIOR_STRENGTH * base) / (trials + PRIOR_STRENGTH)
+        return math.log(rate / base)
+
+    def predict(self, candidate, now=None):
+        """Predicted yield score; higher means scan sooner."""
+        now = now or datetime.now(timezone.utc)
+        return heuristic_yield(candidate, now) + sum(
+            self.lift(feature) for feature in candidate_features(candidate, now)
+        )
+
+    def record(self, candidate, hit, now=None):
+        """Learn from one scanned candidate."""
+        now = now or datetime.now(timezone.utc)
+        self.trials += 1
+        self.hits += int(hit)
+        for feature in candidate_features(candidate, now):
+            counts = self.features.setdefault(feature, [0, 0])
+            counts[0] += int(hit)
+            counts[1] += 1
+        self._dirty = True
+
+    def record_search(self, candidates, discoveries, clean, now=None):
+        """
+        Learn from a content search's conclusive outcomes.
+
+        Only hits and clean misses count: a candidate whose fetches failed or
+        were rate-limited says nothing about its yield.
+
+        Args:
+            candidates: Candidates handed to the search
+            discoveries: Discovery records it found
+            clean: (owner, repo) of every candidate scanned without a fetch error
+        """
+        hits = {(d.owner, d.repo) for d in discoveries}
+        conclusive = hits | {tuple(key) for key in clean}
+        for candidate in candidates:
+            key = (candidate.owner, candidate.repo)
+            if key in conclusive:
+                self.record(candidate, key in hits, now)
+
+    def save(self):
+        """Atomically write the model if it learned anything."""
+        if not self._dirty:
+            return
+        self.model_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.model_file.with_name(self.model_file.name + '.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump({'hits': self.hits, 'trials': self.trials, 'features': self.features},
+                      f, separators=(',', ':'), sort_keys=True)
+        os.replace(temp_file, self.model_file)
+        self._dirty = False
+
+
+def prioritize(candidates, model, now=None):
+    """
+    Order candidates by predicted yield, highest first.
+
+    Each candidate's predicted_yield is set. Ties keep the
+    prefilter's order.
+    """
+    now = now or datetime.now(timezone.utc)
+    for candidate in candidates:
+        candidate.predicted_yield = round(model.predict(candidate, now), 4)
+    return sorted(candidates, key=lambda candidate: -candidate.predicted_yield)
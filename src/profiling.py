@@ -0,0 +1,200 @@
+"""
+Per-stage profiling of a pipeline run (`discovery run --profile`).
+
+A RunProfiler writes, into one directory:
+- stage-N-<name>.prof: a cProfile of each stage's main thread (open with
+  `python -m pstats` or snakeviz)
+- flamegraph.folded: wall-clock stack samples of every thread, in the
+  collapsed format flamegraph.pl, speedscope and inferno read
+- profile.json: seconds per stage, and per repository the time spent in
+  network wait, JSON decoding, regex scanning and report rendering
+
+Pipeline code marks its work with timed(category, repo), a no-op unless a
+profiler is running. Time PyGithub spends decoding responses is measured
+by swapping the json module PyGithub's Requester uses for a timed one.
+"""
+
+import cProfile
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+import github.Requester
+
+
+CATEGORIES = ('network', 'json_decode', 'regex', 'render')
+
+# Work not tied to one repository (topic searches, rate limits, reports)
+RUN_ROW = '(run)'
+
+# Seconds between stack samples for the flame graph
+SAMPLE_INTERVAL = 0.005
+
+# Repositories listed in the printed summary
+SUMMARY_REPOS = 10
+
+REPO_URL = re.compile(r'/repos/([^/?]+)/([^/?]+)')
+
+_active = None
+
+
+def timed(category, repo=None):
+    """Context manager timing a block against a repository (no-op unless profiling)."""
+    if _active is None:
+        return nullcontext()
+    return _active.timed(category, repo)
+
+
+def repo_from_url(url):
+    """'owner/repo' of a GitHub API URL, or None for calls not about one repository."""
+    match = REPO_URL.search(url)
+    return f"{match.group(1)}/{match.group(2)}" if match else None
+
+
+class _TimedJson:
+    """Stand-in for the json module inside PyGithub's Requester."""
+
+    def loads(self, *args, **kwargs):
+        with timed('json_decode', _active.last_repo() if _active else None):
+            return json.loads(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(json, name)
+
+
+class RunProfiler:
+    """
+    Collects stage profiles, per-repository timings and stack samples.
+
+    Usage:
+        profiler = RunProfiler(out_dir).start()
+        with profiler.stage('search'):
+            ...
+        profiler.stop()
+        profiler.write()
+    """
+
+    def __init__(self, out_dir, sample_interval=SAMPLE_INTERVAL):
+        self.out_dir = Path(out_dir)
+        self.sample_interval = sample_interval
+        self.stages = {}
+        self.repos = defaultdict(lambda: dict.fromkeys(CATEGORIES, 0.0))
+        self.samples = Counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stage = 'setup'
+        self._stopping = threading.Event()
+        self._sampler = None
+        self._started = None
+
+    def start(self):
+        global _active
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        for old in self.out_dir.glob('stage-*.prof'):
+            old.unlink()
+        self._started = time.perf_counter()
+        _active = self
+        github.Requester.json = _TimedJson()
+        self._sampler = threading.Thread(target=self._sample, name='profile-sampler', daemon=True)
+        self._sampler.start()
+        return self
+
+    def stop(self):
+        global _active
+        self._stopping.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        github.Requester.json = json
+        if _active is self:
+            _active = None
+        self.stages['total'] = time.perf_counter() - self._started
+
+    @contextmanager
+    def stage(self, name):
+        """Profile one pipeline stage into stage-N-<name>.prof."""
+        self._stage = name
+        number = len([s for s in self.stages if s != 'total']) + 1
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self.stages[name] = time.perf_counter() - started
+            profile.dump_stats(str(self.out_dir / f"stage-{number}-{name}.prof"))
+            self._stage = 'setup'
+
+    @contextmanager
+    def timed(self, category, repo=None):
+        """Add a block's wall time to category for repo (or the run as a whole)."""
+        self._local.repo = repo
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.repos[repo or RUN_ROW][category] += elapsed
+
+    def last_repo(self):
+        """Repository this thread last timed work for (decoding follows its request)."""
+        return getattr(self._local, 'repo', None)
+
+    def _sample(self):
+        own = threading.get_ident()
+        while not self._stopping.wait(self.sample_interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(self._stage)
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def write(self):
+        """
+        Write profile.json and flamegraph.folded next to the stage profiles.
+
+        Returns:
+            {'json': json_path, 'flamegraph': folded_path}
+        """
+        repos = {
+            name: {**{k: round(v, 4) for k, v in times.items()}, 'total': round(sum(times.values()), 4)}
+            for name, times in sorted(self.repos.items(), key=lambda item: -sum(item[1].values()))
+        }
+        report = {
+            'stages': {name: round(seconds, 4) for name, seconds in self.stages.items()},
+            'categories': {c: round(sum(t[c] for t in self.repos.values()), 4) for c in CATEGORIES},
+            'repos': repos
+        }
+        json_path = self.out_dir / 'profile.json'
+        temp_path = json_path.with_suffix('.json.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        os.replace(temp_path, json_path)
+
+        folded_path = self.out_dir / 'flamegraph.folded'
+        with open(folded_path, 'w') as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write(f"{stack} {count}\n")
+
+        return {'json': json_path, 'flamegraph': folded_path}
+
+    def summary(self):
+        """Lines summarizing stage times and the slowest repositories."""
+        lines = [f"{name}: {seconds:.2f}s" for name, seconds in self.stages.items()]
+        slowest = sorted(self.repos.items(), key=lambda item: -sum(item[1].values()))[:SUMMARY_REPOS]
+        for name, times in slowest:
+            split = ', '.join(f"{c} {times[c]:.2f}s" for c in CATEGORIES if times[c])
+            lines.append(f"{name}: {sum(times.values()):.2f}s ({split})")
+        return lines
@@ -0,0 +1,249 @@
+"""
+Record types carried through the pipeline.
+
+Candidates, discoveries, contacts and quality results are slotted objects
+rather than dicts: no per-instance __dict__, repeated strings (languages,
+topics, pattern names, source files) interned so every record shares one
+copy, and a Discovery holds a reference to its Candidate instead of a
+merged copy of its fields. to_dict/from_dict convert to and from the JSON
+schema of discoveries.json (and the flat candidate form used in
+checkpoints).
+"""
+
+import sys
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _intern_all(values):
+    return tuple(sys.intern(value) for value in values or ())
+
+
+class Record:
+    """Equality and repr from __slots__, shared by every record type."""
+
+    __slots__ = ()
+
+    def _values(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._values() == other._values()
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class Candidate(Record):
+    """A repository returned by the topic prefilter."""
+
+    __slots__ = ('owner', 'repo', '_url', 'stars', 'topics', 'last_push', 'language',
+                 'description', 'default_branch', 'tiers', 'predicted_yield')
+
+    def __init__(self, owner, repo, url=None, stars=0, topics=(), last_push=None, language=None,
+                 description=None, default_branch='main', tiers=(), predicted_yield=None):
+        self.owner = _intern(owner)
+        self.repo = repo
+        # Only stored when it differs from the URL derived from owner/repo
+        self._url = url if url and url != f"https://github.com/{owner}/{repo}" else None
+        self.stars = stars or 0
+        self.topics = _intern_all(topics)
+        self.last_push = last_push
+        self.language = _intern(language)
+        self.description = description
+        self.default_branch = _intern(default_branch or 'main')
+        self.tiers = tuple(tiers or ())
+        self.predicted_yield = predicted_yield
+
+    @property
+    def url(self):
+        return self._url or f"https://github.com/{self.owner}/{self.repo}"
+
+    @property
+    def full_name(self):
+        return f"{self.owner}/{self.repo}"
+
+    def to_dict(self):
+        """Flat candidate dict (checkpoint form)."""
+        return {
+            'owner': self.owner,
+            'repo': self.repo,
+            'url': self.url,
+            'stars': self.stars,
+            'topics': list(self.topics),
+            'last_push': self.last_push,
+            'language': self.language,
+            'description': self.description,
+            'default_branch': self.default_branch,
+            'tiers': list(self.tiers),
+            'predicted_yield': self.predicted_yield
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build from a flat candidate dict or a report's 'repository' section."""
+        return cls(
+            owner=data['owner'],
+            repo=data['repo'] if 'repo' in data else data['name'],
+            url=data.get('url'),
+            stars=data.get('stars'),
+            topics=data.get('topics'),
+            last_push=data.get('last_push'),
+            language=data.get('language'),
+            description=data.get('description'),
+            default_branch=data.get('default_branch'),
+            tiers=data.get('tiers'),
+            predicted_yield=data.get('predicted_yield')
+        )
+
+
+class Contact(Record):
+    """A public contact found in a repository file."""
+
+    __slots__ = ('type', 'value', 'source_file', 'confidence')
+
+    def __init__(self, type, value, source_file, confidence):
+        self.type = _intern(type)
+        self.value = value
+        self.source_file = _intern(source_file)
+        self.confidence = _intern(confidence)
+
+    def to_dict(self):
+        return {
+            'type': self.type,
+            'value': self.value,
+            'source_file': self.source_file,
+            'confidence': self.confidence
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['type'], data['value'], data.get('source_file'), data.get('confidence'))
+
+
+class QualityResult(Record):
+    """Quality score with the raw signals it was computed from."""
+
+    __slots__ = ('score', 'signals_found', 'signal_details', 'signals', 'reasoning')
+
+    def __init__(self, score, signals_found=(), signal_details=None, signals=None, reasoning=''):
+        self.score = score
+        self.signals_found = _intern_all(signals_found)
+        self.signal_details = signal_details or {}
+        self.signals = signals
+        self.reasoning = reasoning
+
+    def to_dict(self):
+        data = {
+            'score': self.score,
+            'signals_found': list(self.signals_found),
+            'signal_details': self.signal_details,
+            'reasoning': self.reasoning
+        }
+        if self.signals is not None:
+            data['signals'] = self.signals
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            score=data.get('score', 0),
+            signals_found=data.get('signals_found'),
+            signal_details=data.get('signal_details'),
+            signals=data.get('signals'),
+            reasoning=data.get('reasoning', '')
+        )
+
+
+class Discovery(Record):
+    """A candidate whose files matched discovery patterns, plus later-stage results."""
+
+    __slots__ = ('candidate', 'markdown_file', 'file_url', 'patterns_found', 'pattern_score',
+                 'fingerprint', 'duplicate_of', 'contacts', 'quality')
+
+    def __init__(self, candidate, markdown_file, file_url=None, patterns_found=(), pattern_score=0,
+                 fingerprint=None, duplicate_of=None, contacts=None, quality=None):
+        self.candidate = candidate
+        self.markdown_file = _intern(markdown_file)
+        self.file_url = file_url
+        self.patterns_found = _intern_all(patterns_found)
+        self.pattern_score = pattern_score
+        self.fingerprint = fingerprint
+        self.duplicate_of = duplicate_of
+        self.contacts = contacts or []
+        self.quality = quality
+
+    @property
+    def owner(self):
+        return self.candidate.owner
+
+    @property
+    def repo(self):
+        return self.candidate.repo
+
+    @property
+    def url(self):
+        return self.candidate.url
+
+    @property
+    def score(self):
+        return self.quality.score if self.quality is not None else 0
+
+    def to_dict(self):
+        """One entry of discoveries.json."""
+        candidate = self.candidate
+        discovery = {
+            'markdown_file': self.markdown_file,
+            'file_url': self.file_url,
+            'patterns_found': list(self.patterns_found),
+            'pattern_score': self.pattern_score
+        }
+        if self.fingerprint is not None:
+            discovery['fingerprint'] = f"{self.fingerprint:016x}"
+        if self.duplicate_of:
+            discovery['duplicate_of'] = self.duplicate_of
+        return {
+            'repository': {
+                'owner': candidate.owner,
+                'name': candidate.repo,
+                'url': candidate.url,
+                'stars': candidate.stars,
+                'language': candidate.language,
+                'description': candidate.description,
+                'default_branch': candidate.default_branch,
+                'topics': list(candidate.topics),
+                'last_push': candidate.last_push,
+                'tiers': list(candidate.tiers)
+            },
+            'discovery': discovery,
+            'contacts': [contact.to_dict() for contact in self.contacts],
+            'quality': self.quality.to_dict() if self.quality is not None else {}
+        }
+
+    @classmethod
+    def from_dict(cls, data, candidate=None):
+        """
+        Build from a discoveries.json entry.
+
+        Args:
+            data: Report entry
+            candidate: Full Candidate to link to (the report does not keep
+                every candidate field); built from the entry if not given
+        """
+        discovery = data.get('discovery', {})
+        quality = data.get('quality')
+        fingerprint = discovery.get('fingerprint')
+        return cls(
+            candidate=candidate or Candidate.from_dict(data['repository']),
+            markdown_file=discovery.get('markdown_file'),
+            file_url=discovery.get('file_url'),
+            patterns_found=discovery.get('patterns_found'),
+            pattern_score=discovery.get('pattern_score', 0),
+            fingerprint=int(fingerprint, 16) if fingerprint else None,
+            duplicate_of=discovery.get('duplicate_of'),
+            contacts=[Contact.from_dict(contact) for contact in data.get('contacts', [])],
+            quality=QualityResult.from_dict(quality) if quality else None
+        )
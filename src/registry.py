@@ -0,0 +1,160 @@
+"""
+Cumulative registry: fold one run's results into discoveries.json.
+
+A plain run replaces the reports with its own results. A merge keeps the
+registry built by earlier runs (other tiers, earlier dates) and walks the
+registry and the run's results side by side in repository-key order:
+- a repository only in the results is inserted
+- one in both is replaced by the fresh result
+- one the run scanned but no longer found (or that has opted out) is
+  removed
+- every other entry is kept as it was
+
+Each merge prepends a compact entry to the registry changelog listing the
+new, changed and removed peers.
+"""
+
+import os
+from datetime import datetime, timezone
+
+from src.config import Config
+from src.generate import generate_reports, load_json_report
+
+
+def registry_key(discovery):
+    """Sort and match key: case-insensitive owner/repo."""
+    return discovery.owner.lower(), discovery.repo.lower()
+
+
+def material(discovery):
+    """What a changelog reader cares about; stars and activity drift daily."""
+    return (
+        discovery.score,
+        tuple(discovery.patterns_found),
+        discovery.markdown_file,
+        discovery.duplicate_of,
+        tuple(sorted(contact.value for contact in discovery.contacts))
+    )
+
+
+def merge_registry(existing, results, scanned=(), opt_out=None):
+    """
+    Sorted merge of a run's results into the existing registry.
+
+    Args:
+        existing: Discovery records already in the registry
+        results: Discovery records from this run
+        scanned: registry_key()s of every candidate the run scanned
+        opt_out: Optional OptOutManager; opted-out entries are removed
+
+    Returns:
+        (merged, changes): merged records in key order, and a dict of
+        'new', 'changed' ((discovery, previous) pairs) and 'removed' lists
+    """
+    scanned = set(scanned)
+    existing = sorted(existing, key=registry_key)
+    results = sorted(results, key=registry_key)
+    merged = []
+    changes = {'new': [], 'changed': [], 'removed': []}
+
+    def keep(discovery):
+        if opt_out is not None and opt_out.is_opted_out(discovery.owner, discovery.repo):
+            changes['removed'].append(discovery)
+        else:
+            merged.append(discovery)
+
+    i = j = 0
+    while i < len(existing) or j < len(results):
+        old = existing[i] if i < len(existing) else None
+        new = results[j] if j < len(results) else None
+        if new is None or (old is not None and registry_key(old) < registry_key(new)):
+            i += 1
+            if registry_key(old) in scanned:
+                changes['removed'].append(old)
+            else:
+                keep(old)
+        elif old is None or registry_key(new) < registry_key(old):
+            j += 1
+            changes['new'].append(new)
+            merged.append(new)
+        else:
+            i += 1
+            j += 1
+            if material(new) != material(old):
+                changes['changed'].append((new, old))
+            merged.append(new)
+
+    return merged, changes
+
+
+def format_changelog(changes, when=None):
+    """Markdown changelog entry for one merge."""
+    when = when or datetime.now(timezone.utc)
+    counts = ', '.join(f"{len(changes[kind])} {kind}" for kind in ('new', 'changed', 'removed'))
+    lines = [f"## {when.strftime('%Y-%m-%d %H:%M')} UTC ({counts})", ""]
+    for discovery in sorted(changes['new'], key=lambda d: -d.score):
+        lines.append(f"- **new** {discovery.candidate.full_name} (score {discovery.score})")
+    for discovery, previous in changes['changed']:
+        what = []
+        if discovery.score != previous.score:
+            what.append(f"score {previous.score} → {discovery.score}")
+        added = set(discovery.patterns_found) - set(previous.patterns_found)
+        dropped = set(previous.patterns_found) - set(discovery.patterns_found)
+        if added:
+            what.append(f"+{', '.join(sorted(added))}")
+        if dropped:
+            what.append(f"-{', '.join(sorted(dropped))}")
+        lines.append(f"- **changed** {discovery.candidate.full_name} ({'; '.join(what) or 'details'})")
+    for discovery in changes['removed']:
+        lines.append(f"- **removed** {discovery.candidate.full_name}")
+    lines.append("")
+    return '\n'.join(lines)
+
+
+def write_changelog(entry, path=None):
+    """Prepend a changelog entry, newest first."""
+    path = path or Config.REGISTRY_CHANGELOG_MD
+    header = "# Registry Changes\n\n"
+    previous = ''
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            previous = f.read()
+        if previous.startswith(header):
+            previous = previous[len(header):]
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as f:
+        f.write(header + entry + ('\n' + previous if previous else ''))
+    os.replace(temp_path, path)
+    return str(path)
+
+
+def registry_tiers(metadata):
+    """Tiers a report covers, from registry_tiers or a single run's tier."""
+    value = metadata.get('registry_tiers', metadata.get('tier', ''))
+    return {part.strip() for part in str(value).split(',') if part.strip()}
+
+
+def merge_into_registry(results, metadata=None, scanned=(), opt_out=None):
+    """
+    Merge a run into discoveries.json and DISCOVERIES.md, logging the changes.
+
+    Returns:
+        {'json': json_path, 'markdown': md_path, 'changelog': changelog_path,
+         'changes': changes}
+    """
+    existing, existing_metadata = [], {}
+    if Config.DISCOVERIES_JSON.exists():
+        existing, existing_metadata = load_json_report()
+
+    merged, changes = merge_registry(existing, results, scanned=scanned, opt_out=opt_out)
+    # Run-specific metadata describes this run; the registry spans every merged tier
+    merged_metadata = {
+        **(metadata or {}),
+        'registry_tiers': ','.join(sorted(registry_tiers(existing_metadata) | registry_tiers(metadata or {}),
+                                          key=int)),
+        'last_merge': {kind: len(changes[kind]) for kind in changes}
+    }
+    paths = generate_reports(merged, metadata=merged_metadata)
+    paths['changelog'] = write_changelog(format_changelog(changes))
+    paths['changes'] = changes
+    return paths
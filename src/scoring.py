@@ -0,0 +1,214 @@
+"""
+Quality scoring from raw repository signals.
+
+analyze_quality collects raw signals once (the API-bound part) and stores
+them with each discovery. A score is a weighted sum of features derived from
+those signals, using quality_weights from search_queries.yaml, so trying a
+new weighting is an offline rescore instead of a new run.
+
+Each feature is scaled to 0-1, so a weight is the most points that signal
+can contribute. The default weights reproduce the original hardcoded points.
+"""
+
+from src.records import QualityResult
+
+
+MAX_SCORE = 10
+
+# Activity and depth thresholds
+RECENT_PUSH_DAYS = 30
+PATTERN_SCORE_PER_DEPTH_POINT = 10
+MAX_DEPTH_POINTS = 3
+MAX_RELATED_REPOS = 3
+
+# Absorbs float error so e.g. 2.9999999999999996 still floors to 3
+SCORE_EPSILON = 1e-9
+
+# Feature order of the signal matrix; names match quality_weights keys
+FEATURES = (
+    'has_ci_cd',
+    'has_tests',
+    'has_docker',
+    'has_kubernetes',
+    'has_devcontainer',
+    'discovery_pattern_depth',
+    'recent_commits',
+    'multiple_contributors',
+    'multiple_repos',
+)
+
+
+def feature_vector(signals):
+    """Features in FEATURES order, each scaled to 0-1, from raw signals."""
+    days_since_push = signals.get('days_since_push')
+    pattern_depth = min(signals.get('pattern_score', 0) / PATTERN_SCORE_PER_DEPTH_POINT, MAX_DEPTH_POINTS)
+    return [
+        1.0 if signals.get('ci_cd') else 0.0,
+        1.0 if signals.get('tests') else 0.0,
+        1.0 if signals.get('docker') else 0.0,
+        1.0 if signals.get('kubernetes') else 0.0,
+        1.0 if signals.get('devcontainer') else 0.0,
+        pattern_depth / MAX_DEPTH_POINTS,
+        1.0 if days_since_push is not None and days_since_push < RECENT_PUSH_DAYS else 0.0,
+        1.0 if (signals.get('contributors') or 0) > 1 else 0.0,
+        min(signals.get('related_repos', 0), MAX_RELATED_REPOS) / MAX_RELATED_REPOS,
+    ]
+
+
+def weight_vector(weights):
+    """quality_weights as a list in FEATURES order (missing weights are 0)."""
+    unknown = set(weights) - set(FEATURES)
+    if unknown:
+        raise ValueError(
+            f"Unknown quality weight(s) {', '.join(sorted(unknown))} "
+            f"(expected any of {', '.join(FEATURES)})"
+        )
+    return [float(weights.get(feature, 0)) for feature in FEATURES]
+
+
+def score_signals(signals, weights):
+    """Score one repository's raw signals (0-10)."""
+    total = sum(value * weight for value, weight in zip(feature_vector(signals), weight_vector(weights)))
+    return min(int(total + SCORE_EPSILON), MAX_SCORE)
+
+
+def signal_matrix(signals_list):
+    """NumPy matrix with one feature row per repository."""
+    import numpy as np
+
+    return np.array([feature_vector(signals) for signals in signals_list], dtype=np.float64).reshape(
+        -1, len(FEATURES)
+    )
+
+
+def score_matrix(matrix, weights):
+    """Score every row of a signal matrix at once; returns an int array."""
+    import numpy as np
+
+    totals = matrix @ np.array(weight_vector(weights), dtype=np.float64)
+    return np.minimum(np.floor(totals + SCORE_EPSILON), MAX_SCORE).astype(np.int64)
+
+
+def signals_found(signals):
+    """Names of the signals present, for reports and the site."""
+    found = []
+    if signals.get('ci_cd'):
+        found.append('has_ci_cd')
+    if signals.get('tests'):
+        found.append('has_tests')
+    if signals.get('docker'):
+        found.append('has_docker')
+    if signals.get('kubernetes'):
+        found.append('has_kubernetes')
+    if signals.get('devcontainer'):
+        found.append('has_devcontainer')
+
+    pattern_score = signals.get('pattern_score', 0)
+    if pattern_score > 10:
+        found.append('high_discovery_depth')
+    elif pattern_score > 5:
+        found.append('medium_discovery_depth')
+
+    days_since_push = signals.get('days_since_push')
+    if days_since_push is not None and days_since_push < RECENT_PUSH_DAYS:
+        found.append('recent_commits')
+    if (signals.get('contributors') or 0) > 1:
+        found.append('multiple_contributors')
+    if signals.get('related_repos', 0) > 0:
+        found.append('multiple_repos')
+    return found
+
+
+def signal_details(signals):
+    """Human-readable details of the signals present."""
+    details = {}
+    if signals.get('ci_cd'):
+        details['ci_cd'] = signals['ci_cd']
+    if signals.get('tests'):
+        details['tests'] = signals['tests']
+    if signals.get('docker'):
+        details['docker'] = True
+    if signals.get('kubernetes'):
+        details['kubernetes'] = signals.get('container_configs', [])
+    if signals.get('devcontainer'):
+        details['devcontainer'] = True
+    details['pattern_score'] = signals.get('pattern_score', 0)
+    if signals.get('days_since_push') is not None:
+        details['days_since_push'] = signals['days_since_push']
+    if (signals.get('contributors') or 0) > 1:
+        details['contributors'] = signals['contributors']
+    if signals.get('related_repos', 0) > 0:
+        details['related_repos'] = signals.get('related_sample', [])
+    return details
+
+
+def build_reasoning(signals, score):
+    """Explain a score from the signals behind it."""
+    parts = []
+    if signals.get('ci_cd'):
+        parts.append(f"CI/CD via {signals['ci_cd']}")
+    if signals.get('tests'):
+        parts.append(f"tests in {signals['tests']}/")
+    if signals.get('kubernetes'):
+        parts.append(f"K8s configs: {', '.join(signals.get('container_configs', [])[:3])}")
+    if signals.get('devcontainer'):
+        parts.append("devcontainer setup")
+
+    pattern_score = signals.get('pattern_score', 0)
+    if pattern_score > 10:
+        parts.append(f"rich discovery patterns (score: {pattern_score})")
+
+    days_since_push = signals.get('days_since_push')
+    if days_since_push is not None and days_since_push < RECENT_PUSH_DAYS:
+        parts.append(f"active ({days_since_push}d ago)")
+    if (signals.get('contributors') or 0) > 1:
+        parts.append(f"{signals['contributors']} contributors")
+    if signals.get('related_repos', 0) > 0:
+        parts.append(f"{signals['related_repos']} related repos")
+
+    reasoning = "; ".join(parts) if parts else "Minimal production signals detected"
+    if signals.get('skipped_probes'):
+        reasoning += f" (not checked: {', '.join(p.replace('_', ' ') for p in signals['skipped_probes'])})"
+
+    if score >= 7:
+        return f"High-quality peer: {reasoning}"
+    elif score >= 5:
+        return f"Medium-quality: {reasoning}"
+    return f"Low production signals: {reasoning}"
+
+
+def quality_from_signals(signals, weights):
+    """Full QualityResult for a repository, raw signals included."""
+    score = score_signals(signals, weights)
+    return QualityResult(
+        score=score,
+        signals_found=signals_found(signals),
+        signal_details=signal_details(signals),
+        signals=signals,
+        reasoning=build_reasoning(signals, score)
+    )
+
+
+def rescore(qualities, weights):
+    """
+    Rescore QualityResults in place as one vectorized batch.
+
+    Records without raw signals (older reports, failed analyses) keep
+    their score.
+
+    Returns:
+        Number of records whose score changed
+    """
+    scorable = [quality for quality in qualities if quality.signals]
+    if not scorable:
+        return 0
+
+    scores = score_matrix(signal_matrix([quality.signals for quality in scorable]), weights)
+
+    changed = 0
+    for quality, score in zip(scorable, scores.tolist()):
+        if quality.score != score:
+            changed += 1
+            quality.score = score
+            quality.reasoning = build_reasoning(quality.signals, score)
+    return changed
@@ -4,40 +4,66 @@ Content search for discovery patterns in pre-filtered repositories.
 Fetches root-level markdown files and searches for discovery command patterns.
 """
 
-import re
-from github import Github, GithubException, RateLimitExceededException
-from src.config import Config
-from src.prefilter import load_search_config, check_rate_limit
+from github import Github, RateLimitExceededException
+from src.analyze import LEAN_ANALYSIS_CALLS
+from src.cache import MISSING, RepoFileCache, repo_head
+from src.config import Config, load_search_settings
+from src.dedupe import simhash
+from src.extract import CONTACT_FILES
+from src.fetch import FetchError, FileNotFound, FileTooLarge, RawFetcher, file_html_url
+from src.prefilter import check_rate_limit
+from src.profiling import timed
+from src.records import Candidate, Discovery
 
 
-def search_for_discovery_patterns(candidate_repos):
+# Target files larger than this are not scanned
+MAX_FILE_BYTES = 500_000
+
+# Calls one discovery costs after the search, reserved before scanning another
+# candidate when the run has a budget: a fetch per contact file (plus the
+# matched markdown file) in extraction, and a lean analysis
+DISCOVERY_CALLS = len(CONTACT_FILES) + 1 + LEAN_ANALYSIS_CALLS
+
+
+def search_for_discovery_patterns(candidate_repos, settings=None, file_cache=None, stats=None,
+                                  fetcher=None, budget=None):
     """
     Search pre-filtered repos for discovery patterns.
 
     Args:
-        candidate_repos: List of {owner, repo, url, ...} from prefilter
+        candidate_repos: List of Candidate records from prefilter
+        settings: SearchSettings snapshot (defaults to load_search_settings())
+        file_cache: RepoFileCache of known-missing and oversized files; one
+            is loaded from Config.FILE_CACHE_JSON (and saved afterwards) if
+            not given
+        stats: Optional dict filled with processed, the number of candidates
+            scanned (a prefix of candidate_repos; less than all if rate-limited),
+            and clean, the (owner, repo) of each one scanned without a fetch
+            error (only for those is "no patterns found" conclusive)
+        fetcher: RawFetcher to download files with (defaults to a new one)
+        budget: Optional RunBudget; scanning stops while enough is left to
+            extract and analyze the discoveries found so far
 
     Returns:
-        List of repos with discovery patterns: [{repo_info, markdown_file, pattern_score}]
+        List of Discovery records, each linked to its Candidate
     """
-    # Load pattern configuration
-    config = load_search_config()
-    patterns_config = config.get('discovery_patterns', [])
-    target_files = config.get('target_files', ['README.md', 'CLAUDE.md'])
-
-    # Build regex patterns with weights
-    patterns = {}
-    for pattern_def in patterns_config:
-        pattern = pattern_def.get('pattern')
-        weight = pattern_def.get('weight', 1)
-        patterns[pattern] = weight
+    # Precompiled patterns and target files from the config snapshot
+    settings = settings or load_search_settings()
+    patterns = settings.discovery_patterns
+    target_files = settings.target_files
 
     print(f"  Loaded {len(patterns)} discovery patterns")
     print(f"  Target files: {', '.join(target_files)}")
     print()
 
-    # Initialize GitHub client
+    owns_cache = file_cache is None
+    if owns_cache:
+        file_cache = RepoFileCache(Config.FILE_CACHE_JSON)
+    cache_hits_before = file_cache.hits
+
+    # Initialize GitHub client (rate-limit checks) and raw file fetcher
     github_client = Github(Config.GITHUB_TOKEN)
+    fetcher = fetcher or RawFetcher(Config.GITHUB_TOKEN)
 
     # Check initial rate limit
     check_rate_limit(github_client)
@@ -45,78 +71,88 @@ def search_for_discovery_patterns(candidate_repos):
 
     discoveries = []
     total_repos = len(candidate_repos)
+    processed = 0
+    clean = []
 
     for idx, candidate in enumerate(candidate_repos, 1):
-        owner = candidate['owner']
-        repo_name = candidate['repo']
-        default_branch = candidate.get('default_branch', 'main')
+        if budget is not None and not budget.can_afford(len(target_files) + (len(discoveries) + 1) * DISCOVERY_CALLS):
+            print(f"  ⚠ Stopping at repo {idx}/{total_repos}: {budget.reason()} reached "
+                  f"(keeping the rest for extraction and analysis)")
+            break
+
+        owner = candidate.owner
+        repo_name = candidate.repo
+        default_branch = candidate.default_branch
+        head = repo_head(candidate)
 
         print(f"  [{idx}/{total_repos}] Searching {owner}/{repo_name}...")
 
         try:
-            # Get repository object
-            repo = github_client.get_repo(f"{owner}/{repo_name}")
-
             # Try each target markdown file
             best_match = None
             best_score = 0
+            fetch_failed = False
 
             for target_file in target_files:
-                try:
-                    # Fetch file content
-                    file_content = repo.get_contents(target_file, ref=default_branch)
-
-                    if file_content.size > 500000:  # Skip files > 500KB
-                        print(f"    ⚠ {target_file} too large ({file_content.size} bytes), skipping")
-                        continue
+                if (file_cache.is_missing(owner, repo_name, head, target_file) or
+                        file_cache.exceeds(owner, repo_name, head, target_file, MAX_FILE_BYTES)):
+                    continue
 
-                    # Decode content
-                    content = file_content.decoded_content.decode('utf-8', errors='ignore')
+                try:
+                    # Stream the raw file, giving up as soon as it passes the cap
+                    content = fetcher.fetch_text(owner, repo_name, target_file, default_branch, MAX_FILE_BYTES)
 
                     # Search for patterns
                     patterns_found = []
                     score = 0
 
-                    for pattern, weight in patterns.items():
-                        # Search for pattern (case insensitive)
-                        matches = re.findall(pattern, content, re.IGNORECASE | re.MULTILINE)
-                        if matches:
-                            patterns_found.append(pattern)
-                            # Score based on weight * number of occurrences (cap at 3x weight)
-                            pattern_score = min(weight * len(matches), weight * 3)
-                            score += pattern_score
+                    with timed('regex', f"{owner}/{repo_name}"):
+                        for discovery_pattern in patterns:
+                            # Search for pattern (compiled case insensitive)
+                            matches = discovery_pattern.regex.findall(content)
+                            if matches:
+                                patterns_found.append(discovery_pattern.pattern)
+                                # Score based on weight * number of occurrences (cap at 3x weight)
+                                weight = discovery_pattern.weight
+                                pattern_score = min(weight * len(matches), weight * 3)
+                                score += pattern_score
 
                     if score > 0:
                         print(f"    ✓ {target_file}: {len(patterns_found)} patterns, score {score}")
 
                         if score > best_score:
                             best_score = score
-                            best_match = {
-                                'markdown_file': target_file,
-                                'file_url': file_content.html_url,
-                                'patterns_found': patterns_found,
-                                'pattern_score': score,
-                                'file_content_preview': content[:500]
-                            }
-
-                except GithubException as e:
-                    if e.status == 404:
-                        # File doesn't exist, continue to next file
-                        continue
-                    else:
-                        print(f"    ⚠ Error fetching {target_file}: {e}")
-                        continue
+                            best_match = Discovery(
+                                candidate,
+                                markdown_file=target_file,
+                                file_url=file_html_url(owner, repo_name, target_file, default_branch),
+                                patterns_found=patterns_found,
+                                pattern_score=score,
+                                fingerprint=simhash(content)
+                            )
+
+                except FileNotFound:
+                    # File doesn't exist; remember that until the repo changes
+                    file_cache.record(owner, repo_name, head, target_file, MISSING)
+                    continue
+                except FileTooLarge as e:
+                    print(f"    ⚠ {target_file} too large ({e.size}+ bytes), skipping")
+                    file_cache.record_size(owner, repo_name, head, target_file, e.size)
+                    continue
+                except FetchError as e:
+                    print(f"    ⚠ Error fetching {target_file}: {e}")
+                    fetch_failed = True
+                    continue
 
             # If we found patterns, add to discoveries
             if best_match:
-                discovery = {
-                    **candidate,  # Include all candidate info
-                    **best_match  # Add discovery-specific fields
-                }
-                discoveries.append(discovery)
-                print(f"    → Added to discoveries (best match: {best_match['markdown_file']})")
+                discoveries.append(best_match)
+                print(f"    → Added to discoveries (best match: {best_match.markdown_file})")
             else:
                 print(f"    ✗ No discovery patterns found")
+            processed += 1
+            if not fetch_failed:
+                clean.append((owner, repo_name))
 
         except RateLimitExceededException as e:
             print(f"  ⚠ Rate limit exceeded at repo {idx}/{total_repos}")
@@ -126,14 +162,23 @@ def search_for_discovery_patterns(candidate_repos):
 
         except Exception as e:
             print(f"    ✗ Error processing repo: {e}")
+            processed += 1
             continue
 
     # Final summary
     print()
-    print(f"  Processed {min(idx, total_repos)} repositories")
+    print(f"  Processed {processed} repositories")
     print(f"  Found patterns in {len(discoveries)} repositories")
+    print(f"  Skipped {file_cache.hits - cache_hits_before} known-missing or oversized file fetches")
     print()
 
+    if owns_cache:
+        file_cache.save()
+
+    if stats is not None:
+        stats['processed'] = processed
+        stats['clean'] = clean
+
     # Check final rate limit
     check_rate_limit(github_client)
 
@@ -147,20 +192,21 @@ if __name__ == '__main__':
 
     # Mock candidate (Budget Analyzer orchestration repo for testing)
     mock_candidates = [
-        {
-            'owner': 'budgetanalyzer',
-            'repo': 'orchestration',
-            'url': 'https://github.com/budgetanalyzer/orchestration',
-            'stars': 0,
-            'topics': ['ai-native'],
-            'last_push': '2024-11-25T00:00:00Z',
-            'language': 'Shell',
-            'description': 'Orchestration for Budget Analyzer',
-            'default_branch': 'main'
-        }
+        Candidate(
+            owner='budgetanalyzer',
+            repo='orchestration',
+            url='https://github.com/budgetanalyzer/orchestration',
+            stars=0,
+            topics=['ai-native'],
+            last_push='2024-11-25T00:00:00Z',
+            language='Shell',
+            description='Orchestration for Budget Analyzer',
+            default_branch='main'
+        )
     ]
 
     try:
+        Config.load_env()
         results = search_for_discovery_patterns(mock_candidates)
         print()
         print(f"✓ Found {len(results)} repos with discovery patterns")
@@ -169,10 +215,10 @@ if __name__ == '__main__':
         if results:
             print("Results:")
             for discovery in results:
-                print(f"  - {discovery['owner']}/{discovery['repo']}")
-                print(f"    File: {discovery['markdown_file']}")
-                print(f"    Score: {discovery['pattern_score']}")
-                print(f"    Patterns: {', '.join(discovery['patterns_found'][:5])}")
+                print(f"  - {discovery.owner}/{discovery.repo}")
+                print(f"    File: {discovery.markdown_file}")
+                print(f"    Score: {discovery.pattern_score}")
+                print(f"    Patterns: {', '.join(discovery.patterns_found[:5])}")
 
     except Exception as e:
         print(f"✗ Error: {e}")
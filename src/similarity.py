@@ -0,0 +1,122 @@
+"""
+"Repos like this one": similar peers via MinHash and locality-sensitive hashing.
+
+Each discovery is reduced to a feature set: its discovery patterns, topics,
+language and the files the pipeline saw in its root (the matched markdown
+file, container configs, CI and test directories). MinHash signatures
+estimate the Jaccard similarity of two sets; banding the signatures into
+LSH buckets means a discovery is only compared with the few that share a
+bucket, instead of with the whole registry.
+"""
+
+import zlib
+
+
+# MinHash permutations per signature, split into BANDS bands of equal rows.
+# 16 bands of 4 rows make pairs above ~0.5 Jaccard likely to share a bucket.
+NUM_PERM = 64
+BANDS = 16
+
+# Similar peers kept per discovery, and the least similarity worth listing
+TOP_K = 5
+MIN_SIMILARITY = 0.3
+
+# Mersenne prime for the universal hash family (a * x + b) mod PRIME
+PRIME = (1 << 31) - 1
+SEED = 1
+
+
+def feature_set(discovery):
+    """Features compared between discoveries, prefixed by kind."""
+    features = {f"pattern:{p}" for p in discovery.patterns_found}
+    features.update(f"topic:{t}" for t in discovery.candidate.topics)
+    if discovery.candidate.language:
+        features.add(f"language:{discovery.candidate.language}")
+    if discovery.markdown_file:
+        features.add(f"file:{discovery.markdown_file}")
+
+    signals = (discovery.quality.signals if discovery.quality else None) or {}
+    features.update(f"file:{name}" for name in signals.get('container_configs') or ())
+    if signals.get('ci_cd'):
+        features.add(f"file:{signals['ci_cd']}")
+    if signals.get('tests'):
+        features.add(f"file:{signals['tests']}/")
+    return features
+
+
+class SimilarityIndex:
+    """
+    MinHash signatures of feature sets, indexed in LSH band buckets.
+
+    Args:
+        feature_sets: One set of strings per item
+        num_perm: MinHash permutations per signature
+        bands: LSH bands (must divide num_perm)
+    """
+
+    def __init__(self, feature_sets, num_perm=NUM_PERM, bands=BANDS):
+        import numpy as np
+
+        if num_perm % bands:
+            raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+        rng = np.random.default_rng(SEED)
+        a = rng.integers(1, PRIME, num_perm, dtype=np.uint64)[:, None]
+        b = rng.integers(0, PRIME, num_perm, dtype=np.uint64)[:, None]
+        rows = num_perm // bands
+
+        self.signatures = np.full((len(feature_sets), num_perm), PRIME, dtype=np.uint64)
+        for i, features in enumerate(feature_sets):
+            if features:
+                ids = np.fromiter((zlib.crc32(f.encode('utf-8')) for f in features), dtype=np.uint64)
+                self.signatures[i] = ((a * ids + b) % PRIME).min(axis=1)
+
+        # One bucket key per band: the band's rows of the signature, as bytes
+        self._keys = [
+            [band.tobytes() for band in signature.reshape(bands, rows)] if features else []
+            for signature, features in zip(self.signatures, feature_sets)
+        ]
+        self.buckets = [{} for _ in range(bands)]
+        for i, keys in enumerate(self._keys):
+            for buckets, key in zip(self.buckets, keys):
+                buckets.setdefault(key, []).append(i)
+
+    def candidates(self, i):
+        """Items sharing at least one LSH bucket with item i, as a sorted index array."""
+        import numpy as np
+
+        found = set()
+        for buckets, key in zip(self.buckets, self._keys[i]):
+            found.update(buckets[key])
+        found.discard(i)
+        return np.sort(np.fromiter(found, dtype=np.intp, count=len(found)))
+
+    def query(self, i, k=TOP_K, min_similarity=MIN_SIMILARITY):
+        """
+        Top-k items most similar to item i.
+
+        Returns:
+            List of (index, estimated Jaccard similarity), most similar first
+        """
+        import numpy as np
+
+        candidates = self.candidates(i)
+        if not len(candidates):
+            return []
+        matches = np.count_nonzero(self.signatures[candidates] == self.signatures[i], axis=1)
+        order = np.argsort(-matches, kind='stable')[:k]
+        similarity = matches[order] / self.signatures.shape[1]
+        return [(int(candidates[j]), float(s)) for j, s in zip(order, similarity) if s >= min_similarity]
+
+
+def similar_peers(discoveries, k=TOP_K):
+    """
+    Similar peers of every discovery.
+
+    Returns:
+        One list per discovery of (Discovery, similarity), most similar first
+    """
+    if not discoveries:
+        return []
+    index = SimilarityIndex([feature_set(d) for d in discoveries])
+    return [[(discoveries[j], similarity) for j, similarity in index.query(i, k)]
+            for i in range(len(discoveries))]
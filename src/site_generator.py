@@ -3,11 +3,22 @@
 Generate static GitHub Pages site from discoveries.json
 """
 
+import argparse
+import gzip
+import hashlib
+import html
 import json
-import shutil
+import os
+import re
+import time
 from pathlib import Path
 from datetime import datetime
-from collections import Counter
+from collections import Counter, defaultdict
+
+try:
+    import brotli
+except ImportError:  # Optional: only needed for .br variants
+    brotli = None
 
 
 def load_discoveries():
@@ -48,36 +59,235 @@ def calculate_stats(data):
     }
 
 
-def generate_discoveries_data_js(discoveries):
-    """Generate JavaScript data file for client-side rendering"""
-    # Convert discoveries to simplified format for JS
-    js_data = []
+# Rows per data chunk; the browser fetches chunks one at a time after the manifest
+DATA_CHUNK_SIZE = 500
+
+# Column order of each encoded discovery row (published in the manifest).
+# Contacts, signals and the discovery file live on per-repository pages.
+ROW_FIELDS = ['owner', 'name', 'url', 'stars', 'language', 'patterns', 'score', 'reasoning']
+
+
+# Gram length of the prebuilt search index; shorter queries fall back to a scan
+SEARCH_NGRAM = 3
+
+
+def _compact_json(value):
+    """Serialize to JSON without insignificant whitespace"""
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+
+def encode_discoveries(discoveries, chunk_size=DATA_CHUNK_SIZE):
+    """
+    Dictionary-encode discoveries into shared lookup tables and row chunks.
+
+    Repeated strings (patterns, languages) are stored once in a table and
+    referenced by index. URLs that can be derived from owner/name are omitted.
+
+    Returns:
+        (tables, chunks) where chunks is a list of row lists
+    """
+    tables = {
+        'patterns': [],
+        'languages': []
+    }
+    indexes = {name: {} for name in tables}
+
+    def lookup(table, value):
+        index = indexes[table].get(value)
+        if index is None:
+            index = len(tables[table])
+            indexes[table][value] = index
+            tables[table].append(value)
+        return index
+
+    rows = []
     for d in discoveries:
-        js_data.append({
-            'repository': {
-                'owner': d['repository']['owner'],
-                'name': d['repository']['name'],
-                'url': d['repository']['url'],
-                'stars': d['repository']['stars'],
-                'language': d['repository']['language'],
-            },
-            'discovery': {
-                'markdown_file': d['discovery']['markdown_file'],
-                'file_url': d['discovery']['file_url'],
-                'patterns_found': d['discovery']['patterns_found'],
-            },
-            'quality': {
-                'score': d['quality']['score'],
-                'reasoning': d['quality']['reasoning'],
-            },
-            'contacts': d.get('contacts', [])[:3]  # Limit to first 3 contacts
-        })
-
-    js_content = f"// Auto-generated from discoveries.json\n"
-    js_content += f"// Generated: {datetime.utcnow().isoformat()}Z\n\n"
-    js_content += f"const discoveries = {json.dumps(js_data, indent=2)};\n"
-
-    return js_content
+        repository = d['repository']
+        owner = repository['owner']
+        name = repository['name']
+
+        # Most URLs follow the GitHub layout and can be rebuilt client-side
+        url = repository['url']
+        if url == f"https://github.com/{owner}/{name}":
+            url = None
+
+        rows.append([
+            owner,
+            name,
+            url,
+            repository['stars'],
+            lookup('languages', repository['language']),
+            [lookup('patterns', p) for p in d['discovery']['patterns_found']],
+            d['quality']['score'],
+            d['quality']['reasoning']
+        ])
+
+    chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+    return tables, chunks
+
+
+def decode_discoveries(tables, chunks):
+    """Inverse of encode_discoveries, mirroring decodeRow() in search.js"""
+    decoded = []
+    for chunk in chunks:
+        for row in chunk:
+            owner, name, url, stars, language, patterns, score, reasoning = row
+            decoded.append({
+                'repository': {
+                    'owner': owner,
+                    'name': name,
+                    'url': url or f"https://github.com/{owner}/{name}",
+                    'stars': stars,
+                    'language': tables['languages'][language],
+                },
+                'discovery': {
+                    'patterns_found': [tables['patterns'][p] for p in patterns],
+                },
+                'quality': {
+                    'score': score,
+                    'reasoning': reasoning,
+                },
+                'details_url': repo_page_path(owner, name)
+            })
+    return decoded
+
+
+def search_fields(discovery):
+    """Lowercased fields matched by the search box (owner, name, language, patterns)"""
+    return [
+        discovery['repository']['owner'].lower(),
+        discovery['repository']['name'].lower(),
+        (discovery['repository']['language'] or '').lower(),
+        ' '.join(discovery['discovery']['patterns_found']).lower()
+    ]
+
+
+def build_search_index(discoveries, ngram=SEARCH_NGRAM):
+    """
+    Build n-gram postings over the searchable fields of each discovery.
+
+    Grams never span two fields, so a query whose grams all hit a discovery
+    is a candidate match; search.js confirms candidates with a substring check.
+    Posting lists are sorted discovery positions, delta-encoded to stay small.
+
+    Returns:
+        {'n': ngram, 'grams': {gram: [delta-encoded ids]}}
+    """
+    postings = defaultdict(list)
+    for doc_id, discovery in enumerate(discoveries):
+        grams = set()
+        for field in search_fields(discovery):
+            for i in range(len(field) - ngram + 1):
+                grams.add(field[i:i + ngram])
+        for gram in grams:
+            postings[gram].append(doc_id)
+
+    encoded = {}
+    for gram in sorted(postings):
+        previous = 0
+        deltas = []
+        for doc_id in postings[gram]:
+            deltas.append(doc_id - previous)
+            previous = doc_id
+        encoded[gram] = deltas
+
+    return {'n': ngram, 'grams': encoded}
+
+
+def write_compressed_variants(path, payload):
+    """
+    Write pre-compressed .gz (and .br when brotli is installed) siblings.
+
+    Static hosts configured for precompressed assets (e.g. nginx gzip_static)
+    serve these directly instead of compressing on every request.
+    """
+    path = Path(path)
+    Path(f"{path}.gz").write_bytes(gzip.compress(payload, compresslevel=9, mtime=0))
+    if brotli is not None:
+        Path(f"{path}.br").write_bytes(brotli.compress(payload))
+
+
+def compressed_variants(path):
+    """Paths of the pre-compressed siblings write_compressed_variants produces"""
+    variants = [Path(f"{path}.gz")]
+    if brotli is not None:
+        variants.append(Path(f"{path}.br"))
+    return variants
+
+
+def write_if_changed(path, payload, compress=False):
+    """
+    Write payload only when it differs from what is already on disk.
+
+    Unchanged files keep their mtime, so deploys only upload real changes.
+    Compressed variants are regenerated only alongside a changed payload
+    (or when missing).
+
+    Returns:
+        True if anything was written
+    """
+    path = Path(path)
+    if path.exists() and path.read_bytes() == payload:
+        if not compress or all(v.exists() for v in compressed_variants(path)):
+            return False
+    path.write_bytes(payload)
+    if compress:
+        write_compressed_variants(path, payload)
+    return True
+
+
+def generate_discoveries_data(discoveries, site_dir, generated_at, chunk_size=DATA_CHUNK_SIZE):
+    """
+    Write chunked discovery data and the manifest that indexes it.
+
+    Produces:
+        discoveries-manifest.js  - small script loaded first (tables + chunk list)
+        data/discoveries-NNNN.json - fixed-size row chunks fetched lazily
+        data/search-index.json   - n-gram postings queried by the search box
+
+    Returns:
+        The manifest dict
+    """
+    site_dir = Path(site_dir)
+    data_dir = site_dir / 'data'
+    data_dir.mkdir(exist_ok=True)
+
+    tables, chunks = encode_discoveries(discoveries, chunk_size)
+
+    chunk_paths = []
+    for index, chunk in enumerate(chunks):
+        relative_path = f"data/discoveries-{index:04d}.json"
+        payload = _compact_json(chunk).encode('utf-8')
+        write_if_changed(site_dir / relative_path, payload, compress=True)
+        chunk_paths.append(relative_path)
+
+    # Drop chunks left over from a previous, larger registry
+    current = {Path(p).name for p in chunk_paths}
+    for stale in data_dir.glob('discoveries-*.json*'):
+        if stale.name.split('.json')[0] + '.json' not in current:
+            stale.unlink()
+
+    search_index_path = 'data/search-index.json'
+    payload = _compact_json(build_search_index(discoveries)).encode('utf-8')
+    write_if_changed(site_dir / search_index_path, payload, compress=True)
+
+    manifest = {
+        'version': 1,
+        'generated_at': generated_at,
+        'total': len(discoveries),
+        'chunk_size': chunk_size,
+        'fields': ROW_FIELDS,
+        'tables': tables,
+        'chunks': chunk_paths,
+        'search_index': search_index_path
+    }
+
+    js_content = "// Auto-generated from discoveries.json\n"
+    js_content += f"const discoveriesManifest = {_compact_json(manifest)};\n"
+    payload = js_content.encode('utf-8')
+    write_if_changed(site_dir / 'discoveries-manifest.js', payload, compress=True)
+
+    return manifest
 
 
 def generate_pattern_library_content(pattern_counter, discoveries):
@@ -173,67 +383,481 @@ def generate_pattern_library_content(pattern_counter, discoveries):
     return '\n'.join(content)
 
 
-def generate_site():
-    """Generate complete static site"""
-    print("Loading discoveries...")
-    data = load_discoveries()
-    discoveries = data['discoveries']
+# Detail pages live under site/repos/<owner>/<name>.html
+REPO_PAGES_DIR = 'repos'
 
-    print("Calculating statistics...")
-    stats = calculate_stats(data)
+# Below this many stale pages, rendering in-process beats spawning workers
+PARALLEL_PAGE_THRESHOLD = 64
 
-    print(f"Found {stats['total']} discoveries:")
-    print(f"  - High quality: {stats['high_quality']}")
-    print(f"  - Medium quality: {stats['medium_quality']}")
-    print(f"  - Low quality: {stats['low_quality']}")
-    print(f"  - Languages: {stats['language_count']}")
+TEMPLATE_FIELD = re.compile(r'\{\{\s*(\w+)\s*\}\}')
 
-    # Create site directory
-    site_dir = Path('site')
-    site_dir.mkdir(exist_ok=True)
+# Compiled detail-page template, set once per worker process
+_worker_template = None
+
+
+def compile_template(text):
+    """
+    Split a template into literal text and field names, once per build.
+
+    Returns:
+        List alternating literal text (even positions) and field names (odd)
+    """
+    return TEMPLATE_FIELD.split(text)
+
+
+def render_template(compiled, context):
+    """
+    Fill a compiled template. Fields ending in _html are inserted as-is,
+    everything else is HTML-escaped.
+    """
+    parts = []
+    for position, part in enumerate(compiled):
+        if position % 2 == 0:
+            parts.append(part)
+        elif part.endswith('_html'):
+            parts.append(context[part])
+        else:
+            parts.append(html.escape(str(context[part])))
+    return ''.join(parts)
 
-    # Generate discoveries data JS
-    print("Generating discoveries-data.js...")
-    discoveries_js = generate_discoveries_data_js(discoveries)
-    (site_dir / 'discoveries-data.js').write_text(discoveries_js)
 
-    # Copy static files
-    print("Copying static files...")
+def repo_page_path(owner, name):
+    """Site-relative path of a repository's detail page"""
+    return f"{REPO_PAGES_DIR}/{owner}/{name}.html"
+
+
+def quality_label(score):
+    """CSS class and label for a quality score, matching the registry cards"""
+    if score >= 7:
+        return 'quality-high', 'High Quality'
+    if score >= 5:
+        return 'quality-medium', 'Medium'
+    return 'quality-low', 'Lower Quality'
+
+
+def repo_page_context(d):
+    """Template fields for one discovery's detail page"""
+    repository = d['repository']
+    discovery = d['discovery']
+    quality = d['quality']
+    quality_class, label = quality_label(quality['score'])
+
+    def tags(values):
+        if not values:
+            return '<span class="card-description">None</span>'
+        return ''.join(
+            f'<span class="pattern-tag">{html.escape(str(v))}</span>' for v in values
+        )
+
+    signal_rows = [
+        f"<tr><th>Signals</th><td>{html.escape(', '.join(quality.get('signals_found', [])) or 'None')}</td></tr>"
+    ]
+    for key, value in quality.get('signal_details', {}).items():
+        if isinstance(value, list):
+            value = ', '.join(str(v) for v in value)
+        signal_rows.append(
+            f"<tr><th>{html.escape(key.replace('_', ' '))}</th><td>{html.escape(str(value))}</td></tr>"
+        )
+
+    contact_rows = []
+    for c in d.get('contacts', []):
+        if c['type'] == 'github':
+            value_html = (
+                f'<a href="https://github.com/{html.escape(c["value"])}">@{html.escape(c["value"])}</a>'
+            )
+        else:
+            value_html = html.escape(c['value'])
+        contact_rows.append(
+            f"<tr><th>{value_html}</th>"
+            f"<td>{html.escape(c['source_file'])} ({html.escape(c['confidence'])} confidence)</td></tr>"
+        )
+    if not contact_rows:
+        contact_rows.append('<tr><td>No public contacts found</td></tr>')
+
+    similar_rows = [
+        f'<tr><th><a href="../../{html.escape(repo_page_path(peer["owner"], peer["name"]))}">'
+        f'{html.escape(peer["owner"])}/{html.escape(peer["name"])}</a></th>'
+        f'<td>{peer["similarity"]:.0%} similar</td></tr>'
+        for peer in d.get('similar', [])
+    ]
+    if not similar_rows:
+        similar_rows.append('<tr><td>No similar repositories found</td></tr>')
+
+    return {
+        'full_name': f"{repository['owner']}/{repository['name']}",
+        'url': repository['url'],
+        'stars': f"{repository.get('stars') or 0:,}",
+        'language': repository.get('language') or 'Unknown',
+        'last_push': (repository.get('last_push') or 'Unknown')[:10],
+        'quality_class': quality_class,
+        'quality_label': label,
+        'score': quality['score'],
+        'reasoning': quality.get('reasoning', ''),
+        'signals_html': '\n'.join(signal_rows),
+        'markdown_file': discovery.get('markdown_file') or 'N/A',
+        'file_url': discovery.get('file_url') or repository['url'],
+        'pattern_score': discovery.get('pattern_score', 0),
+        'patterns_html': tags(discovery.get('patterns_found', [])),
+        'topics_html': tags(repository.get('topics', [])),
+        'contacts_html': '\n'.join(contact_rows),
+        'similar_html': '\n'.join(similar_rows)
+    }
+
+
+def _init_page_worker(compiled):
+    """Worker initializer: receive the compiled template once per process"""
+    global _worker_template
+    _worker_template = compiled
+
+
+def _render_page_batch(site_dir, jobs, compiled=None):
+    """
+    Render and write a batch of detail pages.
+
+    Args:
+        site_dir: Site output directory
+        jobs: List of (relative_path, discovery) tuples
+        compiled: Compiled template (defaults to the worker's copy)
+
+    Returns:
+        List of (relative_path, output_hash)
+    """
+    compiled = compiled or _worker_template
+    results = []
+    for relative_path, discovery in jobs:
+        payload = render_template(compiled, repo_page_context(discovery)).encode('utf-8')
+        output_path = Path(site_dir) / relative_path
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        write_if_changed(output_path, payload)
+        results.append((relative_path, content_hash(payload)))
+    return results
+
+
+def generate_repo_pages(discoveries, site_dir, build_manifest, template_path, force=False, workers=None):
+    """
+    Emit one static detail page per discovery, in parallel.
+
+    Each page's inputs hash covers the generator, the template and that
+    discovery's record, so only new, changed, deleted or hand-edited pages
+    are re-rendered. Pages for repositories no longer in the registry are
+    removed.
+
+    Returns:
+        (number of pages rendered, site-relative paths of every page)
+    """
+    site_dir = Path(site_dir)
+    template_bytes = Path(template_path).read_bytes()
+    base_hash = build_manifest.inputs_hash([template_path])
+
+    jobs = []
+    page_hashes = {}
+    for d in discoveries:
+        relative_path = repo_page_path(d['repository']['owner'], d['repository']['name'])
+        record = json.dumps(d, sort_keys=True).encode('utf-8')
+        page_hash = content_hash(base_hash.encode('utf-8') + record)
+        page_hashes[relative_path] = page_hash
+        if force or not build_manifest.is_fresh(relative_path, page_hash, site_dir):
+            jobs.append((relative_path, d))
+
+    # Drop pages of repositories that left the registry (e.g. opted out). The
+    # pages on disk are the authority: a fresh clone has no build manifest.
+    prefix = f"{REPO_PAGES_DIR}/"
+    for step in [s for s in build_manifest.steps if s.startswith(prefix) and s not in page_hashes]:
+        del build_manifest.steps[step]
+    pages_dir = site_dir / REPO_PAGES_DIR
+    for stale in pages_dir.glob('*/*.html'):
+        if stale.relative_to(site_dir).as_posix() not in page_hashes:
+            stale.unlink()
+            if not any(stale.parent.iterdir()):
+                stale.parent.rmdir()
+
+    if not jobs:
+        return 0, list(page_hashes)
+
+    compiled = compile_template(template_bytes.decode('utf-8'))
+    if len(jobs) < PARALLEL_PAGE_THRESHOLD:
+        results = _render_page_batch(site_dir, jobs, compiled)
+    else:
+        # Imported here: multiprocessing is the slowest import on the `discovery site` path
+        from concurrent.futures import ProcessPoolExecutor
+
+        workers = workers or os.cpu_count() or 1
+        batch_size = max(1, len(jobs) // (workers * 4))
+        batches = [jobs[i:i + batch_size] for i in range(0, len(jobs), batch_size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_page_worker,
+                                 initargs=(compiled,)) as executor:
+            results = [
+                result
+                for batch_results in executor.map(_render_page_batch, [site_dir] * len(batches), batches)
+                for result in batch_results
+            ]
+
+    for relative_path, output_hash in results:
+        build_manifest.steps[relative_path] = {
+            'inputs': page_hashes[relative_path],
+            'outputs': {relative_path: output_hash}
+        }
+
+    return len(jobs), list(page_hashes)
+
+
+# Build manifest stored in the site directory (not deployed content)
+BUILD_MANIFEST_NAME = '.build-manifest.json'
+
+
+def content_hash(payload):
+    """SHA-256 hex digest of bytes"""
+    return hashlib.sha256(payload).hexdigest()
+
+
+def file_hash(path):
+    """Content hash of a file, or None if it does not exist"""
+    path = Path(path)
+    return content_hash(path.read_bytes()) if path.exists() else None
+
+
+class BuildManifest:
+    """
+    Input and output content hashes for each build step.
+
+    A step is skipped when its inputs hash the same as last time and every
+    output it recorded is still on disk with the recorded content.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.steps = self._load()
+
+    def _load(self):
+        """Load recorded steps, treating a missing or corrupt manifest as empty"""
+        if self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    return json.load(f).get('steps', {})
+            except (ValueError, OSError):
+                pass
+        return {}
+
+    def inputs_hash(self, input_paths):
+        """Combined hash of the generator source and the given input files"""
+        digest = hashlib.sha256(Path(__file__).read_bytes())
+        for input_path in input_paths:
+            digest.update(str(input_path).encode('utf-8'))
+            digest.update((file_hash(input_path) or 'missing').encode('utf-8'))
+        return digest.hexdigest()
+
+    def is_fresh(self, step, inputs_hash, site_dir, check_content=True):
+        """
+        Check whether a step's recorded outputs are still valid.
+
+        With check_content=False outputs only need to exist, which is
+        cheaper for steps whose outputs are many or large.
+        """
+        entry = self.steps.get(step)
+        if not entry or entry['inputs'] != inputs_hash:
+            return False
+        if not check_content:
+            return all((Path(site_dir) / output).exists() for output in entry['outputs'])
+        return all(
+            file_hash(Path(site_dir) / output) == output_hash
+            for output, output_hash in entry['outputs'].items()
+        )
+
+    def record(self, step, inputs_hash, site_dir, outputs):
+        """Record a step's inputs hash and the hashes of the outputs it produced"""
+        self.steps[step] = {
+            'inputs': inputs_hash,
+            'outputs': {
+                str(output): file_hash(Path(site_dir) / output)
+                for output in outputs
+            }
+        }
+
+    def save(self):
+        """Persist the manifest"""
+        with open(self.path, 'w') as f:
+            json.dump({'steps': self.steps}, f, indent=2, sort_keys=True)
+
+
+def format_last_updated(data):
+    """Display timestamp for the data, so unchanged data renders identical pages"""
+    generated_at = data.get('metadata', {}).get('generated_at')
+    if generated_at:
+        try:
+            parsed = datetime.fromisoformat(generated_at.rstrip('Z'))
+            return parsed.strftime('%Y-%m-%d %H:%M UTC')
+        except ValueError:
+            pass
+    return datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')
+
+
+def generate_site(force=False):
+    """
+    Generate the static site, rebuilding only outputs whose inputs changed.
+
+    Args:
+        force: Ignore the build manifest and rebuild every output
+    """
+    discoveries_path = Path('discoveries.json')
     templates_dir = Path('templates')
-    shutil.copy(templates_dir / 'style.css', site_dir / 'style.css')
-    shutil.copy(templates_dir / 'search.js', site_dir / 'search.js')
-
-    # Generate index.html
-    print("Generating index.html...")
-    index_template = (templates_dir / 'index.html').read_text()
-    index_html = index_template.replace('{{ total_count }}', str(stats['total']))
-    index_html = index_html.replace('{{ high_quality_count }}', str(stats['high_quality']))
-    index_html = index_html.replace('{{ language_count }}', str(stats['language_count']))
-    index_html = index_html.replace('{{ last_updated }}', datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC'))
-    (site_dir / 'index.html').write_text(index_html)
-
-    # Generate patterns.html
-    print("Generating patterns.html...")
-    pattern_content = generate_pattern_library_content(stats['patterns'], discoveries)
-    patterns_template = (templates_dir / 'patterns.html').read_text()
-    patterns_html = patterns_template.replace('{{ patterns_content }}', pattern_content)
-    patterns_html = patterns_html.replace('{{ last_updated }}', datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC'))
-    (site_dir / 'patterns.html').write_text(patterns_html)
-
-    # Copy about.html
-    print("Generating about.html...")
-    shutil.copy(templates_dir / 'about.html', site_dir / 'about.html')
-
-    print(f"\n✓ Static site generated in {site_dir}/")
+    site_dir = Path('site')
+    site_dir.mkdir(exist_ok=True)
+    (site_dir / 'data').mkdir(exist_ok=True)
+
+    build_manifest = BuildManifest(site_dir / BUILD_MANIFEST_NAME)
+    loaded = {}
+
+    def load():
+        """Load and summarize discoveries once, only if some step needs them"""
+        if not loaded:
+            print("Loading discoveries...")
+            data = load_discoveries()
+            print("Calculating statistics...")
+            stats = calculate_stats(data)
+            print(f"Found {stats['total']} discoveries:")
+            print(f"  - High quality: {stats['high_quality']}")
+            print(f"  - Medium quality: {stats['medium_quality']}")
+            print(f"  - Low quality: {stats['low_quality']}")
+            print(f"  - Languages: {stats['language_count']}")
+            loaded.update(data=data, stats=stats)
+        return loaded['data'], loaded['stats']
+
+    def build_data():
+        data, _ = load()
+        manifest = generate_discoveries_data(
+            data['discoveries'], site_dir, data.get('metadata', {}).get('generated_at')
+        )
+        print(f"  {len(manifest['chunks'])} chunk(s) of up to {DATA_CHUNK_SIZE} discoveries")
+        base_outputs = ['discoveries-manifest.js', manifest['search_index'], *manifest['chunks']]
+        return base_outputs + [
+            variant.relative_to(site_dir)
+            for output in base_outputs
+            for variant in compressed_variants(site_dir / output)
+        ]
+
+    def build_index():
+        data, stats = load()
+        index_html = (templates_dir / 'index.html').read_text()
+        index_html = index_html.replace('{{ total_count }}', str(stats['total']))
+        index_html = index_html.replace('{{ high_quality_count }}', str(stats['high_quality']))
+        index_html = index_html.replace('{{ language_count }}', str(stats['language_count']))
+        index_html = index_html.replace('{{ last_updated }}', format_last_updated(data))
+        write_if_changed(site_dir / 'index.html', index_html.encode('utf-8'))
+        return ['index.html']
+
+    def build_patterns():
+        data, stats = load()
+        pattern_content = generate_pattern_library_content(stats['patterns'], data['discoveries'])
+        patterns_html = (templates_dir / 'patterns.html').read_text()
+        patterns_html = patterns_html.replace('{{ patterns_content }}', pattern_content)
+        patterns_html = patterns_html.replace('{{ last_updated }}', format_last_updated(data))
+        write_if_changed(site_dir / 'patterns.html', patterns_html.encode('utf-8'))
+        return ['patterns.html']
+
+    def copy_template(name):
+        def build():
+            write_if_changed(site_dir / name, (templates_dir / name).read_bytes())
+            return [name]
+        return build
+
+    # (step name, input files, build function returning output paths)
+    steps = [
+        ('discoveries-data', [discoveries_path], build_data),
+        ('index.html', [discoveries_path, templates_dir / 'index.html'], build_index),
+        ('patterns.html', [discoveries_path, templates_dir / 'patterns.html'], build_patterns),
+        ('about.html', [templates_dir / 'about.html'], copy_template('about.html')),
+        ('style.css', [templates_dir / 'style.css'], copy_template('style.css')),
+        ('search.js', [templates_dir / 'search.js'], copy_template('search.js')),
+    ]
+
+    rebuilt = []
+    for step, inputs, build in steps:
+        inputs_hash = build_manifest.inputs_hash(inputs)
+        if not force and build_manifest.is_fresh(step, inputs_hash, site_dir):
+            continue
+        print(f"Generating {step}...")
+        outputs = build()
+        build_manifest.record(step, inputs_hash, site_dir, outputs)
+        rebuilt.append(step)
+
+    # Detail pages: skip hashing every record unless the data or template changed
+    repo_template = templates_dir / 'repo.html'
+    pages_hash = build_manifest.inputs_hash([discoveries_path, repo_template])
+    if force or not build_manifest.is_fresh('repo-pages', pages_hash, site_dir):
+        data, _ = load()
+        print("Generating repository detail pages...")
+        rendered, pages = generate_repo_pages(
+            data['discoveries'], site_dir, build_manifest, repo_template, force=force
+        )
+        print(f"  {rendered} of {len(data['discoveries'])} page(s) rendered")
+        build_manifest.record('repo-pages', pages_hash, site_dir, pages)
+        if rendered:
+            rebuilt.append('repo-pages')
+
+    # Remove the single-file data script from older builds
+    legacy_data_js = site_dir / 'discoveries-data.js'
+    if legacy_data_js.exists():
+        legacy_data_js.unlink()
+
+    build_manifest.save()
+
+    if not rebuilt:
+        print(f"✓ Site in {site_dir}/ is up to date")
+        return rebuilt
+
+    print(f"\n✓ Static site generated in {site_dir}/ (rebuilt: {', '.join(rebuilt)})")
     print(f"  - index.html (main registry)")
     print(f"  - patterns.html (pattern library)")
     print(f"  - about.html (vision and principles)")
-    print(f"  - discoveries-data.js (data for search)")
+    print(f"  - {REPO_PAGES_DIR}/<owner>/<name>.html (per-repository details)")
+    print(f"  - discoveries-manifest.js, data/ (chunked data and search index)")
     print(f"  - style.css, search.js (assets)")
     print(f"\nTo preview locally:")
     print(f"  cd site && python3 -m http.server 8000")
     print(f"  Open http://localhost:8000")
+    return rebuilt
 
 
-if __name__ == '__main__':
+def watched_files():
+    """Map of every watched input path to its last modification time"""
+    paths = [Path('discoveries.json')] + sorted(Path('templates').glob('*'))
+    return {path: path.stat().st_mtime for path in paths if path.exists()}
+
+
+def watch_site(interval=1.0):
+    """Rebuild affected outputs whenever discoveries.json or templates/ change"""
     generate_site()
+    snapshot = watched_files()
+    print(f"\nWatching discoveries.json and templates/ (Ctrl+C to stop)...")
+
+    try:
+        while True:
+            time.sleep(interval)
+            current = watched_files()
+            if current != snapshot:
+                changed = sorted(
+                    str(path) for path in set(current) | set(snapshot)
+                    if current.get(path) != snapshot.get(path)
+                )
+                print(f"\nChanged: {', '.join(changed)}")
+                snapshot = current
+                try:
+                    generate_site()
+                except Exception as e:
+                    # Keep watching; the next save will usually fix it
+                    print(f"✗ Build failed: {e}")
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate static site from discoveries.json')
+    parser.add_argument('--force', action='store_true', help='Rebuild every output, ignoring the build manifest')
+    parser.add_argument('--watch', action='store_true', help='Rebuild affected pages when inputs change')
+    parser.add_argument('--interval', type=float, default=1.0, help='Watch polling interval in seconds')
+    args = parser.parse_args()
+
+    if args.watch:
+        watch_site(args.interval)
+    else:
+        generate_site(force=args.force)
@@ -0,0 +1,323 @@
+"""
+Pool of GitHub credentials shared by every API call in a run.
+
+Each request goes out under the credential with the most remaining budget
+in its rate-limit bucket (core, search, ...), learned from the X-RateLimit-*
+headers of earlier responses. A credential that hits its limit is
+quarantined for that bucket until the reset time, and the request is
+retried under the next one, so a run only stops once every credential is
+exhausted. Credentials can be personal access tokens and a GitHub App
+installation, whose short-lived token PyGithub refreshes on demand.
+
+install() routes PyGithub through the pool; RawFetcher takes pool.auth.
+"""
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from github import RateLimitExceededException
+from github.Requester import HTTPRequestsConnectionClass, HTTPSRequestsConnectionClass, Requester
+from src.profiling import repo_from_url, timed
+
+
+# Budget assumed for a bucket whose limit is not known yet
+UNKNOWN_REMAINING = float('inf')
+
+
+def bucket_for(url):
+    """
+    Rate-limit bucket a request is charged to, or None to leave it alone.
+
+    App endpoints authenticate with the app's JWT, not a pooled token.
+    """
+    path = urlsplit(url).path
+    if path.startswith('/app/') or path == '/app':
+        return None
+    if path.startswith('/search/code'):
+        return 'code_search'
+    if path.startswith('/search/'):
+        return 'search'
+    if path.startswith('/graphql'):
+        return 'graphql'
+    if path == '/rate_limit':
+        # Free: checking the limits does not count against them
+        return 'rate_limit'
+    return 'core'
+
+
+class PoolToken(requests.auth.AuthBase):
+    """One credential in the pool, with per-bucket budget and usage."""
+
+    def __init__(self, label, token=None, auth=None):
+        """
+        Args:
+            label: Name shown in usage reports (never the secret itself)
+            token: Personal access token
+            auth: PyGithub Auth (e.g. an app installation) providing a
+                token that may change over time; used instead of token
+        """
+        self.label = label
+        self._token = token
+        self._auth = auth
+        self.budgets = {}       # bucket -> {'remaining', 'limit', 'reset'}
+        self.quarantine = {}    # bucket -> epoch seconds when usable again
+        self.requests = {}      # bucket -> requests sent
+        self.rate_limited = 0
+
+    def authorization(self):
+        if self._auth is not None:
+            return f"{self._auth.token_type} {self._auth.token}"
+        return f"token {self._token}"
+
+    def __call__(self, request):
+        request.headers['Authorization'] = self.authorization()
+        return request
+
+    def remaining(self, bucket, now):
+        budget = self.budgets.get(bucket)
+        if budget is None:
+            return UNKNOWN_REMAINING
+        if budget['reset'] is not None and budget['reset'] <= now:
+            return budget['limit'] if budget['limit'] is not None else UNKNOWN_REMAINING
+        return budget['remaining']
+
+    def available(self, bucket, now):
+        return self.quarantine.get(bucket, 0) <= now
+
+
+class TokenPool:
+    """Routes requests across credentials by remaining budget per bucket."""
+
+    def __init__(self, tokens, session=None):
+        if not tokens:
+            raise ValueError("TokenPool needs at least one credential")
+        self.tokens = list(tokens)
+        self.auth = PoolAuth(self)
+        # One keep-alive session for every PyGithub request made through the pool
+        self.session = session or requests.Session()
+        self.session.auth = self.auth
+        self._lock = threading.Lock()
+
+    def acquire(self, bucket, now=None):
+        """
+        Pick the credential for one request in bucket.
+
+        Raises:
+            RateLimitExceededException: every credential is quarantined
+        """
+        now = now or time.time()
+        with self._lock:
+            usable = [token for token in self.tokens if token.available(bucket, now)]
+            if not usable:
+                reset = min(token.quarantine[bucket] for token in self.tokens)
+                raise RateLimitExceededException(
+                    403,
+                    {'message': f"all {len(self.tokens)} tokens exhausted for '{bucket}' "
+                                f"until {time.strftime('%H:%M:%S', time.localtime(reset))}"},
+                    {'x-ratelimit-reset': str(int(reset))}
+                )
+
+            # Most budget first; fewest requests so far breaks ties, spreading
+            # load across credentials whose budget is not known yet
+            token = max(usable, key=lambda t: (t.remaining(bucket, now), -t.requests.get(bucket, 0)))
+            budget = token.budgets.get(bucket)
+            if budget is not None and budget['remaining'] is not None:
+                # Charge the request now, so concurrent callers spread out
+                budget['remaining'] = max(budget['remaining'] - 1, 0)
+            token.requests[bucket] = token.requests.get(bucket, 0) + 1
+            return token
+
+    def observe(self, token, bucket, status, headers, now=None):
+        """
+        Learn a credential's budget from a response.
+
+        Returns:
+            True if the response was a rate-limit rejection (the credential
+            is now quarantined for the bucket)
+        """
+        now = now or time.time()
+        bucket = headers.get('X-RateLimit-Resource') or bucket
+        remaining = _header_int(headers, 'X-RateLimit-Remaining')
+        limit = _header_int(headers, 'X-RateLimit-Limit')
+        reset = _header_int(headers, 'X-RateLimit-Reset')
+        retry_after = _header_int(headers, 'Retry-After')
+
+        with self._lock:
+            if remaining is not None:
+                token.budgets[bucket] = {'remaining': remaining, 'limit': limit, 'reset': reset}
+
+            limited = status == 429 or (status == 403 and (remaining == 0 or retry_after is not None))
+            if not limited:
+                return False
+
+            # Primary limit: until the reset; secondary limit: for Retry-After
+            if retry_after is not None:
+                until = now + retry_after
+            elif reset is not None:
+                until = reset
+            else:
+                until = now + 60
+            token.quarantine[bucket] = max(token.quarantine.get(bucket, 0), until)
+            token.rate_limited += 1
+            return True
+
+    def refresh(self):
+        """Seed every credential's budgets from /rate_limit (not itself rate limited)."""
+        for token in self.tokens:
+            try:
+                response = self.session.get('https://api.github.com/rate_limit', auth=token, timeout=30)
+                resources = response.json()['resources']
+            except (requests.RequestException, ValueError, KeyError):
+                continue
+            with self._lock:
+                for bucket, budget in resources.items():
+                    token.budgets[bucket] = {
+                        'remaining': budget.get('remaining'),
+                        'limit': budget.get('limit'),
+                        'reset': budget.get('reset')
+                    }
+
+    def install(self):
+        """Route every PyGithub client created from now on through this pool."""
+        connection = type('PooledConnection', (PooledConnection,), {'session': self.session})
+        Requester.injectConnectionClasses(HTTPRequestsConnectionClass, connection)
+        return self
+
+    @staticmethod
+    def uninstall():
+        Requester.resetConnectionClasses()
+
+    def requests_sent(self, bucket=None):
+        """Requests routed through the pool so far, in bucket or across all of them."""
+        with self._lock:
+            if bucket is not None:
+                return sum(token.requests.get(bucket, 0) for token in self.tokens)
+            return sum(
+                count for token in self.tokens
+                for name, count in token.requests.items() if name != 'rate_limit'
+            )
+
+    def summary(self):
+        """Per-credential usage lines: requests by bucket, remaining budget, rate limits hit."""
+        now = time.time()
+        lines = []
+        with self._lock:
+            for token in self.tokens:
+                used = ', '.join(f"{bucket} {count}" for bucket, count in sorted(token.requests.items()))
+                left = ', '.join(
+                    f"{bucket} {token.remaining(bucket, now)}"
+                    for bucket in ('core', 'search') if bucket in token.budgets
+                )
+                line = f"{token.label}: {used or 'no requests'}"
+                if left:
+                    line += f" (remaining {left})"
+                if token.rate_limited:
+                    line += f", rate limited {token.rate_limited}x"
+                lines.append(line)
+        return lines
+
+
+class PoolAuth(requests.auth.AuthBase):
+    """
+    requests auth that signs each request with the pool's best credential.
+
+    A rate-limited response is retried under the next credential with
+    budget, the way requests' digest auth re-sends after a challenge.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def __call__(self, request):
+        bucket = bucket_for(request.url)
+        if bucket is None:
+            return request
+        token = self.pool.acquire(bucket)
+        token(request)
+        request.register_hook('response', lambda response, **kwargs: self._handle(response, token, bucket, kwargs))
+        return request
+
+    def _handle(self, response, token, bucket, send_kwargs):
+        if not self.pool.observe(token, bucket, response.status_code, response.headers):
+            return response
+        try:
+            token = self.pool.acquire(bucket)
+        except RateLimitExceededException:
+            # Nothing left to fail over to; the caller sees the rejection
+            return response
+
+        # Release the rejected response's connection and re-send
+        response.content
+        response.close()
+        retry = response.request.copy()
+        token(retry)
+        retried = response.connection.send(retry, **send_kwargs)
+        retried.history.append(response)
+        retried.request = retry
+        return self._handle(retried, token, bucket, send_kwargs)
+
+
+class PooledConnection(HTTPSRequestsConnectionClass):
+    """
+    PyGithub connection that sends through the pool's shared session.
+
+    PyGithub builds a connection per request once connection classes are
+    injected; sharing one session keeps its connections alive anyway.
+    """
+
+    session = None  # set per pool by TokenPool.install
+
+    def __init__(self, host, port=None, strict=False, timeout=None, retry=None, pool_size=None, **kwargs):
+        self.host = host
+        self.port = port if port else 443
+        self.protocol = 'https'
+        self.timeout = timeout
+        self.verify = kwargs.get('verify', True)
+
+    def getresponse(self):
+        with timed('network', repo_from_url(self.url)):
+            return super().getresponse()
+
+    def close(self):
+        # The shared session outlives each per-request connection
+        pass
+
+
+def _header_int(headers, name):
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return int(float(value))
+    except ValueError:
+        return None
+
+
+def load_token_pool(config):
+    """
+    Build the pool from Config: GITHUB_TOKEN, GITHUB_TOKENS and an optional
+    GitHub App installation.
+    """
+    tokens = []
+    seen = set()
+    for token in [config.GITHUB_TOKEN, *config.GITHUB_TOKENS]:
+        if token and token not in seen:
+            seen.add(token)
+            tokens.append(PoolToken(f"token {len(tokens) + 1} (...{token[-4:]})", token=token))
+
+    if config.GITHUB_APP_ID:
+        from github import Auth, Github
+
+        with open(config.GITHUB_APP_PRIVATE_KEY_FILE, 'r') as f:
+            private_key = f.read()
+        installation = Auth.AppAuth(config.GITHUB_APP_ID, private_key).get_installation_auth(
+            int(config.GITHUB_APP_INSTALLATION_ID)
+        )
+        # Binding a client lets the installation fetch and refresh its token
+        Github(auth=installation)
+        tokens.append(PoolToken(f"app {config.GITHUB_APP_ID} installation {config.GITHUB_APP_INSTALLATION_ID}",
+                                auth=installation))
+
+    return TokenPool(tokens)
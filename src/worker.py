@@ -0,0 +1,152 @@
+"""
+Coordinator/worker mode over a shared WorkQueue.
+
+fill_queue is the coordinator: prefilter once, enqueue the candidates.
+run_worker is one worker process: claim a batch, run the unchanged search,
+extract and analyze stages on it, store each result, repeat until the queue
+is drained. merge_queue builds the usual reports from the stored results.
+"""
+
+import time
+
+from src.analyze import analyze_quality
+from src.cache import RepoFileCache
+from src.config import Config, load_search_settings
+from src.dedupe import mark_near_duplicates
+from src.extract import extract_contacts
+from src.generate import generate_reports
+from src.opt_manager import OptOutManager
+from src.prefilter import prefilter_tiers
+from src.priority import YieldModel, prioritize
+from src.search import search_for_discovery_patterns
+from src.workqueue import CLAIM_BATCH, LEASE_SECONDS, POLL_SECONDS, worker_name
+
+
+def fill_queue(queue, tiers, settings=None):
+    """
+    Prefilter tiers and enqueue the candidates, most promising first.
+
+    Returns:
+        Number of candidates added to the queue
+    """
+    settings = settings or load_search_settings()
+    prefilter_stats = {}
+    candidates = prefilter_tiers(
+        tiers, opt_out=OptOutManager(Config.OPT_OUT_JSON), stats=prefilter_stats, settings=settings
+    )
+    candidates = prioritize(candidates, YieldModel(Config.YIELD_MODEL_JSON))
+    added = queue.enqueue(candidates)
+
+    # Several fills into one queue merge into one report
+    previous = queue.get_meta('report', {'tiers': [], 'prefilter_stats': {}})
+    stats = previous['prefilter_stats']
+    for key, value in prefilter_stats.items():
+        stats[key] = stats.get(key, 0) + value
+    queue.set_meta('report', {'tiers': sorted(set(previous['tiers']) | set(tiers)), 'prefilter_stats': stats})
+    return added
+
+
+def run_worker(queue, settings=None, fetcher=None, worker=None, batch=CLAIM_BATCH,
+               lease_seconds=LEASE_SECONDS, poll_seconds=POLL_SECONDS, stats=None):
+    """
+    Process queued candidates until none are left to claim.
+
+    A worker that finds nothing claimable while other workers still hold
+    leases waits and retries, picking up any lease that expires. It stops
+    early when the content search is rate-limited, handing the unscanned
+    part of its batch back.
+
+    Args:
+        queue: WorkQueue to claim from
+        settings: SearchSettings snapshot (defaults to load_search_settings())
+        fetcher: RawFetcher shared by search and extraction
+        worker: Lease owner name (defaults to host:pid)
+        batch: Candidates claimed per lease
+        lease_seconds: Lease length, renewed between stages
+        poll_seconds: Wait between claims while others hold leases
+        stats: Optional dict filled with processed and discoveries
+
+    Returns:
+        True if the queue was drained, False if the worker stopped early
+    """
+    settings = settings or load_search_settings()
+    worker = worker or worker_name()
+    file_cache = RepoFileCache(Config.FILE_CACHE_JSON)
+    processed = found = 0
+    drained = True
+
+    try:
+        while True:
+            claimed = queue.claim(worker, batch, lease_seconds)
+            if not claimed:
+                if not queue.outstanding():
+                    break
+                time.sleep(poll_seconds)
+                continue
+
+            keys = [key for key, _ in claimed]
+            candidates = [candidate for _, candidate in claimed]
+            try:
+                search_stats = {}
+                discoveries = search_for_discovery_patterns(
+                    candidates, settings=settings, file_cache=file_cache, stats=search_stats, fetcher=fetcher
+                )
+                # Clones within the batch share one representative's analysis
+                mark_near_duplicates(discoveries)
+                queue.renew(keys, worker, lease_seconds)
+                for discovery in discoveries:
+                    discovery.contacts = extract_contacts(discovery, file_cache=file_cache, fetcher=fetcher)
+                queue.renew(keys, worker, lease_seconds)
+                for discovery in discoveries:
+                    discovery.quality = analyze_quality(discovery, settings=settings)
+            except KeyboardInterrupt:
+                queue.release(keys, worker)
+                raise
+            except Exception as e:
+                print(f"  ✗ Batch failed, will be retried: {e}")
+                queue.fail(keys, worker, str(e))
+                continue
+            finally:
+                file_cache.save()
+
+            by_name = {(d.owner, d.repo): d for d in discoveries}
+            scanned = search_stats['processed']
+            for key, candidate in claimed[:scanned]:
+                queue.complete(key, by_name.get((candidate.owner, candidate.repo)))
+            processed += scanned
+            found += len(discoveries)
+
+            if scanned < len(claimed):
+                # Rate-limited mid-batch: leave the rest for after the reset
+                queue.release(keys[scanned:], worker)
+                drained = False
+                break
+    finally:
+        if stats is not None:
+            stats['processed'] = processed
+            stats['discoveries'] = found
+
+    return drained
+
+
+def merge_queue(queue):
+    """
+    Generate the reports from every stored result.
+
+    Returns:
+        {'json': json_path, 'markdown': md_path}
+    """
+    counts = queue.counts()
+    report = queue.get_meta('report', {'tiers': [], 'prefilter_stats': {}})
+    tiers = report['tiers']
+    metadata = {
+        'tier': tiers[0] if len(tiers) == 1 else ','.join(map(str, tiers)),
+        'total_candidates': sum(counts.values()),
+        **report['prefilter_stats']
+    }
+    # Say so when the report does not cover every candidate
+    if counts['failed']:
+        metadata['failed_candidates'] = counts['failed']
+    if queue.outstanding():
+        metadata['unprocessed_candidates'] = queue.outstanding()
+    return generate_reports(queue.results(), metadata=metadata)
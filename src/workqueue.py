@@ -0,0 +1,217 @@
+"""
+Durable work queue for coordinator/worker runs.
+
+The coordinator runs the topic prefilter once and enqueues every candidate
+into a SQLite file. Any number of worker processes claim batches of
+candidates under a lease, run the content search, contact extraction and
+quality analysis on them, and write each result back. A lease that expires
+(its worker died or hung) makes the batch claimable again, up to
+MAX_ATTEMPTS times. A final merge turns the stored results into the usual
+reports.
+
+SQLite is in WAL mode and claims run in an immediate transaction, so
+workers on one host (or on hosts sharing a filesystem with working locks)
+never claim the same candidate twice.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from src.records import Candidate, Discovery
+
+
+# Claims of one candidate before it is marked failed
+MAX_ATTEMPTS = 3
+
+# Seconds a worker may hold a batch before others may reclaim it
+LEASE_SECONDS = 600
+
+# Candidates claimed per lease; amortizes each search pass's rate-limit checks
+CLAIM_BATCH = 10
+
+# Seconds an idle worker waits before checking for expired leases
+POLL_SECONDS = 15
+
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    key TEXT PRIMARY KEY,
+    priority REAL NOT NULL,
+    candidate TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    lease_owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS items_by_status ON items (status, priority DESC);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def worker_name():
+    """Default lease owner: host and process id."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class WorkQueue:
+    """
+    Candidates keyed by full name, each pending, leased, done or failed.
+
+    A done item stores its Discovery in report form, or no result if the
+    candidate had no discovery patterns.
+    """
+
+    def __init__(self, db_file):
+        self.db_file = Path(db_file)
+        self._db = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    @contextmanager
+    def _transaction(self):
+        # IMMEDIATE takes the write lock up front, so two claimers cannot
+        # both read the same pending rows
+        self._db.execute('BEGIN IMMEDIATE')
+        try:
+            yield self._db
+        except BaseException:
+            self._db.execute('ROLLBACK')
+            raise
+        self._db.execute('COMMIT')
+
+    @staticmethod
+    def _key(candidate):
+        return candidate.full_name.lower()
+
+    def enqueue(self, candidates):
+        """
+        Add candidates, highest predicted yield claimed first.
+
+        Returns:
+            Number of candidates added (ones already queued are kept as is)
+        """
+        with self._transaction() as db:
+            before = db.total_changes
+            db.executemany(
+                'INSERT OR IGNORE INTO items (key, priority, candidate) VALUES (?, ?, ?)',
+                [(self._key(c), c.predicted_yield or 0, json.dumps(c.to_dict())) for c in candidates]
+            )
+            return db.total_changes - before
+
+    def claim(self, worker, count=CLAIM_BATCH, lease_seconds=LEASE_SECONDS, now=None):
+        """
+        Lease up to count claimable candidates to worker.
+
+        Pending items and items whose lease has expired are claimable; an
+        expired item that has used up its attempts is marked failed instead.
+
+        Returns:
+            List of (key, Candidate)
+        """
+        now = now or time.time()
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE items SET status = ?, lease_owner = NULL, error = 'lease expired' "
+                "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                (FAILED, LEASED, now, MAX_ATTEMPTS)
+            )
+            rows = db.execute(
+                'SELECT key, candidate FROM items '
+                'WHERE status = ? OR (status = ? AND lease_expires < ?) '
+                'ORDER BY priority DESC, rowid LIMIT ?',
+                (PENDING, LEASED, now, count)
+            ).fetchall()
+            db.executemany(
+                'UPDATE items SET status = ?, lease_owner = ?, lease_expires = ?, attempts = attempts + 1 '
+                'WHERE key = ?',
+                [(LEASED, worker, now + lease_seconds, key) for key, _ in rows]
+            )
+        return [(key, Candidate.from_dict(json.loads(candidate))) for key, candidate in rows]
+
+    def renew(self, keys, worker, lease_seconds=LEASE_SECONDS, now=None):
+        """Extend worker's leases on keys; returns how many it still held."""
+        now = now or time.time()
+        with self._transaction() as db:
+            before = db.total_changes
+            db.executemany(
+                'UPDATE items SET lease_expires = ? WHERE key = ? AND status = ? AND lease_owner = ?',
+                [(now + lease_seconds, key, LEASED, worker) for key in keys]
+            )
+            return db.total_changes - before
+
+    def complete(self, key, discovery=None):
+        """Store a candidate's result (None: no discovery patterns)."""
+        result = json.dumps(discovery.to_dict()) if discovery is not None else None
+        with self._transaction() as db:
+            db.execute(
+                'UPDATE items SET status = ?, result = ?, lease_owner = NULL, lease_expires = NULL, '
+                'error = NULL WHERE key = ? AND status != ?',
+                (DONE, result, key, DONE)
+            )
+
+    def release(self, keys, worker):
+        """Hand leased keys back unprocessed, without spending an attempt."""
+        with self._transaction() as db:
+            db.executemany(
+                'UPDATE items SET status = ?, lease_owner = NULL, lease_expires = NULL, '
+                'attempts = attempts - 1 WHERE key = ? AND status = ? AND lease_owner = ?',
+                [(PENDING, key, LEASED, worker) for key in keys]
+            )
+
+    def fail(self, keys, worker, error):
+        """Give up on leased keys; they are retried until MAX_ATTEMPTS."""
+        with self._transaction() as db:
+            db.executemany(
+                'UPDATE items SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, '
+                'lease_owner = NULL, lease_expires = NULL, error = ? '
+                'WHERE key = ? AND status = ? AND lease_owner = ?',
+                [(MAX_ATTEMPTS, FAILED, PENDING, error, key, LEASED, worker) for key in keys]
+            )
+
+    def counts(self):
+        """Number of items in each status."""
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        for status, count in self._db.execute('SELECT status, COUNT(*) FROM items GROUP BY status'):
+            counts[status] = count
+        return counts
+
+    def outstanding(self):
+        """Items not yet done or failed."""
+        counts = self.counts()
+        return counts[PENDING] + counts[LEASED]
+
+    def results(self):
+        """Discovery records of every done item that had one, linked to full candidates."""
+        rows = self._db.execute(
+            'SELECT candidate, result FROM items WHERE status = ? AND result IS NOT NULL ORDER BY rowid',
+            (DONE,)
+        )
+        return [
+            Discovery.from_dict(json.loads(result), candidate=Candidate.from_dict(json.loads(candidate)))
+            for candidate, result in rows
+        ]
+
+    def get_meta(self, key, default=None):
+        row = self._db.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, key, value):
+        with self._transaction() as db:
+            db.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, json.dumps(value)))
@@ -6,139 +6,337 @@ document.addEventListener('DOMContentLoaded', function() {
     const filterLow = document.getElementById('filterLowQuality');
     const discoveriesContainer = document.getElementById('discoveries');
 
-    // Render discovery cards
-    function renderDiscoveries() {
+    // Must match .discovery-card --card-height and the grid minmax() in style.css
+    const CARD_HEIGHT = 320;
+    const MIN_CARD_WIDTH = 350;
+    const OVERSCAN_ROWS = 2;
+
+    const discoveries = [];
+    const haystacks = [];  // Lowercased searchable fields per discovery
+    let filtered = [];     // Ids of discoveries matching the current filters
+    const pool = [];       // Recycled card elements, bound to the visible window
+    let renderedRange = null;
+    let frameRequested = false;
+    let searchIndex = null;
+    let searchIndexRequest = null;
+
+    // Expand an encoded row using the shared tables from the manifest
+    function decodeRow(row) {
+        const tables = discoveriesManifest.tables;
+        const [owner, name, url, stars, language, patterns, score, reasoning] = row;
+
+        return {
+            repository: {
+                owner: owner,
+                name: name,
+                url: url || `https://github.com/${owner}/${name}`,
+                stars: stars,
+                language: tables.languages[language]
+            },
+            discovery: {
+                patterns_found: patterns.map(p => tables.patterns[p])
+            },
+            quality: {
+                score: score,
+                reasoning: reasoning
+            },
+            details_url: `repos/${encodeURIComponent(owner)}/${encodeURIComponent(name)}.html`
+        };
+    }
+
+    // Store a batch of newly loaded discoveries and extend the filtered list
+    function addDiscoveries(batch) {
+        const firstId = discoveries.length;
+
+        batch.forEach(discovery => {
+            discoveries.push(discovery);
+            haystacks.push([
+                discovery.repository.owner.toLowerCase(),
+                discovery.repository.name.toLowerCase(),
+                (discovery.repository.language || '').toLowerCase(),
+                discovery.discovery.patterns_found.join(' ').toLowerCase()
+            ]);
+        });
+
+        applyFilters(firstId);
+    }
+
+    // Fetch all chunks in parallel but add them in manifest order
+    async function loadDiscoveries() {
         discoveriesContainer.innerHTML = '';
 
-        discoveries.forEach(discovery => {
-            const card = createDiscoveryCard(discovery);
+        const requests = discoveriesManifest.chunks.map(path =>
+            fetch(path).then(response => {
+                if (!response.ok) {
+                    throw new Error(`Failed to load ${path}: ${response.status}`);
+                }
+                return response.json();
+            })
+        );
+
+        for (const request of requests) {
+            addDiscoveries((await request).map(decodeRow));
+        }
+    }
+
+    // Grid geometry: columns from the live CSS grid, rows from the fixed card height
+    function gridLayout() {
+        const style = getComputedStyle(discoveriesContainer);
+        const gap = parseFloat(style.rowGap) || 0;
+        const templateColumns = style.gridTemplateColumns;
+        let columns = templateColumns && templateColumns !== 'none'
+            ? templateColumns.split(' ').length
+            : Math.floor((discoveriesContainer.clientWidth + gap) / (MIN_CARD_WIDTH + gap));
+
+        columns = Math.max(1, columns);
+        return { columns: columns, rowHeight: CARD_HEIGHT + gap };
+    }
+
+    // Render only the cards near the viewport, padding the grid for the rest
+    function renderDiscoveries(force) {
+        const layout = gridLayout();
+        const totalRows = Math.ceil(filtered.length / layout.columns);
+        const containerTop = discoveriesContainer.getBoundingClientRect().top;
+        const viewportHeight = window.innerHeight || document.documentElement.clientHeight;
+
+        const rowsInView = Math.ceil(viewportHeight / layout.rowHeight);
+
+        // Clamp to the end so a shrunken result list never renders an empty window
+        let firstRow = Math.max(0, Math.floor(-containerTop / layout.rowHeight) - OVERSCAN_ROWS);
+        firstRow = Math.min(firstRow, Math.max(0, totalRows - rowsInView - OVERSCAN_ROWS));
+        const lastRow = Math.min(totalRows - 1, firstRow + rowsInView + 2 * OVERSCAN_ROWS);
+        const start = Math.min(filtered.length, firstRow * layout.columns);
+        const end = Math.min(filtered.length, (lastRow + 1) * layout.columns);
+
+        if (!force && renderedRange && renderedRange[0] === start && renderedRange[1] === end) {
+            return;
+        }
+        renderedRange = [start, end];
+
+        while (pool.length < end - start) {
+            const card = createDiscoveryCard();
+            pool.push(card);
             discoveriesContainer.appendChild(card);
+        }
+
+        pool.forEach((card, offset) => {
+            const id = filtered[start + offset];
+            if (start + offset < end) {
+                if (card.boundId !== id) {
+                    bindDiscoveryCard(card, discoveries[id]);
+                    card.boundId = id;
+                }
+                card.classList.remove('hidden');
+            } else {
+                card.classList.add('hidden');
+            }
         });
 
-        applyFilters();
+        discoveriesContainer.style.paddingTop = `${firstRow * layout.rowHeight}px`;
+        discoveriesContainer.style.paddingBottom =
+            `${Math.max(0, totalRows - lastRow - 1) * layout.rowHeight}px`;
+    }
+
+    // Coalesce scroll and resize events into one render per frame
+    function scheduleRender() {
+        if (!frameRequested) {
+            frameRequested = true;
+            requestAnimationFrame(() => {
+                frameRequested = false;
+                renderDiscoveries(false);
+            });
+        }
     }
 
-    // Create a discovery card element
-    function createDiscoveryCard(discovery) {
+    // Create an empty, reusable discovery card element
+    function createDiscoveryCard() {
         const card = document.createElement('div');
         card.className = 'discovery-card';
-        card.dataset.name = discovery.repository.name.toLowerCase();
-        card.dataset.owner = discovery.repository.owner.toLowerCase();
-        card.dataset.language = (discovery.repository.language || '').toLowerCase();
-        card.dataset.patterns = discovery.discovery.patterns_found.join(' ').toLowerCase();
-        card.dataset.score = discovery.quality.score;
 
+        const header = appendElement(card, 'div', 'card-header');
+        const title = appendElement(appendElement(header, 'div'), 'h3', 'card-title');
+        card.titleLink = appendElement(title, 'a');
+        card.titleLink.target = '_blank';
+        card.titleLink.rel = 'noopener noreferrer';
+        card.badge = appendElement(header, 'span', 'quality-badge');
+
+        const meta = appendElement(card, 'div', 'card-meta');
+        card.stars = appendElement(meta, 'span');
+        card.language = appendElement(meta, 'span');
+
+        card.description = appendElement(card, 'div', 'card-description');
+        card.patterns = appendElement(card, 'div', 'card-patterns');
+
+        const footer = appendElement(card, 'div', 'card-footer');
+        card.detailsLink = appendElement(footer, 'a', 'discovery-link');
+        card.detailsLink.textContent = 'Signals, contacts & patterns →';
+
+        return card;
+    }
+
+    // Fill a pooled card with one discovery, using text nodes rather than HTML
+    function bindDiscoveryCard(card, discovery) {
+        const score = discovery.quality.score;
         const qualityClass =
-            discovery.quality.score >= 7 ? 'quality-high' :
-            discovery.quality.score >= 5 ? 'quality-medium' : 'quality-low';
+            score >= 7 ? 'quality-high' :
+            score >= 5 ? 'quality-medium' : 'quality-low';
 
         const qualityLabel =
-            discovery.quality.score >= 7 ? 'High Quality' :
-            discovery.quality.score >= 5 ? 'Medium' : 'Lower Quality';
-
-        const stars = discovery.repository.stars.toLocaleString();
-        const language = discovery.repository.language || 'Unknown';
-
-        const patternsHtml = discovery.discovery.patterns_found
-            .map(p => `<span class="pattern-tag">${escapeHtml(p)}</span>`)
-            .join('');
-
-        const contactsHtml = discovery.contacts.slice(0, 2)
-            .map(c => {
-                if (c.type === 'github') {
-                    return `<a href="https://github.com/${c.value}">@${c.value}</a>`;
-                } else if (c.type === 'email') {
-                    return escapeHtml(c.value);
-                }
-                return '';
-            })
-            .filter(c => c)
-            .join(', ');
-
-        card.innerHTML = `
-            <div class="card-header">
-                <div>
-                    <h3 class="card-title">
-                        <a href="${discovery.repository.url}" target="_blank">
-                            ${escapeHtml(discovery.repository.owner)}/${escapeHtml(discovery.repository.name)}
-                        </a>
-                    </h3>
-                </div>
-                <span class="quality-badge ${qualityClass}">${qualityLabel} ${discovery.quality.score}/10</span>
-            </div>
-
-            <div class="card-meta">
-                <span>⭐ ${stars}</span>
-                <span>💻 ${escapeHtml(language)}</span>
-            </div>
-
-            <div class="card-description">
-                ${escapeHtml(discovery.quality.reasoning || 'No description available')}
-            </div>
-
-            ${patternsHtml ? `<div class="card-patterns">${patternsHtml}</div>` : ''}
-
-            <div class="card-footer">
-                <div class="contacts">
-                    ${contactsHtml ? `Contact: ${contactsHtml}` : ''}
-                </div>
-                <a href="${discovery.discovery.file_url}" target="_blank" class="discovery-link">
-                    View ${discovery.discovery.markdown_file} →
-                </a>
-            </div>
-        `;
+            score >= 7 ? 'High Quality' :
+            score >= 5 ? 'Medium' : 'Lower Quality';
 
-        return card;
+        card.titleLink.href = discovery.repository.url;
+        card.titleLink.textContent = `${discovery.repository.owner}/${discovery.repository.name}`;
+        card.badge.className = `quality-badge ${qualityClass}`;
+        card.badge.textContent = `${qualityLabel} ${score}/10`;
+
+        card.stars.textContent = `⭐ ${discovery.repository.stars.toLocaleString()}`;
+        card.language.textContent = `💻 ${discovery.repository.language || 'Unknown'}`;
+        card.description.textContent = discovery.quality.reasoning || 'No description available';
+
+        card.patterns.textContent = '';
+        discovery.discovery.patterns_found.forEach(p => {
+            appendElement(card.patterns, 'span', 'pattern-tag').textContent = p;
+        });
+        card.patterns.hidden = discovery.discovery.patterns_found.length === 0;
+
+        card.detailsLink.href = discovery.details_url;
     }
 
-    // Apply search and filters
-    function applyFilters() {
-        const searchTerm = searchInput.value.toLowerCase();
-        const cards = discoveriesContainer.querySelectorAll('.discovery-card');
-
-        cards.forEach(card => {
-            const score = parseInt(card.dataset.score);
-            const matchesSearch =
-                searchTerm === '' ||
-                card.dataset.name.includes(searchTerm) ||
-                card.dataset.owner.includes(searchTerm) ||
-                card.dataset.language.includes(searchTerm) ||
-                card.dataset.patterns.includes(searchTerm);
-
-            const matchesQuality =
-                (filterHigh.checked && score >= 7) ||
-                (filterMedium.checked && score >= 5 && score < 7) ||
-                (filterLow.checked && score < 5);
-
-            if (matchesSearch && matchesQuality) {
-                card.classList.remove('hidden');
+    function appendElement(parent, tagName, className) {
+        const element = document.createElement(tagName);
+        if (className) {
+            element.className = className;
+        }
+        parent.appendChild(element);
+        return element;
+    }
+
+    // Fetch the prebuilt n-gram index once and expand its delta-encoded postings
+    function loadSearchIndex() {
+        if (!searchIndexRequest) {
+            searchIndexRequest = fetch(discoveriesManifest.search_index)
+                .then(response => response.json())
+                .then(index => {
+                    const postings = new Map();
+                    Object.entries(index.grams).forEach(([gram, deltas]) => {
+                        let id = 0;
+                        postings.set(gram, deltas.map(delta => (id += delta)));
+                    });
+                    searchIndex = { n: index.n, postings: postings };
+                    if (searchInput.value) {
+                        applyFilters(0);
+                    }
+                })
+                .catch(error => console.error(error));
+        }
+        return searchIndexRequest;
+    }
+
+    // Intersect two sorted id lists
+    function intersect(a, b) {
+        const result = [];
+        let i = 0;
+        let j = 0;
+        while (i < a.length && j < b.length) {
+            if (a[i] === b[j]) {
+                result.push(a[i]);
+                i++;
+                j++;
+            } else if (a[i] < b[j]) {
+                i++;
             } else {
-                card.classList.add('hidden');
+                j++;
             }
-        });
+        }
+        return result;
+    }
+
+    // Ids that may match the term, or null when every discovery must be checked
+    function candidateIds(term) {
+        if (!searchIndex || term.length < searchIndex.n) {
+            return null;
+        }
+
+        const lists = [];
+        for (let i = 0; i + searchIndex.n <= term.length; i++) {
+            const ids = searchIndex.postings.get(term.slice(i, i + searchIndex.n));
+            if (!ids) {
+                return [];
+            }
+            lists.push(ids);
+        }
+
+        lists.sort((a, b) => a.length - b.length);
+        return lists.reduce((result, ids) => intersect(result, ids));
+    }
+
+    function matchesSearch(id, term) {
+        return haystacks[id].some(field => field.includes(term));
+    }
+
+    function matchesQuality(score) {
+        return (filterHigh.checked && score >= 7) ||
+            (filterMedium.checked && score >= 5 && score < 7) ||
+            (filterLow.checked && score < 5);
+    }
+
+    // Recompute matching ids from firstId onwards (0 = full refilter), then re-render
+    function applyFilters(firstId) {
+        const searchTerm = searchInput.value.toLowerCase();
+        const fromId = typeof firstId === 'number' ? firstId : 0;
+        const matches = id =>
+            (searchTerm === '' || matchesSearch(id, searchTerm)) &&
+            matchesQuality(discoveries[id].quality.score);
+
+        if (fromId === 0) {
+            filtered = [];
+        }
+
+        const ids = searchTerm === '' ? null : candidateIds(searchTerm);
+        if (ids === null) {
+            for (let id = fromId; id < discoveries.length; id++) {
+                if (matches(id)) {
+                    filtered.push(id);
+                }
+            }
+        } else {
+            ids.forEach(id => {
+                if (id >= fromId && id < discoveries.length && matches(id)) {
+                    filtered.push(id);
+                }
+            });
+        }
 
         updateStats();
+        renderDiscoveries(true);
     }
 
-    // Update visible stats
+    // Update visible stats from the filtered data
     function updateStats() {
-        const visibleCards = discoveriesContainer.querySelectorAll('.discovery-card:not(.hidden)');
-        document.getElementById('totalCount').textContent = visibleCards.length;
+        document.getElementById('totalCount').textContent = filtered.length;
     }
 
-    // Escape HTML to prevent XSS
-    function escapeHtml(text) {
-        const div = document.createElement('div');
-        div.textContent = text;
-        return div.innerHTML;
+    // Run fn once input has been idle for the given delay
+    function debounce(fn, delay) {
+        let timer = null;
+        return function() {
+            clearTimeout(timer);
+            timer = setTimeout(fn, delay);
+        };
     }
 
+    const refilter = () => applyFilters(0);
+
     // Event listeners
-    searchInput.addEventListener('input', applyFilters);
-    filterHigh.addEventListener('change', applyFilters);
-    filterMedium.addEventListener('change', applyFilters);
-    filterLow.addEventListener('change', applyFilters);
+    searchInput.addEventListener('focus', loadSearchIndex, { once: true });
+    searchInput.addEventListener('input', debounce(refilter, 150));
+    filterHigh.addEventListener('change', refilter);
+    filterMedium.addEventListener('change', refilter);
+    filterLow.addEventListener('change', refilter);
+    window.addEventListener('scroll', scheduleRender, { passive: true });
+    window.addEventListener('resize', scheduleRender);
 
     // Initial render
-    renderDiscoveries();
+    loadDiscoveries().catch(error => console.error(error));
 });
@@ -0,0 +1,103 @@
+"""
+Tests for deadline and API-budget bounded runs.
+"""
+
+import pytest
+
+from src import analyze, search
+from src.budget import RunBudget, parse_duration
+from src.cache import RepoFileCache
+from src.config import load_search_settings
+from src.main import partial_metadata
+from src.records import Candidate, Discovery
+from src.search import DISCOVERY_CALLS
+
+
+class FakeFetcher:
+    """Every candidate has a README.md with discovery patterns; counts requests."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_text(self, owner, repo, path, ref, max_bytes):
+        self.calls += 1
+        if path != 'README.md':
+            raise search.FileNotFound(404, 'Not Found')
+        return 'Run kubectl get pods and tree -L 2'
+
+
+def test_parse_duration():
+    assert parse_duration('20m') == 1200
+    assert parse_duration('1h30m') == 5400
+    assert parse_duration('90s') == parse_duration('90') == 90
+    with pytest.raises(ValueError):
+        parse_duration('soon')
+
+
+def test_budget_reports_what_ran_out():
+    now = [0.0]
+    calls = [0]
+    budget = RunBudget(deadline=100, api_calls=50, calls_spent=lambda: calls[0], clock=lambda: now[0])
+
+    assert budget.can_afford(50) and not budget.tight() and budget.reason() is None
+    calls[0] = 45
+    assert budget.tight() and not budget.can_afford(6) and budget.reason() == 'API budget'
+
+    deadline_only = RunBudget(deadline=10, clock=lambda: now[0])
+    now[0] = 9.8
+    assert deadline_only.exhausted() and deadline_only.reason() == 'deadline'
+
+
+def test_search_stops_while_discoveries_can_still_be_processed(tmp_path, monkeypatch):
+    monkeypatch.setattr(search, 'Github', lambda token: None)
+    monkeypatch.setattr(search, 'check_rate_limit', lambda client: None)
+    settings = load_search_settings()
+    files = len(settings.target_files)
+    fetcher = FakeFetcher()
+    # Room to scan two candidates and still extract and analyze both
+    budget = RunBudget(api_calls=2 * files + 2 * DISCOVERY_CALLS, calls_spent=lambda: fetcher.calls)
+    candidates = [Candidate(owner='alice', repo=name, default_branch='main') for name in 'abcd']
+
+    stats = {}
+    found = search.search_for_discovery_patterns(candidates, settings=settings, stats=stats, fetcher=fetcher,
+                                                 file_cache=RepoFileCache(tmp_path / 'files.json'),
+                                                 budget=budget)
+
+    assert [d.repo for d in found] == ['a', 'b'] and stats['processed'] == 2
+    assert budget.calls_left() >= 2 * DISCOVERY_CALLS and budget.reason() == 'API budget'
+    assert partial_metadata(budget, candidates, found, stats) == {
+        'partial': True, 'partial_reason': 'API budget', 'unscanned_candidates': 2,
+        'lean_analyses': 0, 'unanalyzed_discoveries': 0
+    }
+
+
+def test_analysis_degrades_with_the_budget(monkeypatch):
+    probes = []
+
+    def fake_collect(client, repo, owner, pattern_score, optional_probes=True):
+        probes.append(optional_probes)
+        return {'pattern_score': pattern_score, 'skipped_probes': [] if optional_probes else ['contributors']}
+
+    class FakeGithub:
+        def __init__(self, token):
+            pass
+
+        def get_repo(self, name):
+            return None
+
+    monkeypatch.setattr(analyze, 'Github', FakeGithub)
+    monkeypatch.setattr(analyze, 'collect_signals', fake_collect)
+    discovery = Discovery(Candidate(owner='alice', repo='tools'), 'CLAUDE.md', pattern_score=8)
+    calls = [0]
+    budget = RunBudget(api_calls=100, calls_spent=lambda: calls[0])
+    settings = load_search_settings()
+
+    analyze.analyze_quality(discovery, settings=settings, budget=budget)
+    calls[0] = 90
+    lean = analyze.analyze_quality(discovery, settings=settings, budget=budget)
+    calls[0] = 100
+    skipped = analyze.analyze_quality(discovery, settings=settings, budget=budget)
+
+    assert probes == [True, False]
+    assert 'not checked: contributors' in lean.reasoning
+    assert skipped.score == 4 and skipped.signal_details['skipped'] == 'API budget'
@@ -0,0 +1,82 @@
+"""
+Tests for the negative file cache and its use by the content search.
+"""
+
+from src import search
+from src.cache import MISSING, RepoFileCache, repo_head
+from src.fetch import FileNotFound, FileTooLarge
+from src.config import load_search_settings
+from src.records import Candidate
+
+
+def make_candidate(last_push='2024-11-25T00:00:00Z'):
+    return Candidate(owner='alice', repo='tools', default_branch='main', last_push=last_push)
+
+
+class FakeFetcher:
+    """Raw fetcher stand-in: README.md exists, CLAUDE.md is huge; counts requests."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_text(self, owner, repo, path, ref, max_bytes):
+        self.calls += 1
+        if path == 'CLAUDE.md':
+            raise FileTooLarge(max_bytes + 1, max_bytes)
+        if path != 'README.md':
+            raise FileNotFound(404, 'Not Found')
+        return 'Run kubectl get pods and tree -L 2'
+
+
+def test_entries_persist_and_invalidate_when_the_head_changes(tmp_path):
+    path = tmp_path / 'repo-files.json'
+    head = repo_head(make_candidate())
+    cache = RepoFileCache(path)
+    cache.record('Alice', 'Tools', head, 'SECURITY.md', MISSING)
+    cache.save()
+
+    reloaded = RepoFileCache(path)
+    assert reloaded.is_missing('alice', 'tools', head, 'SECURITY.md')
+    assert not reloaded.is_missing('alice', 'tools', head, 'README.md')
+
+    pushed = repo_head(make_candidate('2024-12-01T00:00:00Z'))
+    assert not reloaded.is_missing('alice', 'tools', pushed, 'SECURITY.md')
+
+
+def test_concurrent_instances_merge_instead_of_overwriting(tmp_path):
+    path = tmp_path / 'repo-files.json'
+    head = repo_head(make_candidate())
+    first, second = RepoFileCache(path), RepoFileCache(path)
+
+    first.record('alice', 'tools', head, 'SECURITY.md', MISSING)
+    first.record('bob', 'app', 'main@x', 'CLAUDE.md', MISSING)
+    first.save()
+    second.record('alice', 'tools', head, 'AGENTS.md', MISSING)
+    second.record('carol', 'lib', 'main@y', 'README.md', 600_000)
+    second.save()
+
+    merged = RepoFileCache(path)
+    assert merged.is_missing('alice', 'tools', head, 'SECURITY.md')
+    assert merged.is_missing('alice', 'tools', head, 'AGENTS.md')
+    assert merged.is_missing('bob', 'app', 'main@x', 'CLAUDE.md')
+    assert merged.exceeds('carol', 'lib', 'main@y', 'README.md', 500_000)
+    assert list(tmp_path.glob('*.tmp')) == []
+
+
+def test_search_skips_known_missing_and_oversized_files_on_later_runs(tmp_path, monkeypatch):
+    monkeypatch.setattr(search, 'Github', lambda token: None)
+    monkeypatch.setattr(search, 'check_rate_limit', lambda client: None)
+    settings = load_search_settings()
+    cache = RepoFileCache(tmp_path / 'repo-files.json')
+
+    first_fetcher = FakeFetcher()
+    first = search.search_for_discovery_patterns([make_candidate()], settings=settings,
+                                                 file_cache=cache, fetcher=first_fetcher)
+    second_fetcher = FakeFetcher()
+    second = search.search_for_discovery_patterns([make_candidate()], settings=settings,
+                                                  file_cache=cache, fetcher=second_fetcher)
+
+    assert first == second and first[0].markdown_file == 'README.md'
+    assert first[0].file_url == 'https://github.com/alice/tools/blob/main/README.md'
+    assert first_fetcher.calls == len(settings.target_files)
+    assert second_fetcher.calls == 1  # README.md only
@@ -0,0 +1,142 @@
+"""
+Tests for the record-and-replay transport.
+"""
+
+import io
+import json
+
+import pytest
+import requests
+from urllib3.response import HTTPResponse
+
+from src.cassette import RECORD, REPLAY, Cassette, CassetteMiss
+from src.fetch import CHUNK_SIZE, FileTooLarge, RawFetcher
+from src.tokens import PoolToken, TokenPool
+
+
+REPO = {'full_name': 'alice/tools', 'name': 'tools', 'owner': {'login': 'alice'}, 'stargazers_count': 42}
+
+
+class FakeUpstream(requests.adapters.HTTPAdapter):
+    """Builds real streamed responses from canned bodies; counts requests."""
+
+    def __init__(self, bodies):
+        super().__init__()
+        self.bodies = bodies
+        self.sent = 0
+
+    def send(self, request, stream=False, **kwargs):
+        self.sent += 1
+        body = self.bodies[request.path_url.split('?')[0]]
+        raw = HTTPResponse(body=io.BytesIO(body), headers={'Content-Type': 'application/json'},
+                           status=200, preload_content=False)
+        return self.build_response(request, raw)
+
+
+def record(tmp_path, bodies):
+    cassette = Cassette(tmp_path / 'run.jsonl.gz', RECORD)
+    cassette._upstream = FakeUpstream(bodies)
+    return cassette
+
+
+def test_replay_answers_recorded_requests_without_the_network(tmp_path):
+    bodies = {'/repos/alice/tools': json.dumps(REPO).encode(),
+              '/repos/alice/tools/contents/README.md': b'x' * (4 * CHUNK_SIZE)}
+    recorder = record(tmp_path, bodies)
+    session = recorder.mount(requests.Session())
+    fetcher = RawFetcher(session=recorder.mount(requests.Session()))
+
+    recorded = session.get('https://api.github.com/repos/alice/tools').json()
+    with pytest.raises(FileTooLarge):
+        fetcher.fetch_text('alice', 'tools', 'README.md', 'main', max_bytes=100)
+    recorder.save(credentials=['token 1 (...abcd)'])
+
+    # Only what the capped fetch read is stored
+    assert len(recorder.interactions) == 2 and len(recorder.interactions[1]['body']) < 4 * CHUNK_SIZE
+
+    player = Cassette(tmp_path / 'run.jsonl.gz', REPLAY)
+    session = player.mount(requests.Session())
+    fetcher = RawFetcher(session=player.mount(requests.Session()))
+
+    assert session.get('https://api.github.com/repos/alice/tools').json() == recorded
+    with pytest.raises(FileTooLarge):
+        fetcher.fetch_text('alice', 'tools', 'README.md', 'main', max_bytes=100)
+    with pytest.raises(CassetteMiss):
+        session.get('https://api.github.com/repos/alice/other')
+    assert player.misses == 1 and player.credentials == ['token 1 (...abcd)']
+
+
+def test_pygithub_replays_through_the_credential_pool(tmp_path):
+    from github import Github
+
+    recorder = record(tmp_path, {'/repos/alice/tools': json.dumps(REPO).encode()})
+    pool = TokenPool([PoolToken('token 1', token='secret')])
+    recorder.mount(pool.session)
+    pool.install()
+    try:
+        assert Github().get_repo('alice/tools').stargazers_count == 42
+        recorder.save(credentials=[token.label for token in pool.tokens])
+
+        player = Cassette(tmp_path / 'run.jsonl.gz', REPLAY)
+        replay_pool = player.replay_pool()
+        player.mount(replay_pool.session)
+        replay_pool.install()
+        assert Github().get_repo('alice/tools').stargazers_count == 42
+    finally:
+        TokenPool.uninstall()
+
+    assert recorder._upstream.sent == 1
+    assert [token.label for token in replay_pool.tokens] == ['token 1']
+    assert 'secret' not in (tmp_path / 'run.jsonl.gz').read_bytes().decode('latin-1')
+
+
+def test_replay_restores_the_recorded_run_state(tmp_path):
+    state = tmp_path / 'yield-model.json'
+    state.write_text('{"features": {"topic:mcp": [3, 4]}}')
+    recorder = record(tmp_path, {})
+    recorder.snapshot({'YIELD_MODEL_JSON': state, 'CHECKPOINT_JSON': tmp_path / 'missing.json'})
+    recorder.save()
+    state.write_text('{"features": {}}')  # The recorded run learned from its results
+
+    player = Cassette(tmp_path / 'run.jsonl.gz', REPLAY)
+    scratch = tmp_path / 'replay'
+    player.restore({'YIELD_MODEL_JSON': scratch / 'yield-model.json', 'CHECKPOINT_JSON': scratch / 'checkpoint.json'})
+
+    assert (scratch / 'yield-model.json').read_text() == '{"features": {"topic:mcp": [3, 4]}}'
+    assert not (scratch / 'checkpoint.json').exists()
+
+
+def test_replay_writes_reports_outside_the_working_tree(tmp_path, monkeypatch):
+    from src import main as pipeline
+    from src.config import Config
+    from src.records import Candidate, Discovery, QualityResult
+
+    for name in ('YIELD_MODEL_JSON', 'FILE_CACHE_JSON', 'CHECKPOINT_JSON', 'OPT_OUT_JSON'):
+        monkeypatch.setattr(Config, name, tmp_path / 'state' / f"{name.lower()}.json")
+    tracked = {name: tmp_path / f"{name.lower()}.tracked" for name in pipeline.REPLAY_OUTPUTS}
+    for name, path in tracked.items():
+        path.write_text('tracked')
+        monkeypatch.setattr(Config, name, path)
+    record(tmp_path, {}).save()
+
+    candidate = Candidate(owner='alice', repo='tools', default_branch='main')
+    monkeypatch.setattr(TokenPool, 'refresh', lambda self: None)
+    monkeypatch.setattr(pipeline, 'prefilter_tiers', lambda tiers, stats, **kwargs: stats.update(
+        opted_out_skipped=0, api_calls_saved=0) or [candidate])
+    monkeypatch.setattr(pipeline, 'search_for_discovery_patterns', lambda candidates, stats, **kwargs: stats.update(
+        processed=1, clean=[('alice', 'tools')]) or [Discovery(candidate, 'CLAUDE.md', pattern_score=5)])
+    monkeypatch.setattr(pipeline, 'extract_contacts', lambda discovery, **kwargs: [])
+    monkeypatch.setattr(pipeline, 'analyze_quality', lambda discovery, **kwargs: QualityResult(8))
+
+    output = tmp_path / 'replay-output'
+    try:
+        for merge in (False, True):
+            assert pipeline.main(replay=str(tmp_path / 'run.jsonl.gz'), replay_output=str(output), merge=merge) == 0
+    finally:
+        TokenPool.uninstall()
+
+    assert all(path.read_text() == 'tracked' for path in tracked.values())
+    assert {name: getattr(Config, name) for name in tracked} == tracked
+    report = json.loads((output / 'discoveries_json.tracked').read_text())
+    assert [e['repository']['name'] for e in report['discoveries']] == ['tools']
+    assert (output / 'registry_changelog_md.tracked').exists()
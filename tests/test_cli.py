@@ -0,0 +1,70 @@
+"""
+Tests for the discovery command line.
+"""
+
+import subprocess
+import sys
+
+from src import cli
+from src.config import Config
+from src.generate import generate_json_report
+from src.records import Candidate, Discovery, QualityResult
+
+
+HEAVY_MODULES = ('github', 'yaml', 'requests', 'dotenv')
+
+
+def test_quick_commands_do_not_import_pipeline_dependencies():
+    """opt-out check and the site generator stay clear of PyGithub, requests and yaml."""
+    probe = (
+        "import sys\n"
+        "from src import cli, site_generator\n"
+        "cli.main(['opt-out', 'check', 'octocat', 'hello-world'])\n"
+        f"print(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', probe],
+        cwd=Config.PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.splitlines()[-1] == '[]'
+
+
+def test_report_rebuilds_markdown_from_json(tmp_path, capsys):
+    """`discovery report` regenerates DISCOVERIES.md from the JSON report alone."""
+    json_path = tmp_path / 'discoveries.json'
+    md_path = tmp_path / 'DISCOVERIES.md'
+    discovery = Discovery(
+        Candidate(owner='alice', repo='tools', stars=12, language='Go', topics=['ai-native'],
+                  last_push='2024-11-25T00:00:00Z'),
+        markdown_file='CLAUDE.md', file_url='https://github.com/alice/tools/blob/main/CLAUDE.md',
+        patterns_found=['kubectl'], pattern_score=3, quality=QualityResult(8, reasoning='Solid')
+    )
+    generate_json_report([discovery], output_path=json_path, metadata={'tier': 2})
+
+    assert cli.main(['report', '--input', str(json_path), '--output', str(md_path)]) == 0
+
+    markdown = md_path.read_text()
+    assert '[alice/tools](https://github.com/alice/tools)' in markdown
+    assert '- **tier:** 2' in markdown
+    assert 'generated_at' not in markdown
+    assert 'regenerated from 1 discoveries' in capsys.readouterr().out
+
+
+def test_resume_without_checkpoint_is_a_configuration_error(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'CHECKPOINT_JSON', tmp_path / 'missing.json')
+
+    assert cli.main(['resume']) == 1
+
+
+def test_opt_out_changes_land_in_the_tracked_list(tmp_path, monkeypatch):
+    import json
+
+    path = tmp_path / 'opt-out.json'
+    monkeypatch.setattr(Config, 'OPT_OUT_JSON', path)
+
+    assert cli.main(['opt-out', 'add', 'foo', 'bar']) == 0
+    assert [e['repository'] for e in json.loads(path.read_text())['opt_out_repositories']] == ['foo/bar']
+    assert cli.main(['opt-out', 'remove', 'foo', 'bar']) == 0
+    assert json.loads(path.read_text())['opt_out_repositories'] == []
+    assert not (tmp_path / 'opt-out.json.journal').exists()
@@ -0,0 +1,74 @@
+"""
+Tests for configuration loading and validation.
+"""
+
+import sys
+import subprocess
+
+import pytest
+
+from src.config import Config, load_search_settings, parse_search_settings
+
+
+def minimal_config(**overrides):
+    """A valid search_queries.yaml document, with optional overrides."""
+    raw = {
+        'tiers': [{'name': 'ai-native', 'topics': ['ai-native']}],
+        'filters': {'archived': False, 'min_stars': 5},
+        'discovery_patterns': [{'pattern': 'kubectl', 'weight': 3}],
+        'target_files': ['CLAUDE.md'],
+        'quality_weights': {'has_tests': 2}
+    }
+    raw.update(overrides)
+    return raw
+
+
+def test_repository_config_is_valid():
+    """The shipped search_queries.yaml passes validation."""
+    settings = load_search_settings()
+    assert settings.tier(1).topics == ('ai-native',)
+    assert settings.discovery_patterns[0].regex.search('KUBECTL get pods')
+
+
+def test_settings_are_loaded_once_and_immutable():
+    """Repeated loads return the same snapshot, which cannot be mutated."""
+    settings = load_search_settings()
+    assert load_search_settings() is settings
+    with pytest.raises(Exception):
+        settings.target_files = ()
+    with pytest.raises(TypeError):
+        settings.filters['min_stars'] = 0
+
+
+@pytest.mark.parametrize('overrides, message', [
+    ({'tiers': []}, "'tiers'"),
+    ({'filters': {'min_star': 5}}, "unknown filter 'min_star'"),
+    ({'filters': {'fork': 'no'}}, "filter 'fork' must be bool"),
+    ({'discovery_patterns': [{'pattern': 'docker (ps'}]}, 'does not compile'),
+    ({'discovery_patterns': [{'pattern': 'kubectl', 'weight': 0}]}, 'positive weight'),
+    ({'quality_weights': {'has_tests': 'two'}}, "quality weight 'has_tests'"),
+])
+def test_invalid_config_fails_fast(overrides, message):
+    """Misconfiguration raises ValueError naming the problem."""
+    with pytest.raises(ValueError, match=message):
+        parse_search_settings(minimal_config(**overrides))
+
+
+def test_unknown_tier_rejected():
+    settings = parse_search_settings(minimal_config())
+    with pytest.raises(ValueError, match='Invalid tier 2'):
+        settings.tier(2)
+
+
+def test_import_has_no_side_effects():
+    """Importing src.config neither loads .env nor validates the token."""
+    code = (
+        "import sys; import src.config as c; "
+        "assert not c.Config._env_loaded; "
+        "assert 'dotenv' not in sys.modules and 'yaml' not in sys.modules"
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=Config.PROJECT_ROOT, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == ''
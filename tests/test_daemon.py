@@ -0,0 +1,137 @@
+"""
+Tests for the staleness-driven refresh daemon.
+"""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from src import daemon as daemon_module
+from src.daemon import RefreshDaemon, refresh_interval
+from src.records import Candidate, Discovery, QualityResult
+
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp()
+OLD_PUSH = '2024-01-01T00:00:00+00:00'
+
+
+def make_discovery(name, score, last_push=OLD_PUSH):
+    candidate = Candidate(owner='alice', repo=name, stars=1, last_push=last_push)
+    return Discovery(candidate, 'CLAUDE.md', pattern_score=5, quality=QualityResult(score))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = NOW
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeGithub:
+    """get_repo returns a repo whose pushed_at is unchanged unless listed in pushes."""
+
+    def __init__(self, pushes=()):
+        self.pushes = dict(pushes)
+        self.calls = []
+
+    def get_repo(self, name):
+        self.calls.append(name)
+        pushed = self.pushes.get(name, datetime.fromisoformat(OLD_PUSH))
+        return SimpleNamespace(stargazers_count=1, pushed_at=pushed, default_branch='main',
+                               language=None, description=None)
+
+
+def make_daemon(tmp_path, discoveries, github, clock, rebuilds, **kwargs):
+    return RefreshDaemon(discoveries, github, tmp_path / 'refresh-state.json', clock=clock, sleep=clock.sleep,
+                         rebuild=lambda d, m: rebuilds.append(sorted(x.repo for x in d)), **kwargs)
+
+
+def test_high_scoring_active_repos_refresh_more_often():
+    quiet = make_discovery('quiet', 2)
+    busy = make_discovery('busy', 9, last_push='2024-12-30T00:00:00+00:00')
+
+    assert refresh_interval(busy, NOW) < refresh_interval(quiet, NOW) / 2
+
+
+def test_most_stale_first_paced_and_rebuilt_only_on_change(tmp_path, monkeypatch):
+    clock = FakeClock()
+    github = FakeGithub({'alice/strong': datetime(2024, 12, 31, tzinfo=timezone.utc)})
+    rebuilds = []
+    monkeypatch.setattr(daemon_module, 'search_for_discovery_patterns',
+                        lambda candidates, **kwargs: [Discovery(candidates[0], 'README.md', pattern_score=9)])
+    monkeypatch.setattr(daemon_module, 'extract_contacts', lambda d, **kwargs: [])
+    monkeypatch.setattr(daemon_module, 'analyze_quality', lambda d, **kwargs: QualityResult(9))
+
+    daemon = make_daemon(tmp_path, [make_discovery('weak', 1), make_discovery('strong', 8)], github, clock,
+                         rebuilds, calls_per_hour=3600)
+    assert daemon.run(max_checks=2) == 2
+
+    # The stronger repo is staler relative to its shorter interval; one call per second
+    assert github.calls == ['alice/strong', 'alice/weak']
+    assert clock.sleeps == [1, 1]
+    assert rebuilds == [['strong', 'weak']]
+    assert daemon.discoveries['alice/strong'].markdown_file == 'README.md'
+
+    # Both were just checked: the next run sleeps instead of calling the API
+    restarted = make_daemon(tmp_path, list(daemon.discoveries.values()), github, clock, rebuilds)
+    restarted.run(max_checks=0)
+    assert restarted.most_stale(clock())[1] < 1 and len(github.calls) == 2
+
+
+class FailingFetcher:
+    def __init__(self, error):
+        self.error = error
+
+    def fetch_text(self, owner, repo, path, ref, max_bytes):
+        raise self.error
+
+
+def test_failed_rescan_keeps_the_entry_due(tmp_path, monkeypatch):
+    from github import RateLimitExceededException
+    from src import search
+    from src.cache import RepoFileCache
+    from src.fetch import FetchError, FileNotFound
+
+    monkeypatch.setattr(search, 'Github', lambda token: None)
+    monkeypatch.setattr(search, 'check_rate_limit', lambda client: None)
+    clock = FakeClock()
+    github = FakeGithub({'alice/tools': datetime(2024, 12, 31, tzinfo=timezone.utc)})
+    file_cache = RepoFileCache(tmp_path / 'files.json')
+
+    for error in (RateLimitExceededException(403, {'message': 'API rate limit exceeded'}, {}),
+                  FetchError(429, 'Too Many Requests')):
+        daemon = make_daemon(tmp_path, [make_discovery('tools', 6)], github, clock, [],
+                             file_cache=file_cache, fetcher=FailingFetcher(error))
+        assert daemon.check('alice/tools') is False
+        assert 'alice/tools' in daemon.discoveries and 'alice/tools' not in daemon.last_checked
+        assert daemon.discoveries['alice/tools'].candidate.last_push == OLD_PUSH
+
+    # A clean re-scan that finds nothing is conclusive
+    daemon = make_daemon(tmp_path, [make_discovery('tools', 6)], github, clock, [],
+                         file_cache=file_cache, fetcher=FailingFetcher(FileNotFound(404, 'Not Found')))
+    assert daemon.check('alice/tools') is True and not daemon.discoveries
+
+
+def test_server_errors_back_off_without_stopping_the_daemon(tmp_path):
+    from github import GithubException
+
+    class FlakyGithub(FakeGithub):
+        def get_repo(self, name):
+            if len(self.calls) < 2:
+                self.calls.append(name)
+                raise GithubException(502, {'message': 'Bad Gateway'}, {})
+            return super().get_repo(name)
+
+    clock = FakeClock()
+    github = FlakyGithub()
+    daemon = make_daemon(tmp_path, [make_discovery('tools', 6)], github, clock, [], calls_per_hour=3600)
+
+    assert daemon.run(max_checks=1) == 1
+    assert github.calls == ['alice/tools'] * 3
+    assert clock.sleeps[:2] == [10, 20]
+    assert daemon.last_checked['alice/tools'] == NOW + 30
@@ -0,0 +1,52 @@
+"""
+Tests for near-duplicate (template clone) detection.
+"""
+
+import random
+
+from src import analyze
+from src.dedupe import MAX_DISTANCE, hamming, mark_near_duplicates, near_duplicate_clusters, simhash
+from src.extract import extract_contacts
+from src.records import Candidate, Discovery
+
+
+def template_readme(seed, words=300):
+    rng = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(2000)]
+    return ' '.join(rng.choice(vocabulary) for _ in range(words))
+
+
+def test_simhash_is_close_for_clones_and_far_for_unrelated_files():
+    template = template_readme(1)
+    clone = template.replace('word1 ', 'my-project ', 1) + ' Maintained by bob.'
+
+    assert hamming(simhash(template), simhash(clone)) <= MAX_DISTANCE
+    assert hamming(simhash(template), simhash(template_readme(2))) > 10
+    assert simhash('Too short to fingerprint') is None
+
+
+def test_clusters_group_only_near_fingerprints():
+    base = 0x0123456789abcdef
+    fingerprints = [base, base ^ 0b101, None, ~base & (2 ** 64 - 1), base ^ (1 << 63)]
+
+    assert sorted(map(sorted, near_duplicate_clusters(fingerprints))) == [[0, 1, 4]]
+
+
+def test_only_the_representative_is_analyzed(monkeypatch):
+    monkeypatch.setattr(analyze, 'Github', lambda token: (_ for _ in ()).throw(AssertionError('API call')))
+    readme = template_readme(3)
+    discoveries = [
+        Discovery(Candidate(owner=owner, repo='starter', stars=stars), 'README.md', pattern_score=score,
+                  fingerprint=simhash(readme))
+        for owner, stars, score in (('alice', 5, 8), ('bob', 50, 8), ('carol', 1, 4))
+    ]
+
+    assert mark_near_duplicates(discoveries) == 2
+    assert [d.duplicate_of for d in discoveries] == ['bob/starter', None, 'bob/starter']
+
+    clone = discoveries[0]
+    quality = analyze.analyze_quality(clone)
+    assert quality.signal_details['duplicate_of'] == 'bob/starter'
+    assert quality.reasoning.startswith('Near-duplicate of bob/starter')
+    assert [c.value for c in extract_contacts(clone, file_cache=object(), fetcher=object())] == ['alice']
+    assert Discovery.from_dict(clone.to_dict()) == clone
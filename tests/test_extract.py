@@ -36,3 +36,42 @@ def test_privacy_respecting():
     """Test that extraction only uses public information."""
     # TODO: Implement test
     pass
+
+
+def test_batch_extraction_deduplicates_across_documents():
+    """Earlier documents win, ignored emails and bots are dropped, domains are not mentions."""
+    from src.extract import extract_contacts_from_documents
+
+    contacts = extract_contacts_from_documents([
+        ('SECURITY.md', 'Report to Security@Corp.io or noreply@github.com', 'high'),
+        ('package.json', '{"author": "dev@corp.io", "note": "@ignored"}', 'medium'),
+        ('README.md', 'Ask security@corp.io, @Alice, @alice or @dependabot[bot]', 'low'),
+    ])
+
+    assert [(c.type, c.value, c.source_file) for c in contacts] == [
+        ('email', 'security@corp.io', 'SECURITY.md'),
+        ('email', 'dev@corp.io', 'package.json'),
+        ('github', 'Alice', 'README.md'),
+    ]
+
+
+def test_overlong_handles_are_not_truncated_into_usernames():
+    """An @handle longer than GitHub's 39-character limit is no username at all."""
+    from src.extract import extract_contacts_from_documents
+
+    text = f"Thanks @{'a' * 45}, @{'x' * 20}-{'y' * 24}, @{'b' * 39}, @alice- thanks and @bob-"
+    contacts = extract_contacts_from_documents([('README.md', text, 'low')])
+
+    assert [c.value for c in contacts] == ['b' * 39, 'alice', 'bob']
+
+
+def test_adversarial_input_scans_in_linear_time():
+    """Inputs that backtrack quadratically under unbounded patterns stay fast."""
+    import time
+    from src.extract import extract_contacts_from_documents
+
+    start = time.perf_counter()
+    for text in ('a.' * 50_000, 'x@' + 'a.' * 50_000 + '!', ('@a' + '-' * 1000 + '!') * 100):
+        extract_contacts_from_documents([('README.md', text, 'low')])
+
+    assert time.perf_counter() - start < 2
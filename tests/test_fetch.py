@@ -0,0 +1,79 @@
+"""
+Tests for streaming raw file fetches.
+"""
+
+import pytest
+
+from src.fetch import FileNotFound, FileTooLarge, RawFetcher, file_html_url
+
+
+class FakeResponse:
+    """Streaming response stand-in that records how many chunks were read."""
+
+    def __init__(self, status_code=200, chunks=(), headers=None):
+        self.status_code = status_code
+        self.reason = 'Error'
+        self.headers = headers or {}
+        self.chunks = list(chunks)
+        self.chunks_read = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def iter_content(self, chunk_size):
+        for chunk in self.chunks:
+            self.chunks_read += 1
+            yield chunk
+
+
+class FakeSession:
+    def __init__(self, response):
+        self.response = response
+        self.headers = {}
+        self.requests = []
+
+    def get(self, url, **kwargs):
+        self.requests.append((url, kwargs))
+        return self.response
+
+
+def test_raw_text_is_decoded_across_chunk_boundaries():
+    # 'é' is split between two chunks
+    session = FakeSession(FakeResponse(chunks=[b'caf\xc3', b'\xa9 kubectl']))
+    fetcher = RawFetcher('token', session=session)
+
+    assert fetcher.fetch_text('alice', 'tools', 'README.md', 'main', 100) == 'café kubectl'
+    url, kwargs = session.requests[0]
+    assert url == 'https://api.github.com/repos/alice/tools/contents/README.md'
+    assert kwargs['params'] == {'ref': 'main'} and kwargs['stream'] is True
+    assert session.headers['Accept'] == 'application/vnd.github.raw'
+
+
+def test_stream_aborts_once_the_cap_is_passed():
+    response = FakeResponse(chunks=[b'x' * 40] * 10)
+    fetcher = RawFetcher(session=FakeSession(response))
+
+    with pytest.raises(FileTooLarge) as raised:
+        fetcher.fetch_text('alice', 'tools', 'README.md', 'main', 100)
+
+    assert raised.value.size == 120
+    assert response.chunks_read == 3
+
+
+def test_declared_length_over_cap_skips_the_body():
+    response = FakeResponse(chunks=[b'x'], headers={'Content-Length': '5000'})
+
+    with pytest.raises(FileTooLarge):
+        RawFetcher(session=FakeSession(response)).fetch_text('a', 'b', 'README.md', 'main', 100)
+    assert response.chunks_read == 0
+
+
+def test_missing_file_and_browser_url():
+    with pytest.raises(FileNotFound):
+        RawFetcher(session=FakeSession(FakeResponse(status_code=404))).fetch_text('a', 'b', 'X.md', 'main', 100)
+
+    assert file_html_url('alice', 'tools', 'docs/A B.md', 'main') == \
+        'https://github.com/alice/tools/blob/main/docs/A%20B.md'
@@ -0,0 +1,135 @@
+"""
+Tests for opt-out management.
+"""
+
+import json
+
+from src import opt_manager
+from src.opt_manager import OptOutManager
+
+
+def write_discoveries(path, names):
+    """Write a minimal discoveries.json with the given owner/name pairs."""
+    report = {
+        'metadata': {},
+        'discoveries': [
+            {'repository': {'owner': owner, 'name': name}} for owner, name in names
+        ]
+    }
+    path.write_text(json.dumps(report))
+
+
+def test_owner_wildcard_and_case_insensitive_lookup(tmp_path):
+    """Owner-wide entries cover every repository; lookups ignore case."""
+    manager = OptOutManager(tmp_path / 'opt-out.json')
+    manager.add_opt_out('Alice', '*', 'owner request')
+    manager.add_opt_out('bob', 'Tools')
+
+    assert manager.is_opted_out('alice', 'anything')
+    assert manager.is_opted_out('BOB', 'tools')
+    assert not manager.is_opted_out('bob', 'other')
+    assert not manager.add_opt_out('alice', '*')
+
+    assert manager.remove_opt_out('alice', '*')
+    assert not manager.is_opted_out('alice', 'anything')
+
+
+def test_journal_is_replayed_by_other_instances(tmp_path):
+    """Updates are appended to the journal and visible to a fresh or existing manager."""
+    path = tmp_path / 'opt-out.json'
+    writer = OptOutManager(path)
+    reader = OptOutManager(path)
+
+    writer.add_opt_out('alice', 'one')
+    writer.add_opt_out('bob', 'two')
+    writer.remove_opt_out('alice', 'one')
+
+    assert not path.exists()  # Nothing compacted yet
+    assert len((tmp_path / 'opt-out.json.journal').read_text().splitlines()) == 3
+    assert OptOutManager(path).list_opted_out() == ['bob/two']
+
+    # An existing instance catches up before its next write
+    assert not reader.add_opt_out('bob', 'two')
+
+
+def test_compaction_folds_journal_into_snapshot(tmp_path, monkeypatch):
+    """Reaching the threshold rewrites opt-out.json and truncates the journal."""
+    monkeypatch.setattr(opt_manager, 'COMPACT_THRESHOLD', 3)
+    path = tmp_path / 'opt-out.json'
+    manager = OptOutManager(path)
+    for name in ('c', 'a', 'b'):
+        manager.add_opt_out('owner', name)
+
+    assert not (tmp_path / 'opt-out.json.journal').exists()
+    snapshot = json.loads(path.read_text())
+    assert [e['repository'] for e in snapshot['opt_out_repositories']] == ['owner/a', 'owner/b', 'owner/c']
+    assert OptOutManager(path).is_opted_out('owner', 'b')
+
+
+def test_filter_discoveries(tmp_path):
+    """Opted-out repositories, including owner-wide entries, are removed."""
+    discoveries_file = tmp_path / 'discoveries.json'
+    write_discoveries(discoveries_file, [('alice', 'one'), ('alice', 'two'), ('bob', 'three'), ('carol', 'four')])
+    manager = OptOutManager(tmp_path / 'opt-out.json')
+    manager.add_opt_out('alice', '*')
+    manager.add_opt_out('bob', 'three')
+
+    manager.filter_discoveries(discoveries_file, discoveries_file)
+
+    remaining = json.loads(discoveries_file.read_text())['discoveries']
+    assert [d['repository']['name'] for d in remaining] == ['four']
+
+
+def test_long_lived_reader_follows_another_writers_compaction(tmp_path, monkeypatch):
+    """A compaction elsewhere makes an existing instance reload the snapshot."""
+    monkeypatch.setattr(opt_manager, 'COMPACT_THRESHOLD', 3)
+    path = tmp_path / 'opt-out.json'
+    writer = OptOutManager(path)
+    reader = OptOutManager(path)
+
+    writer.add_opt_out('o', 'r0')
+    reader.refresh()
+    assert reader.is_opted_out('o', 'r0')
+
+    # Compacts into opt-out.json; the new journal then grows past the reader's old offset
+    writer.add_opt_out('o', 'r1')
+    writer.add_opt_out('o', 'r2')
+    for i in range(3, 5):
+        writer.add_opt_out('o', f"long-repository-name-{i}")
+    writer.remove_opt_out('o', 'r1')
+
+    reader.refresh()
+    fresh = OptOutManager(path)
+    assert reader.list_opted_out() and sorted(reader.list_opted_out()) == sorted(fresh.list_opted_out())
+    assert reader.is_opted_out('o', 'r0') and reader.is_opted_out('o', 'r2')
+    assert not reader.is_opted_out('o', 'r1')
+
+    # Journal gone entirely after a compaction: still reloads
+    writer.compact()
+    writer.add_opt_out('o', 'r5')
+    writer.compact()
+    reader.refresh()
+    assert reader.is_opted_out('o', 'r5') and reader.is_opted_out('o', 'r0')
+
+
+def test_cli_changes_are_published_to_the_snapshot(tmp_path, monkeypatch):
+    """add/remove from the command line leave no journal behind."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr('sys.argv', ['opt_manager.py', 'add', 'alice', 'tools', 'request'])
+    opt_manager.main()
+
+    assert not (tmp_path / 'opt-out.json.journal').exists()
+    snapshot = json.loads((tmp_path / 'opt-out.json').read_text())
+    assert [e['repository'] for e in snapshot['opt_out_repositories']] == ['alice/tools']
+
+
+def test_published_changes_skip_the_journal(tmp_path):
+    """publish=True folds a change into opt-out.json at once."""
+    path = tmp_path / 'opt-out.json'
+    manager = OptOutManager(path)
+    manager.add_opt_out('alice', 'one', publish=True)
+    manager.add_opt_out('bob', 'two', publish=True)
+    manager.remove_opt_out('alice', 'one', publish=True)
+
+    assert not (tmp_path / 'opt-out.json.journal').exists()
+    assert [e['repository'] for e in json.loads(path.read_text())['opt_out_repositories']] == ['bob/two']
@@ -0,0 +1,107 @@
+"""
+Tests for topic pre-filtering.
+"""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from src import prefilter
+from src.config import load_search_settings
+from src.opt_manager import OptOutManager
+
+
+class FakeRepo:
+    """Search result stand-in that counts per-repo API calls."""
+
+    calls = 0
+
+    def __init__(self, owner, name, stars=10):
+        self.owner = SimpleNamespace(login=owner)
+        self.name = name
+        self.html_url = f"https://github.com/{owner}/{name}"
+        self.stargazers_count = stars
+        self.pushed_at = datetime(2024, 11, 1, tzinfo=timezone.utc)
+        self.language = 'Python'
+        self.description = 'A repository'
+        self.default_branch = 'main'
+
+    def get_topics(self):
+        FakeRepo.calls += 1
+        return ['ai-native']
+
+
+class FakeResults(list):
+    @property
+    def totalCount(self):
+        return len(self)
+
+
+class FakeGithub:
+    """Github client stand-in returning fixed search results."""
+
+    results = []
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def search_repositories(self, query):
+        return FakeResults(self.results)
+
+    def get_rate_limit(self):
+        bucket = SimpleNamespace(remaining=30, limit=30, reset=None)
+        return SimpleNamespace(search=bucket, core=bucket)
+
+
+def test_opted_out_repos_are_pruned_before_api_calls(tmp_path, monkeypatch):
+    """Opted-out search results never reach a per-repo call and are counted as savings."""
+    monkeypatch.setattr(prefilter, 'Github', FakeGithub)
+    FakeGithub.results = [FakeRepo('alice', 'one'), FakeRepo('bob', 'two'), FakeRepo('bob', 'three')]
+    FakeRepo.calls = 0
+    opt_out = OptOutManager(tmp_path / 'opt-out.json')
+    opt_out.add_opt_out('bob', '*')
+
+    stats = {}
+    candidates = prefilter.prefilter_by_topics(tier=1, opt_out=opt_out, stats=stats)
+
+    assert [c.repo for c in candidates] == ['one']
+    assert FakeRepo.calls == 1
+    target_files = len(load_search_settings().target_files)
+    assert stats == {
+        'opted_out_skipped': 2,
+        'api_calls_saved': 2 * prefilter.estimate_calls_per_candidate(target_files)
+    }
+
+
+class TopicGithub(FakeGithub):
+    """Github stand-in whose results depend on the searched topic."""
+
+    by_topic = {}
+    queries = []
+
+    def search_repositories(self, query):
+        TopicGithub.queries.append(query)
+        topic = query.split()[0].split(':', 1)[1]
+        return FakeResults(self.by_topic.get(topic, []))
+
+
+def test_multi_tier_run_merges_and_tags_candidates(monkeypatch):
+    """Shared topics are searched once and each repo is fetched once, tagged with every tier."""
+    monkeypatch.setattr(prefilter, 'Github', TopicGithub)
+    shared = FakeRepo('carol', 'platform')
+    TopicGithub.by_topic = {
+        'devcontainer': [FakeRepo('alice', 'env'), shared],
+        'kubernetes': [shared, FakeRepo('bob', 'cluster')],
+        'microservices': [FakeRepo('bob', 'cluster')],
+    }
+    TopicGithub.queries = []
+    FakeRepo.calls = 0
+
+    candidates = prefilter.prefilter_tiers([3, 4], settings=load_search_settings())
+
+    assert [(c.owner, c.repo, c.tiers) for c in candidates] == [
+        ('alice', 'env', (3,)),
+        ('carol', 'platform', (3, 4)),
+        ('bob', 'cluster', (3, 4)),
+    ]
+    assert FakeRepo.calls == 3
+    assert sum('topic:kubernetes' in q for q in TopicGithub.queries) == 1
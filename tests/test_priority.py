@@ -0,0 +1,67 @@
+"""
+Tests for predicted-yield candidate prioritization.
+"""
+
+from datetime import datetime, timezone
+
+from src.priority import YieldModel, prioritize
+from src.records import Candidate
+
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def make_candidate(name, stars=10, language='Python', topics=(), description='', last_push='2024-12-20T00:00:00+00:00'):
+    return Candidate(owner='owner', repo=name, stars=stars, language=language, topics=topics,
+                     description=description, last_push=last_push)
+
+
+def test_cold_start_prefers_popular_recent_ai_repos(tmp_path):
+    model = YieldModel(tmp_path / 'yield-model.json')
+    candidates = [
+        make_candidate('stale', stars=10, last_push='2020-01-01T00:00:00+00:00'),
+        make_candidate('agent', stars=10, description='An LLM agent platform'),
+        make_candidate('popular', stars=5000, last_push='2020-01-01T00:00:00+00:00'),
+    ]
+
+    ordered = prioritize(candidates, model, now=NOW)
+
+    assert [c.repo for c in ordered] == ['popular', 'agent', 'stale']
+    assert all(c.predicted_yield is not None for c in ordered)
+
+
+def test_learned_hit_rates_reorder_and_persist(tmp_path):
+    path = tmp_path / 'yield-model.json'
+    model = YieldModel(path)
+    for i in range(20):
+        model.record(make_candidate(f'go-{i}', language='Go'), hit=True, now=NOW)
+        model.record(make_candidate(f'js-{i}', language='JavaScript'), hit=False, now=NOW)
+    model.save()
+
+    reloaded = YieldModel(path)
+    ordered = prioritize([make_candidate('js', language='JavaScript'), make_candidate('go', language='Go')],
+                         reloaded, now=NOW)
+
+    assert reloaded.trials == 40 and reloaded.hits == 20
+    assert [c.repo for c in ordered] == ['go', 'js']
+
+
+def test_description_vocabulary_is_bounded(tmp_path):
+    path = tmp_path / 'yield-model.json'
+    model = YieldModel(path)
+    for i in range(50):
+        model.record(make_candidate(f'r{i}', description=f'An llm agent for project{i} widgets{i}'), hit=True, now=NOW)
+
+    words = sorted(feature for feature in model.features if feature.startswith('word:'))
+    assert words == ['word:agent', 'word:llm']
+
+
+def test_search_outcomes_skip_inconclusive_candidates(tmp_path):
+    from src.records import Discovery
+
+    model = YieldModel(tmp_path / 'yield-model.json')
+    hit, miss, failed = (make_candidate(name, language=name) for name in ('hit', 'miss', 'failed'))
+    model.record_search([hit, miss, failed], [Discovery(hit, 'CLAUDE.md')], [('owner', 'miss')], now=NOW)
+
+    assert model.trials == 2 and model.hits == 1
+    assert 'language:failed' not in model.features
@@ -0,0 +1,43 @@
+"""
+Tests for the per-stage run profiler.
+"""
+
+import json
+import time
+
+import github.Requester
+
+from src import profiling
+from src.profiling import RunProfiler, repo_from_url, timed
+
+
+def test_repo_from_url():
+    assert repo_from_url('/repos/alice/tools/contents/README.md?ref=main') == 'alice/tools'
+    assert repo_from_url('/search/repositories?q=topic:k8s') is None
+
+
+def test_profile_splits_time_per_stage_and_repository(tmp_path):
+    profiler = RunProfiler(tmp_path, sample_interval=0.001).start()
+    try:
+        with profiler.stage('search'):
+            with timed('network', 'alice/tools'):
+                time.sleep(0.02)
+            # PyGithub decodes right after its request: charged to the same repo
+            github.Requester.json.loads('{"a": 1}')
+            with timed('regex', 'bob/app'):
+                pass
+        with profiler.stage('report'), timed('render'):
+            pass
+    finally:
+        profiler.stop()
+    paths = profiler.write()
+
+    assert github.Requester.json is json and profiling._active is None
+    report = json.loads(paths['json'].read_text())
+    assert list(report['stages']) == ['search', 'report', 'total']
+    assert report['repos']['alice/tools']['network'] >= 0.02
+    assert report['repos']['alice/tools']['json_decode'] > 0
+    assert set(report['repos']) == {'alice/tools', 'bob/app', profiling.RUN_ROW}
+    assert (tmp_path / 'stage-1-search.prof').exists() and (tmp_path / 'stage-2-report.prof').exists()
+    assert any(line.startswith('search;') for line in paths['flamegraph'].read_text().splitlines())
+
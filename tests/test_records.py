@@ -0,0 +1,48 @@
+"""
+Tests for the slotted pipeline records.
+"""
+
+import pytest
+
+from src.records import Candidate, Contact, Discovery, QualityResult
+
+
+def make_discovery():
+    candidate = Candidate(owner='alice', repo='tools', stars=12, topics=['ai-native'], language='Go',
+                          last_push='2024-11-25T00:00:00Z', tiers=(1, 3))
+    return Discovery(
+        candidate, markdown_file='CLAUDE.md', file_url='https://github.com/alice/tools/blob/main/CLAUDE.md',
+        patterns_found=['kubectl'], pattern_score=3,
+        contacts=[Contact('email', 'dev@alice.io', 'SECURITY.md', 'high')],
+        quality=QualityResult(8, ['has_ci_cd'], {'ci_cd': '.github'}, {'ci_cd': '.github'}, 'Solid')
+    )
+
+
+def test_report_entry_roundtrips():
+    discovery = make_discovery()
+    entry = discovery.to_dict()
+
+    assert entry['repository']['name'] == 'tools' and entry['repository']['tiers'] == [1, 3]
+    assert Discovery.from_dict(entry) == discovery
+
+
+def test_branch_and_description_survive_the_report():
+    candidate = Candidate(owner='alice', repo='legacy', description='Old tools', default_branch='master')
+    restored = Discovery.from_dict(Discovery(candidate, 'README.md').to_dict()).candidate
+
+    assert restored.default_branch == 'master' and restored.description == 'Old tools'
+
+
+def test_records_have_no_instance_dict_and_share_interned_strings():
+    first, second = make_discovery(), make_discovery()
+
+    with pytest.raises(AttributeError):
+        first.candidate.extra = 1
+    assert first.candidate.language is second.candidate.language
+    assert first.patterns_found[0] is second.patterns_found[0]
+
+
+def test_url_is_derived_unless_it_differs():
+    assert Candidate('alice', 'tools', url='https://github.com/alice/tools')._url is None
+    assert Candidate('alice', 'tools').url == 'https://github.com/alice/tools'
+    assert Candidate('alice', 'tools', url='https://example.com/x').url == 'https://example.com/x'
@@ -0,0 +1,81 @@
+"""
+Tests for merging run results into the cumulative registry.
+"""
+
+import json
+
+from src.config import Config
+from src.records import Candidate, Discovery, QualityResult
+from src.registry import merge_into_registry, merge_registry, registry_key
+
+
+def make_discovery(repo, score=5, patterns=('kubectl',), stars=1):
+    return Discovery(Candidate(owner='alice', repo=repo, stars=stars), 'CLAUDE.md', patterns_found=patterns,
+                     pattern_score=5, quality=QualityResult(score))
+
+
+class FakeOptOut:
+    def __init__(self, *repos):
+        self.repos = set(repos)
+
+    def is_opted_out(self, owner, repo):
+        return repo in self.repos
+
+
+def test_sorted_merge_updates_inserts_and_removes_by_key():
+    existing = [make_discovery(name) for name in ('delta', 'alpha', 'charlie', 'echo')]
+    results = [make_discovery('bravo'), make_discovery('alpha', score=8), make_discovery('Delta', stars=99)]
+    scanned = [registry_key(d) for d in results] + [('alice', 'charlie')]
+
+    merged, changes = merge_registry(existing, results, scanned=scanned, opt_out=FakeOptOut('echo'))
+
+    assert [d.repo for d in merged] == ['alpha', 'bravo', 'Delta']
+    assert [d.repo for d in changes['new']] == ['bravo']
+    # A star count drifting is an update, not a change worth logging
+    assert [(new.score, old.score) for new, old in changes['changed']] == [(8, 5)]
+    assert [d.repo for d in changes['removed']] == ['charlie', 'echo']
+
+
+def test_merges_accumulate_in_the_registry_and_changelog(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'DISCOVERIES_JSON', tmp_path / 'discoveries.json')
+    monkeypatch.setattr(Config, 'DISCOVERIES_MD', tmp_path / 'DISCOVERIES.md')
+    monkeypatch.setattr(Config, 'REGISTRY_CHANGELOG_MD', tmp_path / 'REGISTRY_CHANGES.md')
+
+    merge_into_registry([make_discovery('one')], metadata={'tier': 1})
+    paths = merge_into_registry([make_discovery('two', score=7)], metadata={'tier': 3})
+
+    report = json.loads((tmp_path / 'discoveries.json').read_text())
+    assert [e['repository']['name'] for e in report['discoveries']] == ['two', 'one']
+    assert report['metadata']['registry_tiers'] == '1,3'
+    assert report['metadata']['last_merge'] == {'new': 1, 'changed': 0, 'removed': 0}
+
+    changelog = open(paths['changelog']).read()
+    assert changelog.startswith('# Registry Changes\n\n## ')
+    assert changelog.index('alice/two (score 7)') < changelog.index('alice/one (score 5)')
+    assert changelog.count('# Registry Changes') == 1
+
+
+def test_entries_whose_rescan_failed_are_not_removed(tmp_path, monkeypatch):
+    from src import search
+    from src.cache import RepoFileCache
+    from src.fetch import FetchError, FileNotFound
+
+    class FlakyFetcher:
+        """alpha has no target files; bravo's fetches fail."""
+
+        def fetch_text(self, owner, repo, path, ref, max_bytes):
+            if repo == 'bravo':
+                raise FetchError(502, 'Bad Gateway')
+            raise FileNotFound(404, 'Not Found')
+
+    monkeypatch.setattr(search, 'Github', lambda token: None)
+    monkeypatch.setattr(search, 'check_rate_limit', lambda client: None)
+    stats = {}
+    candidates = [Candidate(owner='alice', repo=name, default_branch='main') for name in ('alpha', 'bravo')]
+    search.search_for_discovery_patterns(candidates, stats=stats, fetcher=FlakyFetcher(),
+                                         file_cache=RepoFileCache(tmp_path / 'files.json'))
+
+    assert stats['processed'] == 2 and stats['clean'] == [('alice', 'alpha')]
+    merged, changes = merge_registry([make_discovery('alpha'), make_discovery('bravo')], [],
+                                     scanned=stats['clean'])
+    assert [d.repo for d in merged] == ['bravo'] and [d.repo for d in changes['removed']] == ['alpha']
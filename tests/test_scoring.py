@@ -0,0 +1,70 @@
+"""
+Tests for quality scoring from raw signals.
+"""
+
+import random
+
+import pytest
+
+from src.config import load_search_settings, parse_search_settings
+from src.records import QualityResult
+from src.scoring import quality_from_signals, rescore, score_matrix, score_signals, signal_matrix
+
+
+def make_signals(**overrides):
+    signals = {
+        'ci_cd': '.github', 'tests': 'tests', 'docker': True, 'kubernetes': True,
+        'devcontainer': False, 'container_configs': ['Dockerfile', 'Tiltfile'],
+        'pattern_score': 15, 'days_since_push': 3, 'contributors': 4,
+        'related_repos': 5, 'related_sample': ['a-service']
+    }
+    signals.update(overrides)
+    return signals
+
+
+def test_default_weights_reproduce_original_points():
+    """2 CI + 2 tests + 1 docker + 2 k8s + 1.5 depth + 1 recent + 1 contributors + 3 repos, capped."""
+    weights = load_search_settings().quality_weights
+    bare = make_signals(ci_cd=None, tests=None, docker=False, kubernetes=False,
+                        days_since_push=90, contributors=1, related_repos=0)
+
+    assert score_signals(make_signals(), weights) == 10
+    assert score_signals(bare, weights) == 1
+    assert score_signals({**bare, 'pattern_score': 30}, weights) == 3
+
+    quality = quality_from_signals(make_signals(pattern_score=4, related_repos=0), weights)
+    assert quality.signals_found == ('has_ci_cd', 'has_tests', 'has_docker', 'has_kubernetes',
+                                     'recent_commits', 'multiple_contributors')
+    assert quality.reasoning.startswith('High-quality peer: CI/CD via .github')
+
+
+def test_vectorized_scores_match_scalar_scores():
+    rng = random.Random(1)
+    signals = [
+        make_signals(ci_cd=rng.choice([None, 'x']), pattern_score=rng.randrange(40),
+                     days_since_push=rng.randrange(60), related_repos=rng.randrange(5))
+        for _ in range(500)
+    ]
+    weights = {'has_ci_cd': 1.5, 'discovery_pattern_depth': 4, 'recent_commits': 2, 'multiple_repos': 0.5}
+
+    assert score_matrix(signal_matrix(signals), weights).tolist() == [score_signals(s, weights) for s in signals]
+
+
+def test_rescore_updates_scores_and_reasoning_in_place():
+    weights = load_search_settings().quality_weights
+    qualities = [quality_from_signals(make_signals(), weights), QualityResult(4, ['pattern_only'])]
+
+    changed = rescore(qualities, {'has_tests': 5})
+
+    assert changed == 1
+    assert qualities[0].score == 5
+    assert qualities[0].reasoning.startswith('Medium-quality:')
+    assert qualities[1].score == 4
+
+
+def test_unknown_quality_weight_is_rejected():
+    raw = {'tiers': [{'topics': ['ai-native']}], 'discovery_patterns': [{'pattern': 'kubectl'}],
+           'quality_weights': {'has_ci': 2}}
+
+    with pytest.raises(ValueError, match="unknown quality weight 'has_ci'"):
+        parse_search_settings(raw)
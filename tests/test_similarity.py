@@ -0,0 +1,50 @@
+"""
+Tests for MinHash/LSH similar-peer lookup.
+"""
+
+import json
+
+from src.generate import generate_json_report
+from src.records import Candidate, Discovery, QualityResult
+from src.similarity import SimilarityIndex, feature_set
+from src.site_generator import repo_page_context
+
+
+def make_discovery(name, patterns, topics, language='Python', markdown_file='CLAUDE.md', containers=True):
+    candidate = Candidate(owner='alice', repo=name, topics=topics, language=language)
+    signals = {'container_configs': ['Dockerfile', 'Tiltfile'], 'ci_cd': '.github', 'tests': 'tests'}
+    return Discovery(candidate, markdown_file, patterns_found=patterns, pattern_score=5,
+                     quality=QualityResult(6, signals=signals if containers else {}))
+
+
+def test_feature_set_covers_patterns_topics_and_files():
+    features = feature_set(make_discovery('a', ['kubectl'], ['k8s']))
+
+    assert features == {'pattern:kubectl', 'topic:k8s', 'language:Python', 'file:CLAUDE.md',
+                        'file:Dockerfile', 'file:Tiltfile', 'file:.github', 'file:tests/'}
+
+
+def test_index_finds_near_duplicates_without_comparing_everything():
+    sets = [{f"pattern:{n}" for n in range(i, i + 10)} for i in range(0, 500, 10)]
+    sets.append(set(sets[0]) | {'topic:extra'})
+    index = SimilarityIndex(sets)
+
+    assert [j for j, _ in index.query(len(sets) - 1)] == [0]
+    assert len(index.candidates(0)) < len(sets) // 10
+    assert index.query(0)[0][1] > 0.7
+
+
+def test_similar_peers_reach_the_report_and_the_site(tmp_path):
+    discoveries = [
+        make_discovery('api', ['kubectl', 'tree -', 'docker'], ['k8s', 'microservices']),
+        make_discovery('web', ['kubectl', 'tree -', 'docker'], ['k8s', 'microservices']),
+        make_discovery('notes', ['ls -la'], ['obsidian'], language='Markdown', markdown_file='README.md',
+                       containers=False),
+    ]
+    path = tmp_path / 'discoveries.json'
+    generate_json_report(discoveries, output_path=path)
+    entries = {e['repository']['name']: e for e in json.loads(path.read_text())['discoveries']}
+
+    assert entries['api']['similar'] == [{'owner': 'alice', 'name': 'web', 'similarity': 1.0}]
+    assert entries['notes']['similar'] == []
+    assert 'href="../../repos/alice/web.html"' in repo_page_context(entries['api'])['similar_html']
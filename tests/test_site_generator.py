@@ -0,0 +1,209 @@
+"""
+Tests for static site generation.
+"""
+
+import gzip
+import json
+import shutil
+from pathlib import Path
+
+from src.site_generator import (
+    build_search_index,
+    decode_discoveries,
+    encode_discoveries,
+    generate_discoveries_data,
+    generate_site,
+)
+
+TEMPLATES_DIR = Path(__file__).parent.parent / 'templates'
+
+
+
+def make_discovery(owner, name, language='Python', patterns=None, score=7):
+    """Build a discovery in the discoveries.json schema."""
+    url = f"https://github.com/{owner}/{name}"
+    return {
+        'repository': {
+            'owner': owner,
+            'name': name,
+            'url': url,
+            'stars': 10,
+            'language': language,
+            'topics': ['ai-native'],
+            'last_push': '2024-11-25T00:00:00Z'
+        },
+        'discovery': {
+            'markdown_file': 'CLAUDE.md',
+            'file_url': f"{url}/blob/main/CLAUDE.md",
+            'patterns_found': patterns if patterns is not None else ['kubectl', 'tree -'],
+            'pattern_score': 5
+        },
+        'contacts': [
+            {'type': 'github', 'value': owner, 'source_file': 'README.md', 'confidence': 'low'},
+            {'type': 'email', 'value': f"{owner}@mail.dev", 'source_file': 'SECURITY.md', 'confidence': 'high'}
+        ],
+        'quality': {
+            'score': score,
+            'signals_found': ['has_tests'],
+            'signal_details': {'tests': 'tests'},
+            'reasoning': 'High-quality peer: tests in tests/'
+        }
+    }
+
+
+def test_encode_decode_roundtrip():
+    """Encoding then decoding preserves every field the site renders."""
+    discoveries = [
+        make_discovery('alice', 'one'),
+        make_discovery('bob', 'two', language=None, patterns=[]),
+        make_discovery('carol', 'three', language='Go', patterns=['kubectl']),
+    ]
+    discoveries[2]['repository']['url'] = 'https://example.com/carol/three'
+
+    tables, chunks = encode_discoveries(discoveries, chunk_size=2)
+    decoded = decode_discoveries(tables, chunks)
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    for original, result in zip(discoveries, decoded):
+        assert result['repository'] == {
+            key: original['repository'][key]
+            for key in ('owner', 'name', 'url', 'stars', 'language')
+        }
+        assert result['discovery']['patterns_found'] == original['discovery']['patterns_found']
+        assert result['quality']['score'] == original['quality']['score']
+    assert decoded[0]['details_url'] == 'repos/alice/one.html'
+
+
+def test_encode_shares_repeated_strings():
+    """Repeated patterns and languages are stored once in the tables."""
+    discoveries = [make_discovery(f"owner{i}", 'repo') for i in range(50)]
+
+    tables, _ = encode_discoveries(discoveries)
+
+    assert tables['patterns'] == ['kubectl', 'tree -']
+    assert tables['languages'] == ['Python']
+
+
+def test_generate_discoveries_data_writes_chunks(tmp_path):
+    """Chunks, manifest and compressed variants are written and stale chunks removed."""
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    (data_dir / 'discoveries-0099.json').write_text('[]')
+
+    discoveries = [make_discovery(f"owner{i}", 'repo') for i in range(5)]
+    manifest = generate_discoveries_data(discoveries, tmp_path, '2024-01-01T00:00:00Z', chunk_size=2)
+
+    assert manifest['total'] == 5
+    assert manifest['chunks'] == [
+        'data/discoveries-0000.json',
+        'data/discoveries-0001.json',
+        'data/discoveries-0002.json',
+    ]
+    assert not (data_dir / 'discoveries-0099.json').exists()
+
+    raw = (tmp_path / 'data' / 'discoveries-0000.json').read_bytes()
+    assert gzip.decompress((tmp_path / 'data' / 'discoveries-0000.json.gz').read_bytes()) == raw
+    assert len(json.loads(raw)) == 2
+
+    manifest_js = (tmp_path / 'discoveries-manifest.js').read_text()
+    assert manifest_js.splitlines()[-1].startswith('const discoveriesManifest = {')
+
+
+def test_search_index_postings():
+    """Postings are delta-encoded discovery positions and never span fields."""
+    discoveries = [
+        make_discovery('alice', 'kube-tools', patterns=['kubectl']),
+        make_discovery('bob', 'docs', patterns=['tree -']),
+        make_discovery('kubert', 'app', patterns=[]),
+    ]
+
+    index = build_search_index(discoveries)
+
+    def ids(gram):
+        result, current = [], 0
+        for delta in index['grams'].get(gram, []):
+            current += delta
+            result.append(current)
+        return result
+
+    assert index['n'] == 3
+    assert ids('kub') == [0, 2]
+    assert ids('tre') == [1]
+    assert ids('bdo') == []  # owner "bob" + name "docs" spans two fields
+
+
+def test_generate_site_rebuilds_only_changed_outputs(tmp_path, monkeypatch):
+    """A second build is a no-op; a template edit rebuilds only its page."""
+    monkeypatch.chdir(tmp_path)
+    shutil.copytree(TEMPLATES_DIR, tmp_path / 'templates')
+    report = {
+        'metadata': {'generated_at': '2024-11-25T02:57:57.045463Z'},
+        'discoveries': [make_discovery('alice', 'one'), make_discovery('bob', 'two', score=3)]
+    }
+    (tmp_path / 'discoveries.json').write_text(json.dumps(report))
+
+    first = generate_site()
+    assert 'discoveries-data' in first and 'index.html' in first
+    index_html = (tmp_path / 'site' / 'index.html').read_text()
+    assert '2024-11-25 02:57 UTC' in index_html
+
+    assert generate_site() == []
+
+    with open(tmp_path / 'templates' / 'style.css', 'a') as f:
+        f.write('\n/* tweak */\n')
+    assert generate_site() == ['style.css']
+
+    (tmp_path / 'site' / 'index.html').unlink()
+    assert generate_site() == ['index.html']
+
+
+def test_repo_pages_track_registry(tmp_path, monkeypatch):
+    """Detail pages are escaped, re-rendered only when their record changes, and pruned."""
+    monkeypatch.chdir(tmp_path)
+    shutil.copytree(TEMPLATES_DIR, tmp_path / 'templates')
+    alice = make_discovery('alice', 'one')
+    alice['quality']['reasoning'] = 'Uses <script> tags'
+    report = {'metadata': {}, 'discoveries': [alice, make_discovery('bob', 'two')]}
+    (tmp_path / 'discoveries.json').write_text(json.dumps(report))
+
+    generate_site()
+    page = (tmp_path / 'site' / 'repos' / 'alice' / 'one.html').read_text()
+    assert 'Uses &lt;script&gt; tags' in page
+    assert 'alice@mail.dev' in page
+    bob_page = tmp_path / 'site' / 'repos' / 'bob' / 'two.html'
+    bob_mtime = bob_page.stat().st_mtime_ns
+
+    alice['quality']['score'] = 9
+    (tmp_path / 'discoveries.json').write_text(json.dumps(report))
+    assert 'repo-pages' in generate_site()
+    assert 'High Quality 9/10' in (tmp_path / 'site' / 'repos' / 'alice' / 'one.html').read_text()
+    assert bob_page.stat().st_mtime_ns == bob_mtime
+
+    # Deleted or hand-edited pages are rebuilt though the inputs are unchanged
+    bob_html = bob_page.read_text()
+    bob_page.write_text('edited')
+    (tmp_path / 'site' / 'repos' / 'alice' / 'one.html').unlink()
+    assert generate_site() == ['repo-pages']
+    assert bob_page.read_text() == bob_html
+    assert (tmp_path / 'site' / 'repos' / 'alice' / 'one.html').exists()
+
+    report['discoveries'] = [alice]
+    (tmp_path / 'discoveries.json').write_text(json.dumps(report))
+    generate_site()
+    assert not bob_page.exists()
+
+
+def test_orphan_pages_are_removed_without_a_build_manifest(tmp_path, monkeypatch):
+    """A fresh clone has committed pages but no manifest; orphans still go."""
+    monkeypatch.chdir(tmp_path)
+    shutil.copytree(TEMPLATES_DIR, tmp_path / 'templates')
+    orphan = tmp_path / 'site' / 'repos' / 'bob' / 'two.html'
+    orphan.parent.mkdir(parents=True)
+    orphan.write_text('<html>opted out</html>')
+    report = {'metadata': {}, 'discoveries': [make_discovery('alice', 'one')]}
+    (tmp_path / 'discoveries.json').write_text(json.dumps(report))
+
+    generate_site()
+
+    assert (tmp_path / 'site' / 'repos' / 'alice' / 'one.html').exists()
+    assert not orphan.exists() and not orphan.parent.exists()
@@ -0,0 +1,96 @@
+"""
+Tests for the GitHub credential pool.
+"""
+
+import time
+
+import pytest
+import requests
+from github import RateLimitExceededException
+
+from src.tokens import PoolToken, TokenPool, bucket_for
+
+
+class FakeAdapter(requests.adapters.BaseAdapter):
+    """Answers every request from a per-token script of (status, remaining) pairs."""
+
+    def __init__(self, scripts):
+        super().__init__()
+        self.scripts = scripts
+        self.sent = []
+
+    def send(self, request, **kwargs):
+        token = request.headers['Authorization'].split()[-1]
+        self.sent.append((token, request.url))
+        status, remaining = self.scripts[token].pop(0)
+        response = requests.Response()
+        response.status_code = status
+        response.headers = requests.structures.CaseInsensitiveDict({
+            'X-RateLimit-Remaining': str(remaining),
+            'X-RateLimit-Limit': '5000',
+            'X-RateLimit-Reset': str(int(time.time()) + 3600),
+            'X-RateLimit-Resource': bucket_for(request.url),
+        })
+        response._content = b'{}'
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
+
+
+def make_pool(scripts):
+    pool = TokenPool([PoolToken(name, token=name) for name in scripts])
+    adapter = FakeAdapter(scripts)
+    pool.session.mount('https://', adapter)
+    return pool, adapter
+
+
+def test_requests_go_to_the_token_with_most_remaining_budget():
+    pool, adapter = make_pool({'a': [(200, 10)], 'b': [(200, 4000), (200, 3999)]})
+
+    for _ in range(3):
+        pool.session.get('https://api.github.com/repos/o/r')
+
+    # Both unknown at first, then b's larger budget wins
+    assert [token for token, _ in adapter.sent] == ['a', 'b', 'b']
+
+
+def test_exhausted_token_is_quarantined_and_the_request_retried():
+    pool, adapter = make_pool({'a': [(403, 0)], 'b': [(200, 29), (200, 28)]})
+    pool.tokens[0].budgets['search'] = {'remaining': 30, 'limit': 30, 'reset': None}
+    pool.tokens[1].budgets['search'] = {'remaining': 20, 'limit': 30, 'reset': None}
+
+    response = pool.session.get('https://api.github.com/search/repositories?q=x')
+    pool.session.get('https://api.github.com/search/repositories?q=y')
+
+    assert response.status_code == 200 and len(response.history) == 1
+    assert [token for token, _ in adapter.sent] == ['a', 'b', 'b']
+    # Quarantine is per bucket: core requests may still use a
+    assert pool.tokens[0].available('core', time.time())
+    assert any('rate limited 1x' in line for line in pool.summary())
+
+
+def test_all_tokens_quarantined_raises_rate_limit():
+    pool, adapter = make_pool({'a': [(403, 0)]})
+
+    response = pool.session.get('https://api.github.com/search/repositories?q=x')
+
+    assert response.status_code == 403
+    with pytest.raises(RateLimitExceededException):
+        pool.acquire('search')
+
+
+def test_installed_pool_signs_pygithub_requests():
+    from github import Github
+
+    pool, adapter = make_pool({'a': [(200, 10)]})
+    pool.install()
+    try:
+        Github().get_repo('octocat/hello-world', lazy=False)
+    finally:
+        pool.uninstall()
+
+    assert adapter.sent == [('a', 'https://api.github.com:443/repos/octocat/hello-world')]
+    assert pool.summary() == ['a: core 1 (remaining core 10)']
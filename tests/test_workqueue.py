@@ -0,0 +1,75 @@
+"""
+Tests for the coordinator/worker work queue.
+"""
+
+from src import worker as worker_module
+from src.records import Candidate, Discovery, QualityResult
+from src.workqueue import MAX_ATTEMPTS, WorkQueue
+
+
+def make_candidates(*names):
+    return [Candidate(owner='alice', repo=name, predicted_yield=len(names) - i) for i, name in enumerate(names)]
+
+
+def test_claims_never_overlap_and_follow_priority(tmp_path):
+    path = tmp_path / 'queue.sqlite3'
+    first, second = WorkQueue(path), WorkQueue(path)
+    assert first.enqueue(make_candidates('a', 'b', 'c')) == 3
+    assert first.enqueue(make_candidates('a')) == 0
+
+    claimed_a = first.claim('w1', count=2)
+    claimed_b = second.claim('w2', count=2)
+
+    assert [c.repo for _, c in claimed_a] == ['a', 'b']
+    assert [c.repo for _, c in claimed_b] == ['c']
+    assert second.claim('w2') == []
+
+
+def test_expired_leases_are_retried_then_failed(tmp_path):
+    queue = WorkQueue(tmp_path / 'queue.sqlite3')
+    queue.enqueue(make_candidates('a'))
+
+    now = 1000.0
+    for attempt in range(MAX_ATTEMPTS):
+        assert len(queue.claim(f'w{attempt}', lease_seconds=10, now=now)) == 1
+        now += 11  # the worker died; its lease runs out
+
+    assert queue.claim('w', now=now) == []
+    assert queue.counts()['failed'] == 1 and not queue.outstanding()
+
+
+def test_release_does_not_spend_an_attempt(tmp_path):
+    queue = WorkQueue(tmp_path / 'queue.sqlite3')
+    queue.enqueue(make_candidates('a'))
+
+    for _ in range(MAX_ATTEMPTS + 1):
+        keys = [key for key, _ in queue.claim('w')]
+        queue.release(keys, 'w')
+
+    assert queue.counts()['pending'] == 1
+
+
+def test_worker_drains_the_queue_and_merge_sees_every_result(tmp_path, monkeypatch):
+    queue = WorkQueue(tmp_path / 'queue.sqlite3')
+    queue.enqueue(make_candidates('a', 'b', 'c'))
+    queue.set_meta('report', {'tiers': [2], 'prefilter_stats': {'opted_out_skipped': 1}})
+
+    def fake_search(candidates, stats=None, **kwargs):
+        stats['processed'] = len(candidates)
+        return [Discovery(c, 'CLAUDE.md', pattern_score=5) for c in candidates if c.repo != 'b']
+
+    monkeypatch.setattr(worker_module.Config, 'FILE_CACHE_JSON', tmp_path / 'repo-files.json')
+    monkeypatch.setattr(worker_module, 'search_for_discovery_patterns', fake_search)
+    monkeypatch.setattr(worker_module, 'extract_contacts', lambda d, **kwargs: [])
+    monkeypatch.setattr(worker_module, 'analyze_quality', lambda d, **kwargs: QualityResult(7))
+    reports = {}
+    monkeypatch.setattr(worker_module, 'generate_reports',
+                        lambda discoveries, metadata: reports.update(d=discoveries, m=metadata))
+
+    stats = {}
+    assert worker_module.run_worker(queue, settings=object(), batch=2, stats=stats)
+    worker_module.merge_queue(queue)
+
+    assert stats == {'processed': 3, 'discoveries': 2}
+    assert [(d.repo, d.score, d.candidate.predicted_yield) for d in reports['d']] == [('a', 7, 3), ('c', 7, 1)]
+    assert reports['m'] == {'tier': 2, 'total_candidates': 3, 'opted_out_skipped': 1}